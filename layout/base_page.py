@@ -1,25 +1,79 @@
-from nicegui import ui
+from nicegui import background_tasks, ui
 from layout.layout import page_layout
+from layout.measurement_hub import SessionViewer, hub
+from layout.measurement_queue import MeasurementJob, scheduler
 from typing import TYPE_CHECKING, Any, Dict, Callable, Optional, Type
 from abc import ABC, abstractmethod
 import numpy as np
 from datetime import datetime
+import contextlib
+import dataclasses
+import inspect
 import traceback
 
 if TYPE_CHECKING:
     from state.app_state import AppState
 
 
+def stored_xy(state: Any):
+    """The sweep axis and complex IQ data of the last run kept in state, or (None, None)."""
+    x_data = None
+    y_data = None
+
+    # Try to find x data (freqs or gains)
+    if hasattr(state, "freqs"):
+        x_data = state.freqs
+    elif hasattr(state, "gains"):
+        x_data = state.gains
+    elif hasattr(state, "times"):
+        x_data = state.times
+
+    # Try to find y data (iq_data or iq_list)
+    if hasattr(state, "iq_data") and state.iq_data is not None:
+        y_data = state.iq_data
+    elif hasattr(state, "iq_list"):
+        iq_list = state.iq_list
+        if iq_list and len(iq_list) > 0 and len(iq_list[0]) > 0:
+            try:
+                y_data = iq_list[0][0].dot([1, 1j])
+            except:
+                pass
+
+    if x_data is None or y_data is None or len(x_data) != len(y_data):
+        return None, None
+    return x_data, y_data
+
+
+# Scalar state fields describing the stored result rather than the settings
+_RESULT_FIELDS = ("last_plot_time", "result_qubit")
+
+
 class BaseMeasurementController(ABC):
     """
     Abstract base class for measurement controllers.
     Encapsulates common logic for UI interaction and measurement flow.
     """
 
+    # Maximum live-plot redraws per second (see layout.render_scheduler)
+    live_plot_fps: float = 10.0
+
     def __init__(self, app_state: "AppState", state: Any):
         self.app_state = app_state
         self.state = state
 
+        # Round accumulator of the current / last acquisition (see nicegui_plot)
+        self.accumulator = None
+
+        # Shared by every page showing this state (see layout.measurement_hub)
+        self.session = hub.session_for(state)
+        self.viewer: Optional[SessionViewer] = None
+
+        # Set by create_measurement_page; used to name queued jobs
+        self.page_route: Optional[str] = None
+        self.page_title: Optional[str] = None
+        # Queue job currently executing run_measurement (see layout.measurement_queue)
+        self.job: Optional[MeasurementJob] = None
+
         # UI Elements (to be bound)
         self.plot_container: Optional[ui.column] = None
         self.fit_plot_container: Optional[ui.column] = None
@@ -48,6 +102,133 @@ class BaseMeasurementController(ABC):
         self.run_button = run_button
         self.update_button = update_button
 
+    def attach_viewer(self):
+        """Subscribe this page's plot and progress elements to the session."""
+        # The run button stays enabled: further runs are queued
+        self.viewer = SessionViewer(
+            self.plot_container,
+            self.progress_bar,
+            self.progress_info_label,
+            on_finish=self._on_session_finish,
+        )
+        self.session.subscribe(self.viewer)
+
+    def detach_viewer(self):
+        if self.viewer is not None:
+            self.session.unsubscribe(self.viewer)
+            self.viewer = None
+
+    def _on_session_finish(self, owner):
+        if owner is self:
+            return
+        # Another page ran the measurement: show its stored result here
+        try:
+            self.show_stored_result()
+        except Exception as e:
+            print(f"Failed to show shared result: {e}")
+        if self.last_time_label and hasattr(self.state, "last_plot_time"):
+            self.last_time_label.text = "Last shown: " + self.state.last_plot_time
+
+    @property
+    def target_qubit(self):
+        """Qubit of the job being run, or the qubit selected in the sidebar."""
+        if self.job is not None and self.job.qubit is not None:
+            return self.job.qubit
+        return self.app_state.selected_qubit
+
+    @property
+    def result_qubit(self):
+        """Qubit the stored result was measured on; "Update Result" writes to it."""
+        return getattr(self.state, "result_qubit", None) or self.app_state.selected_qubit
+
+    def is_running(self) -> bool:
+        """is_running_callback of nicegui_plot: False once the job was cancelled."""
+        return self.job is None or self.job.is_running()
+
+    def _settings_snapshot(self) -> Dict[str, Any]:
+        """Scalar fields of the page state, i.e. the sweep settings."""
+        if not dataclasses.is_dataclass(self.state):
+            return {}
+        snapshot = {}
+        for f in dataclasses.fields(self.state):
+            value = getattr(self.state, f.name)
+            if f.name not in _RESULT_FIELDS and isinstance(value, (bool, int, float, str)):
+                snapshot[f.name] = value
+        return snapshot
+
+    def enqueue_measurement(self):
+        """
+        Run button handler: queue run_measurement on the board's job queue.
+
+        The settings and qubit are captured now, so runs can be stacked with
+        different parameters; they are restored when the job starts.
+        """
+        qubit = self.app_state.selected_qubit
+        settings = self._settings_snapshot()
+        name = f"{self.page_title or type(self).__name__} ({qubit})"
+
+        async def run(job: MeasurementJob):
+            for key, value in settings.items():
+                setattr(self.state, key, value)
+            self.job = job
+            try:
+                # Notifications of the job go to the page that queued it
+                container = self.plot_container
+                with container if container is not None else contextlib.nullcontext():
+                    await self.run_measurement()
+            finally:
+                self.job = None
+
+        waiting = scheduler.busy
+        job = scheduler.submit(name, run, route=self.page_route, qubit=qubit)
+        if waiting:
+            ui.notify(
+                f"Queued {name} (position {scheduler.position(job)})", type="info"
+            )
+        return job
+
+    def show_stored_result(self):
+        """Redraw the fit of the result kept in state (used by non-running viewers)."""
+        x_data, y_data = stored_xy(self.state)
+        if x_data is not None:
+            self.schedule_fit_plot(x_data, y_data)
+
+    async def refresh_fit_plot(self, x_data, y_data):
+        """Run update_fit_plot, awaiting it when the page fits off the event loop."""
+        result = self.update_fit_plot(x_data, y_data)
+        if inspect.isawaitable(result):
+            await result
+
+    def schedule_fit_plot(self, x_data, y_data):
+        """Start refresh_fit_plot from synchronous code (page build, viewer callbacks)."""
+        container = self.fit_plot_container
+
+        async def refresh():
+            # New tasks start without a slot; enter the page so ui.* calls find it
+            with container if container is not None else contextlib.nullcontext():
+                await self.refresh_fit_plot(x_data, y_data)
+
+        background_tasks.create(refresh(), name="fit_plot")
+
+    def start_live_plot(self, x, x_label: str = "", y_label: str = "|IQ|", title: str = ""):
+        """Create the live chart on every page viewing this measurement."""
+        self.session.start_chart(x, x_label=x_label, y_label=y_label, title=title)
+
+    def publish_frame(self, data: np.ndarray, title: Optional[str] = None):
+        """Send one live frame to every viewer; pass as the render function of a RenderScheduler."""
+        self.session.publish(data, title)
+
+    def update_progress(self, current: int, total: int, remaining: Optional[float]):
+        """progress_callback of nicegui_plot; the text is shared by every viewer."""
+        percent = (current / total) * 100
+        etr_text = f"{remaining:.1f}s" if remaining is not None else "?"
+        rate = self.accumulator.rate if self.accumulator else None
+        rate_text = f", {rate:.2f} rounds/s" if rate else ""
+        text = f"{percent:.1f}% (ETR: {etr_text}{rate_text})"
+        self.session.set_progress(current / total, text)
+        if self.job is not None:
+            self.job.report(current / total, text)
+
     @abstractmethod
     def prepare_config(self, current_cfg: Dict[str, Any]):
         """Prepare the configuration for the measurement."""
@@ -65,31 +246,58 @@ class BaseMeasurementController(ABC):
 
     @abstractmethod
     def update_fit_plot(self, x_data, y_data):
-        """Update the fitting plot."""
+        """Update the fitting plot; may be ``async`` (see refresh_fit_plot)."""
         pass
 
-    def on_measurement_start(self):
-        """Common logic to run at the start of a measurement."""
-        if self.run_button:
-            self.run_button.disable()
+    def on_measurement_start(self) -> bool:
+        """
+        Common logic to run at the start of a measurement.
+
+        Returns:
+            False if another measurement is running on the board; the caller
+            must return without touching ``soc``.
+        """
+        if not self.session.acquire(self):
+            active = hub.active
+            name = active.name if active is not None else "another page"
+            ui.notify(f"A measurement is already running ({name})", type="warning")
+            return False
+
+        self.accumulator = None
         if self.update_button:
             self.update_button.disable()
-
-        if self.progress_bar:
-            self.progress_bar.value = 0
-            self.progress_bar.visible = True
-        if self.progress_info_label:
-            self.progress_info_label.text = "Initializing..."
+        if self.viewer is None:
+            # Not attached (no page elements bound): drive the local elements
+            if self.run_button:
+                self.run_button.disable()
+            if self.progress_bar:
+                self.progress_bar.value = 0
+                self.progress_bar.visible = True
+            if self.progress_info_label:
+                self.progress_info_label.text = "Initializing..."
+        return True
+
+    def on_measurement_abort(self):
+        """Release the session when a measurement could not be started."""
+        self.session.release("Not started")
+        if self.viewer is None and self.run_button:
+            self.run_button.enable()
 
     def on_measurement_finish(self):
         """Common logic to run at the end of a measurement."""
-        if self.run_button:
-            self.run_button.enable()
-
-        if self.progress_bar:
-            self.progress_bar.value = 1.0
-        if self.progress_info_label:
-            self.progress_info_label.text = "Completed"
+        rate = self.accumulator.rate if self.accumulator else None
+        text = f"Completed ({rate:.2f} rounds/s)" if rate else "Completed"
+        if self.job is not None and self.job.cancel_requested:
+            text = "Cancelled"
+        self.session.release(text)
+
+        if self.viewer is None:
+            if self.run_button:
+                self.run_button.enable()
+            if self.progress_bar:
+                self.progress_bar.value = 1.0
+            if self.progress_info_label:
+                self.progress_info_label.text = text
 
         if self.last_time_label and hasattr(self.state, "last_plot_time"):
             self.last_time_label.text = "Last shown: " + self.state.last_plot_time
@@ -129,6 +337,8 @@ def create_measurement_page(
     @ui.page(page_route)
     def measurement_page():
         controller = controller_class(app_state, state)
+        controller.page_route = page_route
+        controller.page_title = page_title
 
         def content():
             ui.label(page_title).classes("text-xl font-semibold mb-4")
@@ -152,7 +362,7 @@ def create_measurement_page(
                     run_button = settings_card_func(
                         state,
                         app_state,
-                        controller.run_measurement,
+                        controller.enqueue_measurement,
                         on_change=on_change_callback,
                         **settings_card_kwargs,
                     )
@@ -197,33 +407,9 @@ def create_measurement_page(
                     # We can try to generalize or let the controller handle it.
                     # Let's try to generalize based on common patterns.
 
-                    x_data = None
-                    y_data = None
-
-                    # Try to find x data (freqs or gains)
-                    if hasattr(state, "freqs"):
-                        x_data = state.freqs
-                    elif hasattr(state, "gains"):
-                        x_data = state.gains
-                    elif hasattr(state, "times"):
-                        x_data = state.times
-
-                    # Try to find y data (iq_data or iq_list)
-                    if hasattr(state, "iq_data") and state.iq_data is not None:
-                        y_data = state.iq_data
-                    elif hasattr(state, "iq_list"):
-                        iq_list = state.iq_list
-                        if iq_list and len(iq_list) > 0 and len(iq_list[0]) > 0:
-                            try:
-                                y_data = iq_list[0][0].dot([1, 1j])
-                            except:
-                                pass
-
-                    if (
-                        x_data is not None
-                        and y_data is not None
-                        and len(x_data) == len(y_data)
-                    ):
+                    x_data, y_data = stored_xy(state)
+
+                    if x_data is not None:
                         with plot_container:
                             with ui.matplotlib(figsize=(9, 4)).figure as fig:
                                 ax = fig.gca()
@@ -231,7 +417,7 @@ def create_measurement_page(
                                 # Labels could be passed in or guessed
                                 ax.set_title(f"{plot_title} (Loaded)")
 
-                        controller.update_fit_plot(x_data, y_data)
+                        controller.schedule_fit_plot(x_data, y_data)
 
                         if hasattr(state, "last_plot_time") and last_time_label:
                             last_time_label.text = "Last shown: " + state.last_plot_time
@@ -241,4 +427,11 @@ def create_measurement_page(
                                 "text-gray-400 italic"
                             )
 
+                    # Share live frames of runs started from any browser; a run
+                    # in progress is replayed into this page. Detach only when the
+                    # client is deleted: disconnects also fire on websocket drops
+                    # that reconnect to this same page
+                    controller.attach_viewer()
+                    ui.context.client.on_delete(controller.detach_viewer)
+
         page_layout(app_state, content)
@@ -1,6 +1,8 @@
 from nicegui import ui, app
 from typing import Callable, Any
 from .sidebar import experiment_config_sidebar
+from qick_workspace.tools.save_queue import save_queue
+from .measurement_queue import scheduler
 
 # Navigation items: (Label, Path)
 NAV_ITEMS = [
@@ -13,6 +15,7 @@ NAV_ITEMS = [
     ('T1', '/t1'),
     ('Single Shot', '/singleshot'),
     ('SS Optimize', '/singleshot_opt'),
+    ('Queue', '/queue'),
     # ('QPT', '/qpt'),
 ]
 
@@ -40,6 +43,38 @@ def page_layout(app_state: Any, content_fn: Callable):
                 ).classes("w-full")
 
             ui.separator()
+
+            # Background data writes (see qick_workspace.tools.save_queue)
+            save_label = ui.label().classes("text-xs text-slate-600")
+
+            def refresh_save_status():
+                status = save_queue.status()
+                if status["pending"]:
+                    save_label.text = f"Saving: {status['pending']} pending"
+                    save_label.classes(replace="text-xs text-orange-600")
+                elif status["last_error"]:
+                    save_label.text = f"Save failed: {status['last_error']}"
+                    save_label.classes(replace="text-xs text-red-600")
+                else:
+                    save_label.text = f"Saved files: {status['completed']}"
+                    save_label.classes(replace="text-xs text-slate-600")
+
+            # Measurement job queue (see layout.measurement_queue)
+            queue_label = ui.label().classes("text-xs text-slate-600")
+
+            def refresh_queue_status():
+                waiting = len(scheduler.queued)
+                if scheduler.current is not None:
+                    queue_label.text = f"Running: {scheduler.current.name} (+{waiting} queued)"
+                else:
+                    queue_label.text = f"Queue: {waiting} waiting" if waiting else "Board idle"
+
+            def refresh_status():
+                refresh_save_status()
+                refresh_queue_status()
+
+            refresh_status()
+            ui.timer(1.0, refresh_status)
             
             def logout():
                 app.storage.user['authenticated'] = False
@@ -0,0 +1,80 @@
+"""
+Lazy page registration.
+
+Importing a measurement page pulls in qick, matplotlib, scipy, the fitting
+stacks and the qick_workspace scripts, so importing all pages up front made
+every start (and every ``reload=True`` restart) pay for all of them.
+``register_lazy_page`` registers a light placeholder route instead. The first
+visit imports the page module in a worker thread, lets its ``add_page``
+register the real route and reloads the browser onto it.
+
+``preload_pages`` optionally warms the imports in a background thread once the
+server is up, so the first visit is fast without delaying startup.
+"""
+
+import asyncio
+import importlib
+import threading
+from typing import Any, Dict, Iterable
+
+from nicegui import app, ui
+
+# route -> page module, for every lazily registered page
+LAZY_PAGES: Dict[str, str] = {}
+
+_load_lock = asyncio.Lock()
+_loaded = set()
+
+
+def _install(module_name: str, route: str, app_state: Any) -> None:
+    """Replace the placeholder of route by the page module's real route(s)."""
+    module = importlib.import_module(module_name)
+    app.remove_route(route)
+    module.add_page(app_state)
+    _loaded.add(module_name)
+
+
+def register_lazy_page(route: str, module_name: str, app_state: Any) -> None:
+    """
+    Register route so that module_name is imported on the first visit.
+
+    Args:
+        route: URL route the module's ``add_page`` registers, e.g. "/onetone".
+        module_name: Dotted module path, e.g. "pages.onetone".
+        app_state: AppState passed to the module's ``add_page``.
+    """
+    LAZY_PAGES[route] = module_name
+
+    @ui.page(route)
+    def placeholder_page():
+        with ui.column().classes("absolute-center items-center gap-2"):
+            ui.spinner(size="lg")
+            ui.label("Loading page...").classes("text-gray-500")
+
+        async def load():
+            try:
+                async with _load_lock:
+                    if module_name not in _loaded:
+                        # Import in a thread, register on the event loop
+                        await asyncio.to_thread(importlib.import_module, module_name)
+                        _install(module_name, route, app_state)
+            except Exception as e:
+                ui.notify(f"Failed to load {route}: {e}", type="negative")
+                raise
+            ui.navigate.to(route)
+
+        ui.timer(0.05, load, once=True)
+
+
+def preload_pages(module_names: Iterable[str] = None) -> None:
+    """Import page modules in a daemon thread; registration still happens on first visit."""
+    names = list(module_names or LAZY_PAGES.values())
+
+    def worker():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"Preloading {name} failed: {e}")
+
+    threading.Thread(target=worker, name="page-preload", daemon=True).start()
@@ -0,0 +1,85 @@
+import base64
+import json
+from typing import Optional, Sequence
+
+import numpy as np
+from nicegui import ui
+
+
+def _f32_b64(data: np.ndarray) -> str:
+    """Pack an array as little-endian float32 and base64-encode it."""
+    return base64.b64encode(np.ascontiguousarray(data, dtype="<f4").tobytes()).decode("ascii")
+
+
+def _js_f32(data: np.ndarray) -> str:
+    """JavaScript expression that decodes a base64 float32 payload into a Float32Array."""
+    return (
+        f'new Float32Array(Uint8Array.from(atob("{_f32_b64(data)}"), '
+        "(c) => c.charCodeAt(0)).buffer)"
+    )
+
+
+def _axis_labels(values: Sequence[float]) -> list:
+    return [f"{v:.6g}" for v in np.asarray(values, dtype=float)]
+
+
+class LiveLineChart:
+    """
+    Browser-side live line plot built on ``ui.echart``.
+
+    The x axis is sent once when the chart is created. Each ``update`` only
+    ships the new y array as a base64 float32 payload (4 bytes per point) and
+    the title, which the browser decodes and applies with ``setOption``.
+    Nothing is rendered on the server.
+
+    Args:
+        x: X axis values.
+        x_label: X axis label.
+        y_label: Y axis label.
+        title: Initial title.
+        height: CSS height of the chart element.
+    """
+
+    def __init__(
+        self,
+        x: Sequence[float],
+        x_label: str = "",
+        y_label: str = "|IQ|",
+        title: str = "",
+        height: str = "24rem",
+    ):
+        self.x = np.asarray(x, dtype=float)
+        self.chart = ui.echart(
+            {
+                "animation": False,
+                "title": {"text": title, "left": "center", "textStyle": {"fontSize": 14}},
+                "tooltip": {"trigger": "axis"},
+                "grid": {"left": 70, "right": 30, "top": 40, "bottom": 50},
+                "xAxis": {
+                    "type": "category",
+                    "name": x_label,
+                    "nameLocation": "middle",
+                    "nameGap": 30,
+                    "data": _axis_labels(self.x),
+                },
+                "yAxis": {"type": "value", "name": y_label, "scale": True},
+                "series": [
+                    {
+                        "type": "line",
+                        "data": [0.0] * len(self.x),
+                        "symbol": "circle",
+                        "symbolSize": 4,
+                        "lineStyle": {"width": 1.5},
+                    }
+                ],
+            }
+        ).classes("w-full").style(f"height: {height}")
+
+    def update(self, y: np.ndarray, title: Optional[str] = None) -> None:
+        """Send a new y array (same length as x) to the browser."""
+        option = f"{{series: [{{data: Array.from({_js_f32(y)})}}]"
+        if title is not None:
+            option += f", title: {{text: {json.dumps(title)}}}"
+        option += "}"
+        self.chart.run_chart_method(":setOption", option)
+
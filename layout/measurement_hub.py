@@ -0,0 +1,223 @@
+"""
+Measurement sessions shared by every browser viewing a page.
+
+``create_measurement_page`` builds a new controller per page load, but all of
+them share the page's persistent state. Without a hub only the browser that
+pressed Run saw the live plot, and a second Run started a concurrent
+acquisition on the same ``soc``.
+
+A ``MeasurementSession`` (one per page state, see ``session_for``) holds the
+run lock and the latest published chart, frame and progress. The running
+controller publishes each frame once; the session fans it out to every
+subscribed ``SessionViewer`` (one per connected page), which only forwards
+the payload to its own chart. Viewers that subscribe mid-run get the current
+chart, the latest accumulated frame and the progress replayed.
+
+Only one acquisition runs on the board at a time: ``acquire`` fails while any
+session of the hub is running. Run buttons go through the job queue of
+layout.measurement_queue, which already runs measurements one by one; the
+lock guards direct ``run_measurement`` calls.
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from layout.live_chart import LiveLineChart
+
+
+class SessionViewer:
+    """
+    The UI elements of one connected page, fed by a MeasurementSession.
+
+    Args:
+        plot_container: Column the live chart is (re)built in.
+        progress_bar: Linear progress element, or None.
+        progress_info_label: Progress text label, or None.
+        run_button: Run button, disabled while the session runs, or None.
+        on_finish: Called with the session's owner after a run ended, e.g. to
+                   redraw the fit plot of the stored result.
+    """
+
+    def __init__(
+        self,
+        plot_container,
+        progress_bar=None,
+        progress_info_label=None,
+        run_button=None,
+        on_finish: Optional[Callable[[Any], None]] = None,
+    ):
+        self.plot_container = plot_container
+        self.progress_bar = progress_bar
+        self.progress_info_label = progress_info_label
+        self.run_button = run_button
+        self.on_finish = on_finish
+        self.chart: Optional[LiveLineChart] = None
+
+    def show_running(self, running: bool) -> None:
+        if self.run_button is not None:
+            self.run_button.set_enabled(not running)
+
+    def show_chart(self, spec: Dict[str, Any]) -> None:
+        if self.plot_container is None:
+            return
+        self.plot_container.clear()
+        with self.plot_container:
+            self.chart = LiveLineChart(**spec)
+
+    def show_frame(self, y: np.ndarray, title: Optional[str]) -> None:
+        if self.chart is not None:
+            self.chart.update(y, title=title)
+
+    def show_progress(self, value: float, text: str) -> None:
+        if self.progress_bar is not None:
+            self.progress_bar.value = value
+            self.progress_bar.visible = True
+        if self.progress_info_label is not None:
+            self.progress_info_label.text = text
+
+    def finish(self, owner: Any) -> None:
+        self.show_running(False)
+        if self.on_finish is not None:
+            self.on_finish(owner)
+
+
+class MeasurementSession:
+    """
+    Run lock and last published frame of one measurement page.
+
+    Args:
+        hub: The MeasurementHub this session belongs to.
+        name: Name used in messages, e.g. the state class name.
+    """
+
+    def __init__(self, hub: "MeasurementHub", name: str):
+        self.hub = hub
+        self.name = name
+        self.owner: Any = None
+        self.viewers: List[SessionViewer] = []
+
+        self._chart: Optional[Dict[str, Any]] = None
+        self._frame: Optional[tuple] = None
+        self._progress: Optional[tuple] = None
+
+    @property
+    def running(self) -> bool:
+        return self.owner is not None
+
+    # --- Run lock ------------------------------------------------------------
+
+    def acquire(self, owner: Any) -> bool:
+        """Mark the session as running for owner; False if the board is busy."""
+        if not self.hub.try_start(self, owner):
+            return False
+        self._chart = self._frame = None
+        self._progress = (0.0, "Initializing...")
+        self._broadcast(lambda v: v.show_running(True))
+        self._broadcast(lambda v: v.show_progress(*self._progress))
+        return True
+
+    def release(self, text: Optional[str] = None) -> None:
+        """End the run; text replaces the progress text on every viewer."""
+        owner = self.owner
+        if owner is None:
+            return
+        self.hub.stop(self)
+        if text is not None:
+            self._progress = (1.0, text)
+            self._broadcast(lambda v: v.show_progress(*self._progress))
+        self._broadcast(lambda v: v.finish(owner))
+
+    # --- Publishing ----------------------------------------------------------
+
+    def start_chart(
+        self,
+        x: Sequence[float],
+        x_label: str = "",
+        y_label: str = "|IQ|",
+        title: str = "",
+    ) -> None:
+        """Create the live chart on every viewer."""
+        self._chart = dict(x=np.asarray(x, dtype=float), x_label=x_label, y_label=y_label, title=title)
+        self._frame = None
+        self._broadcast(lambda v: v.show_chart(self._chart))
+
+    def publish(self, y: np.ndarray, title: Optional[str] = None) -> None:
+        """Send a frame to every viewer; it is kept for viewers joining later."""
+        # The accumulator reuses its buffers, so keep a private copy
+        self._frame = (np.array(y, dtype=np.float32), title)
+        self._broadcast(lambda v: v.show_frame(*self._frame))
+
+    def set_progress(self, value: float, text: str) -> None:
+        self._progress = (value, text)
+        self._broadcast(lambda v: v.show_progress(value, text))
+
+    # --- Viewers -------------------------------------------------------------
+
+    def subscribe(self, viewer: SessionViewer) -> None:
+        """Add viewer and replay the state of a run in progress."""
+        self.viewers.append(viewer)
+        if not self.running:
+            return
+        self._deliver(viewer, lambda v: v.show_running(True))
+        if self._chart is not None:
+            self._deliver(viewer, lambda v: v.show_chart(self._chart))
+        if self._frame is not None:
+            self._deliver(viewer, lambda v: v.show_frame(*self._frame))
+        if self._progress is not None:
+            self._deliver(viewer, lambda v: v.show_progress(*self._progress))
+
+    def unsubscribe(self, viewer: SessionViewer) -> None:
+        if viewer in self.viewers:
+            self.viewers.remove(viewer)
+
+    def _deliver(self, viewer: SessionViewer, action: Callable[[SessionViewer], None]) -> None:
+        try:
+            action(viewer)
+        except Exception as e:
+            # Elements of a closed page: stop feeding it
+            print(f"Dropping viewer of {self.name}: {e}")
+            self.unsubscribe(viewer)
+
+    def _broadcast(self, action: Callable[[SessionViewer], None]) -> None:
+        for viewer in list(self.viewers):
+            self._deliver(viewer, action)
+
+
+class MeasurementHub:
+    """Sessions of all measurement pages; at most one of them runs at a time."""
+
+    def __init__(self):
+        self._sessions: Dict[int, MeasurementSession] = {}
+        self._active: Optional[MeasurementSession] = None
+        self._lock = threading.Lock()
+
+    def session_for(self, state: Any) -> MeasurementSession:
+        """Session of a page, keyed by its persistent state object."""
+        key = id(state)
+        if key not in self._sessions:
+            self._sessions[key] = MeasurementSession(self, type(state).__name__)
+        return self._sessions[key]
+
+    @property
+    def active(self) -> Optional[MeasurementSession]:
+        return self._active
+
+    def try_start(self, session: MeasurementSession, owner: Any) -> bool:
+        with self._lock:
+            if self._active is not None:
+                return False
+            self._active = session
+            session.owner = owner
+            return True
+
+    def stop(self, session: MeasurementSession) -> None:
+        with self._lock:
+            if self._active is session:
+                self._active = None
+            session.owner = None
+
+
+# Shared by all pages of the app
+hub = MeasurementHub()
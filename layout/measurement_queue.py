@@ -0,0 +1,237 @@
+"""
+Central job queue for measurements on the QICK board.
+
+Run buttons used to start ``run_measurement`` directly, so clicks on different
+pages (or by different users) interleaved tProc programs on the same ``soc``.
+Every run now goes through the ``scheduler`` instead:
+
+* ``submit`` puts a ``MeasurementJob`` on a priority queue (FIFO within the
+  same priority) and returns it right away.
+* A single worker task runs the jobs one after the other, so only one job at a
+  time talks to the Pyro proxy, and the next job starts as soon as the previous
+  one finished - the board does not sit idle between stacked runs.
+* ``cancel`` drops a queued job, or asks the running job to stop after the
+  round in flight (``job.is_running`` is the ``is_running_callback`` of
+  nicegui_plot).
+* Each job carries its own progress (value, text), updated by the controller
+  every round; the queue page (pages/queue.py) shows them.
+
+Usage::
+
+    job = scheduler.submit("T1 (Q1)", run, route="/t1", qubit="Q1")
+    ...
+    scheduler.cancel(job.id)
+
+where ``run`` is an ``async`` function taking the job.
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class MeasurementJob:
+    """
+    One queued measurement.
+
+    Args:
+        job_id: Unique id assigned by the scheduler.
+        name: Label shown in the queue, e.g. "T1 (Q1)".
+        run: ``async`` function called with the job when it is its turn.
+        priority: Higher runs first; equal priorities run in submit order.
+        route: Page the job was submitted from, for linking back to it.
+        qubit: Qubit the job measures.
+    """
+
+    def __init__(
+        self,
+        job_id: int,
+        name: str,
+        run: Callable[["MeasurementJob"], Awaitable[Any]],
+        priority: int = 0,
+        route: Optional[str] = None,
+        qubit: Optional[str] = None,
+    ):
+        self.id = job_id
+        self.name = name
+        self.run = run
+        self.priority = priority
+        self.route = route
+        self.qubit = qubit
+
+        self.status = QUEUED
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress = 0.0
+        self.progress_text = ""
+        self.error: Optional[str] = None
+
+        self._cancel = threading.Event()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def is_running(self) -> bool:
+        """False once cancellation was requested; pass as is_running_callback."""
+        return not self._cancel.is_set()
+
+    def report(self, value: float, text: str = "") -> None:
+        """Update the progress of the job (value in 0..1)."""
+        self.progress = value
+        self.progress_text = text
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+
+class MeasurementScheduler:
+    """
+    Priority queue of measurement jobs executed by one worker task.
+
+    Args:
+        history: Number of finished jobs kept for display.
+    """
+
+    def __init__(self, history: int = 50):
+        self._heap: List[tuple] = []
+        self._counter = itertools.count()
+        self._ids = itertools.count(1)
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self.current: Optional[MeasurementJob] = None
+        self.history: Deque[MeasurementJob] = deque(maxlen=history)
+        # Bumped on every queue change, so views can skip redundant refreshes
+        self.revision = 0
+
+    # --- Queue ---------------------------------------------------------------
+
+    def submit(
+        self,
+        name: str,
+        run: Callable[[MeasurementJob], Awaitable[Any]],
+        priority: int = 0,
+        route: Optional[str] = None,
+        qubit: Optional[str] = None,
+    ) -> MeasurementJob:
+        """Queue run; must be called from the event loop (e.g. a button handler)."""
+        job = MeasurementJob(next(self._ids), name, run, priority, route, qubit)
+        heapq.heappush(self._heap, (-priority, next(self._counter), job))
+        self._changed()
+        self._ensure_worker()
+        return job
+
+    @property
+    def queued(self) -> List[MeasurementJob]:
+        """Waiting jobs in the order they will run."""
+        return [job for _, _, job in sorted(self._heap) if job.status == QUEUED]
+
+    def position(self, job: MeasurementJob) -> int:
+        """1-based place of a queued job (0 if it is running or finished)."""
+        queued = self.queued
+        return queued.index(job) + 1 if job in queued else 0
+
+    @property
+    def busy(self) -> bool:
+        return self.current is not None or bool(self.queued)
+
+    def cancel(self, job_id: int) -> bool:
+        """Drop a queued job or stop the running one after its current round."""
+        if self.current is not None and self.current.id == job_id:
+            self.current._cancel.set()
+            self.current.progress_text = "Cancelling..."
+            self._changed()
+            return True
+        for _, _, job in self._heap:
+            if job.id == job_id and job.status == QUEUED:
+                job._cancel.set()
+                self._finish(job, CANCELLED)
+                self._heap = [entry for entry in self._heap if entry[2] is not job]
+                heapq.heapify(self._heap)
+                return True
+        return False
+
+    def clear(self) -> int:
+        """Cancel every queued job (the running one keeps going)."""
+        jobs = self.queued
+        for job in jobs:
+            self.cancel(job.id)
+        return len(jobs)
+
+    def promote(self, job_id: int) -> bool:
+        """Move a queued job to the front of the queue."""
+        for i, (_, _, job) in enumerate(self._heap):
+            if job.id == job_id and job.status == QUEUED:
+                top = max((j.priority for _, _, j in self._heap), default=0)
+                job.priority = top + 1
+                self._heap[i] = (-job.priority, next(self._counter), job)
+                heapq.heapify(self._heap)
+                self._changed()
+                return True
+        return False
+
+    # --- Worker --------------------------------------------------------------
+
+    def _changed(self) -> None:
+        self.revision += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run_worker())
+
+    def _finish(self, job: MeasurementJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        self.history.appendleft(job)
+        self._changed()
+
+    async def _run_worker(self) -> None:
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            _, _, job = heapq.heappop(self._heap)
+            if job.status != QUEUED:
+                continue
+
+            self.current = job
+            job.status = RUNNING
+            job.started_at = time.time()
+            self._changed()
+            try:
+                await job.run(job)
+            except Exception as e:
+                traceback.print_exc()
+                self._finish(job, FAILED, str(e))
+            else:
+                self._finish(job, CANCELLED if job.cancel_requested else DONE)
+            finally:
+                self.current = None
+                self._changed()
+
+
+# Shared by all pages of the app: the only path to the board
+scheduler = MeasurementScheduler()
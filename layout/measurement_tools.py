@@ -3,6 +3,7 @@ from typing import Dict, Any, Optional
 from nicegui import ui
 from qick.asm_v2 import QickSweep1D
 import numpy as np
+from qick_workspace.tools.config_snapshot import ConfigOverlay, ConfigSnapshot
 
 
 def prepare_config(
@@ -18,12 +19,16 @@ def prepare_config(
         param_name: The name of the parameter to sweep.
         sweep_type: The type of sweep ("freq", "gain", "wait"). Defaults to "freq".
     """
-    # Deep copy to avoid modifying global state
-    # Handle addict.Dict deepcopy issue by converting to dict first
-    if hasattr(current_cfg, "to_dict"):
-        current_cfg = current_cfg.to_dict()
+    if isinstance(current_cfg, (ConfigSnapshot, ConfigOverlay)):
+        # Snapshot values are immutable scalars, a flat copy is enough
+        config = dict(current_cfg)
+    else:
+        # Deep copy to avoid modifying global state
+        # Handle addict.Dict deepcopy issue by converting to dict first
+        if hasattr(current_cfg, "to_dict"):
+            current_cfg = current_cfg.to_dict()
 
-    config = copy.deepcopy(current_cfg)
+        config = copy.deepcopy(current_cfg)
 
     # Determine sweep parameters based on sweep_type
     if sweep_type == "freq":
@@ -60,20 +65,37 @@ def prepare_config(
     return config
 
 
-def update_result(app_state, fit_results: Optional[float], update_para: str):
-    """Updates the configuration with the fitted resonant frequency."""
+def update_result(
+    app_state,
+    fit_results: Optional[float],
+    update_para: str,
+    source: Optional[str] = None,
+    q_index: Optional[str] = None,
+):
+    """
+    Updates the configuration with the fitted resonant frequency.
+    ``source`` (the experiment page) is recorded in the config change journal.
+    ``q_index`` is the qubit the result was measured on (default: the selected qubit).
+    """
     if fit_results is None:
         ui.notify("No fit results available.", type="warning")
         return
 
+    if q_index is None:
+        q_index = app_state.selected_qubit
+
     try:
         # Update the configuration using the qick_cfg object from app_state
         if app_state.qick_cfg:
             app_state.qick_cfg.update(
-                update_para, round(fit_results, 4), q_index=app_state.selected_qubit
+                update_para,
+                round(fit_results, 4),
+                q_index=q_index,
+                source=source,
             )
             ui.notify(
-                f"Updated {update_para} to {round(fit_results, 4)} MHz", type="positive"
+                f"Updated {update_para} of {q_index} to {round(fit_results, 4)} MHz",
+                type="positive",
             )
 
             # Reload config to update view_cfg
@@ -1,10 +1,13 @@
 import asyncio
 import numpy as np
 from typing import Callable, Optional, Any
-from tqdm.auto import tqdm
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
+from matplotlib.figure import Figure
 from qick_workspace.tools import fitting as fitter
+from qick_workspace.tools.fit_cache import fit_cache
+from qick_workspace.tools.quadrature_fit import fit_quadratures
+from qick_workspace.tools.acquisition import RoundAccumulator, RoundPipeline
 
 async def nicegui_plot(
     prog: Any,
@@ -13,6 +16,7 @@ async def nicegui_plot(
     plot_callback: Callable[[np.ndarray, int], None],
     progress_callback: Optional[Callable[[int, int, Optional[float]], None]] = None,
     is_running_callback: Optional[Callable[[], bool]] = None,
+    accumulator: Optional[RoundAccumulator] = None,
 ) -> tuple[np.ndarray, bool]:
     """
     Executes a QICK program with software averaging and live plotting updates for NiceGUI.
@@ -22,78 +26,91 @@ async def nicegui_plot(
         soc: The QICK SoC instance.
         py_avg: Number of software averages.
         plot_callback: Function called with (current_data, current_avg_count).
-                       current_data is a 1D numpy array of magnitudes.
+                       current_data is a read-only 1D numpy array of magnitudes,
+                       only valid until the next round.
         progress_callback: Optional function called with (current_avg, total_avg, remaining_time).
                            remaining_time is in seconds (or None if unknown).
         is_running_callback: Optional function that returns False to stop the measurement.
+        accumulator: Optional RoundAccumulator to average into. A new one is created if None;
+                     passing one in lets the caller read variance / timing stats afterwards.
+
+    Acquisition runs in a RoundPipeline, so the board is already taking the next round
+    while plot_callback redraws the current one.
 
     Returns:
         tuple: (final_iq_data, interrupted)
                final_iq_data is the complex IQ data (averaged).
                interrupted is True if the measurement was stopped early.
     """
-    iq_sum = None
+    if accumulator is None:
+        accumulator = RoundAccumulator(py_avg)
     interrupted = False
-    
-    # Pre-allocate if possible or just handle first iteration
-    
-    with tqdm(total=py_avg, desc="Averaging") as pbar:
-        for i in range(py_avg):
+
+    # The next round is acquired on a worker thread while this one is averaged and plotted
+    pipeline = RoundPipeline(prog, soc, py_avg).start()
+    accumulator.start()
+    try:
+        while True:
             # Check if we should stop
             if is_running_callback and not is_running_callback():
                 interrupted = True
                 break
 
-            # Acquire 1 round of data
-            # Use asyncio.to_thread to keep the UI responsive
-            # progress=False because we handle progress manually
-            iq_list = await asyncio.to_thread(prog.acquire, soc, rounds=1, progress=False)
-            
-            # Extract data: iq_list[0][0] is usually the buffer for the first readout
-            # dot([1, 1j]) converts I, Q to complex
-            iq_data = iq_list[0][0].dot([1, 1j])
-            
-            if iq_sum is None:
-                iq_sum = iq_data
-            else:
-                iq_sum += iq_data
-                
-            # Calculate current average
-            current_avg_data = iq_sum / (i + 1)
-            
-            # Update plot
-            # We pass the magnitude for plotting
-            plot_callback(np.abs(current_avg_data), i + 1)
-            
-            # Update progress
-            pbar.update(1)
+            # Wait for the next finished round without blocking the event loop.
+            # This is the raw (I, Q) buffer of the first readout, averaged in place
+            # without building a new complex array
+            iq = await asyncio.to_thread(pipeline.get)
+            if iq is None:
+                break
+            accumulator.add_iq(iq)
+
+            # Update plot with the magnitude of the current average
+            plot_callback(accumulator.magnitude, accumulator.count)
+
             if progress_callback:
-                # Get remaining time from tqdm
-                # format_dict['elapsed'] is time spent
-                # rate is it/s
-                # remaining = (total - n) / rate
-                remaining = None
-                if pbar.format_dict['rate'] and pbar.format_dict['rate'] > 0:
-                    remaining = (pbar.total - pbar.n) / pbar.format_dict['rate']
-                
-                progress_callback(i + 1, py_avg, remaining)
-                
+                progress_callback(accumulator.count, py_avg, accumulator.remaining)
+
             # Small sleep to allow UI updates to propagate if needed
             # (NiceGUI/FastAPI handles this mostly via await, but a tiny sleep can help yield control)
             await asyncio.sleep(0.001)
+    finally:
+        # Waits for the round in flight, if any
+        await asyncio.to_thread(pipeline.stop)
 
-    if iq_sum is None:
+    if accumulator.count == 0:
         return None, True
 
-    final_data = iq_sum / (i + 1) if not interrupted else iq_sum / (i + 1)
-    return final_data, interrupted
+    return accumulator.result(), interrupted
+
+
 
+# Suggested r2_threshold / max_rel_err for callers that opt in to stop waiting
+# for the other quadratures once one fit is this good
+FIT_R2_THRESHOLD = 0.98
+FIT_MAX_REL_ERR = 0.05
 
 
-def nicegui_plot_final(xpts, data: np.ndarray, x_label: str, fitfunc, simfunc, return_ax=False, fig=None, title=None):
+def nicegui_plot_final(
+    xpts,
+    data: np.ndarray,
+    x_label: str,
+    fitfunc,
+    simfunc,
+    return_ax=False,
+    fig=None,
+    title=None,
+    r2_threshold=None,
+    max_rel_err=None,
+    executor=None,
+    cache=fit_cache,
+):
     """
     Generates a comprehensive plot with fitting results for NiceGUI.
     Based on the user's provided plot_final function.
+
+    The four quadrature fits run concurrently (see qick_workspace.tools.quadrature_fit);
+    r2_threshold / max_rel_err / executor are passed on to fit_quadratures.
+    Fits of data seen before come from cache (the shared fit_cache; None disables it).
     """
     marker_style = {
         "marker": "o",
@@ -102,21 +119,16 @@ def nicegui_plot_final(xpts, data: np.ndarray, x_label: str, fitfunc, simfunc, r
         "linestyle": "-",
     }
 
-    data_dict = {
-        "xpts": xpts,
-        "amps": np.abs(data),
-        "phase": np.unwrap(np.angle(data)),
-        "avgi": data.real,
-        "avgq": data.imag,
-    }
-
-    for measure in ("amps", "phase", "avgi", "avgq"):
-        try:
-            popt, pcov, f = fitfunc(data_dict["xpts"], data_dict[measure])
-            data_dict[f"fit_{measure}"] = popt
-            data_dict[f"fit_err_{measure}"] = pcov
-        except Exception as e:
-            print(f"Fit failed for {measure}: {e}")
+    data_dict = fit_quadratures(
+        xpts,
+        data,
+        fitfunc,
+        simfunc,
+        executor=executor,
+        r2_threshold=r2_threshold,
+        max_rel_err=max_rel_err,
+        cache=cache,
+    )
 
     try:
         fit_params, fit_err, best_measure = fitter.get_best_fit(data_dict, fitfunc=None)
@@ -150,7 +162,8 @@ def nicegui_plot_final(xpts, data: np.ndarray, x_label: str, fitfunc, simfunc, r
         ax.plot(data_dict["xpts"], data_dict[measure], **marker_style)
         ax.set_xlabel(x_label)
         ax.set_ylabel(f"{measure} (ADC unit)")
-        if f"fit_{measure}" in data_dict:
+        # Quadratures cut short by r2_threshold / max_rel_err have NaN parameters
+        if np.all(np.isfinite(data_dict.get(f"fit_{measure}", np.nan))):
             try:
                 ax.plot(
                     data_dict["xpts"],
@@ -178,3 +191,44 @@ def nicegui_plot_final(xpts, data: np.ndarray, x_label: str, fitfunc, simfunc, r
         return fit_params, error, fig, ax_big
     else:
         return fit_params, error, fig
+
+
+async def nicegui_plot_final_async(
+    xpts,
+    data: np.ndarray,
+    x_label: str,
+    fitfunc,
+    simfunc,
+    fig=None,
+    title=None,
+    r2_threshold=None,
+    max_rel_err=None,
+    executor=None,
+    cache=fit_cache,
+):
+    """
+    nicegui_plot_final off the event loop: fits and drawing run in a worker thread.
+
+    Pass the figure of a ``ui.matplotlib`` element and call its ``update()``
+    afterwards (leaving its ``.figure`` context does that). Without fig, a new
+    (non-pyplot) Figure is created.
+
+    Returns:
+        (fit_params, error, fig)
+    """
+    if fig is None:
+        fig = Figure(figsize=(12, 6))
+    return await asyncio.to_thread(
+        nicegui_plot_final,
+        xpts,
+        data,
+        x_label,
+        fitfunc,
+        simfunc,
+        fig=fig,
+        title=title,
+        r2_threshold=r2_threshold,
+        max_rel_err=max_rel_err,
+        executor=executor,
+        cache=cache,
+    )
@@ -0,0 +1,86 @@
+import asyncio
+import time
+from typing import Any, Callable, Optional
+
+
+class RenderScheduler:
+    """
+    Coalesces live-plot updates to at most ``max_fps`` renders per second.
+
+    Controllers pass ``scheduler.submit`` as the ``plot_callback`` of nicegui_plot.
+    Every call only stores its arguments; the render function runs immediately if
+    the last render is older than 1 / max_fps, otherwise it is deferred with
+    ``loop.call_later`` and runs once with the newest arguments. Stale frames are
+    simply overwritten, so acquisition never waits on the browser.
+
+    Call ``flush()`` when the measurement ends to guarantee the final frame is drawn.
+
+    Args:
+        render: Function that actually updates the plot, e.g. sets line data and
+                calls ``fig_element.update()``.
+        max_fps: Maximum number of renders per second (<= 0 disables throttling).
+    """
+
+    def __init__(self, render: Callable[..., None], max_fps: float = 10.0):
+        self.render = render
+        self.max_fps = max_fps
+
+        self._pending: Optional[tuple] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._last_render = 0.0
+
+        self.submitted = 0
+        self.rendered = 0
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.max_fps if self.max_fps and self.max_fps > 0 else 0.0
+
+    def submit(self, *args: Any) -> None:
+        """Offer a new frame. Replaces any frame that has not been rendered yet."""
+        self.submitted += 1
+        self._pending = args
+
+        if self._timer is not None:
+            # A deferred render is already scheduled and will pick up this frame
+            return
+
+        wait = self._last_render + self.interval - time.perf_counter()
+        if wait <= 0:
+            self._render_pending()
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (e.g. called from a worker thread): render right away
+            self._render_pending()
+            return
+        self._timer = loop.call_later(wait, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._render_pending()
+
+    def _render_pending(self) -> None:
+        if self._pending is None:
+            return
+        args, self._pending = self._pending, None
+        self._last_render = time.perf_counter()
+        self.rendered += 1
+        self.render(*args)
+
+    def flush(self) -> None:
+        """Render the latest submitted frame now, if it has not been drawn yet."""
+        self.cancel_timer()
+        self._render_pending()
+
+    def cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def close(self) -> None:
+        """Drop any pending frame without rendering it."""
+        self.cancel_timer()
+        self._pending = None
@@ -1,8 +1,17 @@
 from nicegui import ui
 import asyncio
+import time
+
+# Staged sidebar edits are committed once no field changed for this long (s)
+COMMIT_DELAY = 0.6
 
 
 def experiment_config_sidebar(app_state):
+    session = app_state.config_session
+    # full key -> input element, for re-rendering single fields
+    fields = {}
+    edit_state = {"last_edit": 0.0, "applying": False}
+
     with ui.column().classes(
         "w-72 h-full bg-slate-100 p-4 gap-4 border-l border-slate-300 overflow-y-auto"
     ):
@@ -15,6 +24,7 @@ def experiment_config_sidebar(app_state):
             ).bind_value(app_state, "selected_qubit")
 
             async def apply_qubit():
+                commit_edits()
                 name = app_state.selected_qubit
                 ui.notify(f"Loading config for {name}...", type="info")
                 try:
@@ -27,35 +37,108 @@ def experiment_config_sidebar(app_state):
 
             ui.button("Change", on_click=apply_qubit, color="primary")
 
+        with ui.row().classes("items-center gap-2"):
+            undo_button = ui.button(
+                icon="undo", on_click=lambda: step_history(undo=True)
+            ).props("flat dense").tooltip("Undo config change")
+            redo_button = ui.button(
+                icon="redo", on_click=lambda: step_history(undo=False)
+            ).props("flat dense").tooltip("Redo config change")
+
         ui.separator()
 
+        def shown_index():
+            return app_state.qubit_names.index(app_state.selected_qubit)
+
+        def sync_history_buttons():
+            undo_button.set_enabled(session.can_undo)
+            redo_button.set_enabled(session.can_redo)
+
+        def show_value(q_index, full_key, value):
+            """Patch view_cfg and the matching field without a full refresh."""
+            if q_index != shown_index() or app_state.view_cfg is None:
+                return
+            keys = full_key.split(".")
+            target = app_state.view_cfg
+            for k in keys[:-1]:
+                target = target.setdefault(k, {})
+            target[keys[-1]] = value
+
+            field = fields.get(full_key)
+            if field is not None and field.value != value:
+                edit_state["applying"] = True
+                try:
+                    field.value = value if isinstance(value, (bool, int, float)) else str(value)
+                finally:
+                    edit_state["applying"] = False
+
+        def commit_edits():
+            if not session.has_pending:
+                return
+            staged = session.pending
+            try:
+                edits = session.commit()
+            except ValueError as e:
+                ui.notify(f"Config not updated: {e}", type="negative")
+                # Put the rejected fields back to their stored values
+                for q_index, full_key in staged:
+                    show_value(
+                        q_index, full_key, app_state.qick_cfg.get_value(full_key, q_index)
+                    )
+                return
+
+            for edit in edits:
+                show_value(edit.q_index, edit.key_path, edit.new)
+            sync_history_buttons()
+            if len(edits) == 1:
+                ui.notify(f"Updated {edits[0].key_path} to {edits[0].new}", type="positive")
+            elif edits:
+                ui.notify(f"Updated {len(edits)} parameters", type="positive")
+
+        def step_history(undo):
+            commit_edits()
+            edits = session.undo() if undo else session.redo()
+            for edit in edits:
+                show_value(edit.q_index, edit.key_path, edit.old if undo else edit.new)
+            sync_history_buttons()
+            if edits:
+                action = "Undid" if undo else "Redid"
+                ui.notify(f"{action} {len(edits)} change(s)", type="info")
+
+        def flush_if_idle():
+            if session.has_pending:
+                if time.monotonic() - edit_state["last_edit"] >= COMMIT_DELAY:
+                    commit_edits()
+            else:
+                sync_history_buttons()
+
+        sync_history_buttons()
+        ui.timer(0.2, flush_if_idle)
+
         @ui.refreshable
         def config_view():
+            fields.clear()
             cfg = app_state.view_cfg
             if cfg is None:
                 ui.label("No config loaded")
                 return
 
-            def update_config(key, value, prefix=""):
+            def update_config(key, value, prefix="", immediate=False):
+                if edit_state["applying"]:
+                    return
                 full_key = f"{prefix}.{key}" if prefix else key
+                if not app_state.qick_cfg:
+                    ui.notify("Config system not initialized.", type="negative")
+                    return
                 try:
-                    if app_state.qick_cfg:
-                        q_idx = app_state.qubit_names.index(app_state.selected_qubit)
-
-                        if prefix == "ch" or key in ["reps", "steps", "py_avg"]:
-                            value = int(float(value))
-
-                        app_state.qick_cfg.update(full_key, value, q_index=q_idx)
-
-                        ui.notify(f"Updated {full_key} to {value}", type="positive")
-
-                        new_cfg = app_state.read_config(app_state.selected_qubit)
-                        app_state.view_cfg = new_cfg
-                    else:
-                        ui.notify("Config system not initialized.", type="negative")
+                    session.stage(full_key, value, q_id=app_state.selected_qubit)
                 except Exception as e:
                     ui.notify(f"Error updating config: {str(e)}", type="negative")
                     print(f"Update Error Trace: {e}")
+                    return
+                edit_state["last_edit"] = time.monotonic()
+                if immediate:
+                    commit_edits()
 
             def render_dict(title, d, prefix=""):
                 if not d:
@@ -63,32 +146,33 @@ def experiment_config_sidebar(app_state):
                 with ui.expansion(title, value=False).classes("bg-white shadow-sm"):
                     with ui.column().classes("gap-2 p-2"):
                         for k, v in d.items():
+                            full_key = f"{prefix}.{k}" if prefix else k
                             if isinstance(v, bool):
-                                ui.checkbox(
+                                fields[full_key] = ui.checkbox(
                                     text=k,
                                     value=v,
                                     on_change=lambda e, key=k: update_config(
-                                        key, e.value, prefix
+                                        key, e.value, prefix, immediate=True
                                     ),
                                 )
                             elif isinstance(v, (int, float)):
                                 step_val = 1 if prefix == "ch" else 0.1
-                                ui.number(
+                                fields[full_key] = ui.number(
                                     label=k,
                                     value=v,
                                     step=step_val,
                                     on_change=lambda e, key=k: update_config(
                                         key, e.value, prefix
                                     ),
-                                ).classes("w-full")
+                                ).props("debounce=300").classes("w-full")
                             else:
-                                ui.input(
+                                fields[full_key] = ui.input(
                                     label=k,
                                     value=str(v),
                                     on_change=lambda e, key=k: update_config(
                                         key, e.value, prefix
                                     ),
-                                ).classes("w-full")
+                                ).props("debounce=300").classes("w-full")
 
             render_dict("CH", cfg.get("ch", {}), "ch")
             render_dict("RES", cfg.get("res", {}), "res")
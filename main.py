@@ -2,8 +2,22 @@ from nicegui import ui, app
 from pyngrok import ngrok
 import Pyro4
 from state.app_state import AppState
-# 引入頁面
-from pages import connect, onetone, twotone, prabi, ramsey, spinecho, t1, singleshot, singleshot_opt, login
+from layout.lazy_pages import register_lazy_page, preload_pages
+# 引入頁面 (measurement pages are imported on first visit, see layout/lazy_pages.py)
+from pages import login
+
+PAGES = [
+    ("/", "pages.connect"),
+    ("/onetone", "pages.onetone"),
+    ("/twotone", "pages.twotone"),
+    ("/prabi", "pages.prabi"),
+    ("/ramsey", "pages.ramsey"),
+    ("/spinecho", "pages.spinecho"),
+    ("/t1", "pages.t1"),
+    ("/singleshot", "pages.singleshot"),
+    ("/singleshot_opt", "pages.singleshot_opt"),
+    ("/queue", "pages.queue"),
+]
 
 Pyro4.config.SERIALIZER = "pickle"
 Pyro4.config.PICKLE_PROTOCOL_VERSION = 4
@@ -19,17 +33,11 @@ def init_ngrok():
 def main():
     app_state = AppState()
     login.add_page(app_state)
-    connect.add_page(app_state)
-    onetone.add_page(app_state)
-    twotone.add_page(app_state)
-    prabi.add_page(app_state)
-    ramsey.add_page(app_state)
-    spinecho.add_page(app_state)
-    t1.add_page(app_state)
-    singleshot.add_page(app_state)
-    singleshot_opt.add_page(app_state)
-    
+    for route, module_name in PAGES:
+        register_lazy_page(route, module_name, app_state)
+
     app.on_startup(init_ngrok)
+    app.on_startup(preload_pages)
 
 if __name__ in {"__main__", "__mp_main__"}:
     main()
@@ -4,6 +4,10 @@ from layout.base_page import BaseMeasurementController, create_measurement_page
 from state.onetone_state import OneToneState
 from qick_workspace.scrip.s002_res_spec_ge import SingleToneSpectroscopyProgram
 from layout.nicegui_plot import nicegui_plot
+from layout.render_scheduler import RenderScheduler
+from qick_workspace.tools.acquisition import RoundAccumulator
+from qick_workspace.tools.fit_cache import fit_cache
+from qick_workspace.tools.program_cache import get_program
 from qick_workspace.tools.resonator_tools import circuit
 
 import numpy as np
@@ -18,6 +22,14 @@ if TYPE_CHECKING:
     from state.app_state import AppState
 
 
+def autofit_notch_port(freqs, iq_data):
+    """Notch-port circle fit of a resonator trace."""
+    port = circuit.notch_port()
+    port.add_data(freqs, iq_data)
+    port.autofit()
+    return port
+
+
 class OneToneController(BaseMeasurementController):
     """Encapsulates the measurement and plotting logic for the One-tone page."""
 
@@ -43,7 +55,7 @@ class OneToneController(BaseMeasurementController):
 
     def update_result(self):
         if self.state.fit_results and 'fr' in self.state.fit_results:
-            update_result(self.app_state, self.state.fit_results['fr'], "res.res_freq_ge")
+            update_result(self.app_state, self.state.fit_results['fr'], "res.res_freq_ge", source="onetone", q_index=self.result_qubit)
         else:
             ui.notify("No fit results available", type="warning")
 
@@ -56,9 +68,8 @@ class OneToneController(BaseMeasurementController):
             return
 
         try:
-            port1 = circuit.notch_port()
-            port1.add_data(freqs, iq_data)
-            port1.autofit()
+            # Page reloads redraw the stored result: reuse its fit
+            port1 = fit_cache.cached(autofit_notch_port, freqs, iq_data)
             self.state.fit_results = port1.fitresults
             fres = port1.fitresults['fr']
 
@@ -143,21 +154,24 @@ class OneToneController(BaseMeasurementController):
             print(f"Fitting Error: {e}")
 
     async def run_measurement(self):
-        self.on_measurement_start()
+        if not self.on_measurement_start():
+            return
 
         if not self.app_state.instrument_connected:
             ui.notify("Not connected to QICK!", type="negative")
-            if self.run_button: self.run_button.enable()
+            self.on_measurement_abort()
             return
 
         soc = self.app_state.soc
         soccfg = self.app_state.soccfg
         
         try:
-            current_cfg = self.app_state.get_qubit(self.app_state.selected_qubit)
+            current_cfg = self.app_state.get_qubit(self.target_qubit)
             config = self.prepare_config(current_cfg)
             
-            prog = SingleToneSpectroscopyProgram(
+            # Reuses the compiled program when the cfg is unchanged
+            prog = get_program(
+                SingleToneSpectroscopyProgram,
                 soccfg,
                 reps=config["reps"],
                 final_delay=config["relax_delay"],
@@ -169,48 +183,38 @@ class OneToneController(BaseMeasurementController):
         except Exception as e:
             ui.notify(f"Configuration Error: {e}", type="negative")
             print(f"Configuration Error: {e}")
-            if self.run_button: self.run_button.enable()
+            self.on_measurement_abort()
             return
         
         # Prepare Live Plot
         if self.plot_container is None:
-            if self.run_button: self.run_button.enable()
+            self.on_measurement_abort()
             return
         
-        self.plot_container.clear()
-        with self.plot_container:
-            fig_element = ui.matplotlib(figsize=(9, 4))
-            with fig_element.figure as fig:
-                ax = fig.gca()
-                (line,) = ax.plot(freqs, np.zeros_like(freqs), "o-", markersize=4)
-                ax.set_xlabel("Freq (MHz)")
-                ax.set_ylabel("|IQ|")
-                ax.set_title("One-tone Result (Initializing...)")
-
-        def plot_callback(data: np.ndarray, avg_count: int):
-            line.set_ydata(data)
-            current_min, current_max = np.min(data), np.max(data)
-            if current_max > current_min:
-                ax.set_ylim(current_min * 0.95, current_max * 1.05)
-            ax.set_title(f"One-tone Result (Avg: {avg_count})")
-            fig_element.update()
-            
-        def update_progress(current: int, total: int, remaining: float):
-            percent = (current / total) * 100
-            etr_text = f"{remaining:.1f}s" if remaining is not None else "?"
-            if self.progress_info_label:
-                self.progress_info_label.text = f"{percent:.1f}% (ETR: {etr_text})"
-            if self.progress_bar:
-                self.progress_bar.value = current / total
-            
+        # Every page viewing this measurement gets the chart; only the new y array is sent per frame
+        self.start_live_plot(
+            freqs, x_label="Freq (MHz)", y_label="|IQ|", title="One-tone Result (Initializing...)"
+        )
+
+        def render_plot(data: np.ndarray, avg_count: int):
+            self.publish_frame(data, title=f"One-tone Result (Avg: {avg_count})")
+
+        # Redraws are throttled; rounds arriving faster than max_fps only keep the newest frame
+        scheduler = RenderScheduler(render_plot, max_fps=self.live_plot_fps)
+        self.accumulator = RoundAccumulator(int(self.state.py_avg))
+
         try:
             iq_data, interrupted = await nicegui_plot(
                 prog=prog,
                 soc=soc,
                 py_avg=int(self.state.py_avg),
-                plot_callback=plot_callback,
-                progress_callback=update_progress,
+                plot_callback=scheduler.submit,
+                progress_callback=self.update_progress,
+                is_running_callback=self.is_running,
+                accumulator=self.accumulator,
             )
+            # Make sure the last averaged frame is drawn
+            scheduler.flush()
             
             if interrupted:
                  ui.notify("Acquisition Interrupted!", type="warning")
@@ -221,6 +225,7 @@ class OneToneController(BaseMeasurementController):
             self.state.freqs = freqs
             self.state.iq_data = iq_data
             self.state.last_plot_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.state.result_qubit = self.target_qubit
 
             self.update_fit_plot(freqs, iq_data)
                 
@@ -230,6 +235,7 @@ class OneToneController(BaseMeasurementController):
             traceback.print_exc()
         
         finally:
+            scheduler.close()
             self.on_measurement_finish()
 
 
@@ -2,7 +2,10 @@ from nicegui import ui
 from layout.base_page import BaseMeasurementController, create_measurement_page
 from state.prabi_state import PowerRabiState
 from qick_workspace.scrip.s005_power_rabi_ge import AmplitudeRabiProgram
-from layout.nicegui_plot import nicegui_plot, nicegui_plot_final
+from layout.nicegui_plot import nicegui_plot, nicegui_plot_final_async
+from layout.render_scheduler import RenderScheduler
+from qick_workspace.tools.acquisition import RoundAccumulator
+from qick_workspace.tools.program_cache import get_program
 from qick_workspace.tools.fitting import fitdecaysin, decaysin, fix_phase
 
 import numpy as np
@@ -36,7 +39,7 @@ class PowerRabiController(BaseMeasurementController):
         # Sync sigma to global config and refresh sidebar
         try:
             if self.app_state.qick_cfg:
-                self.app_state.qick_cfg.update("qb.sigma", self.state.sigma, q_index=self.app_state.selected_qubit)
+                self.app_state.qick_cfg.update("qb.sigma", self.state.sigma, q_index=self.target_qubit, source="prabi")
                 
                 # Reload config to update view_cfg
                 new_cfg = self.app_state.read_config(self.app_state.selected_qubit)
@@ -57,16 +60,24 @@ class PowerRabiController(BaseMeasurementController):
             and "pi2_gain" in self.state.fit_results
         ):
             update_result(
-                self.app_state, self.state.fit_results["pi_gain"], "qb.pi_gain_ge"
+                self.app_state,
+                self.state.fit_results["pi_gain"],
+                "qb.pi_gain_ge",
+                source="prabi",
+                q_index=self.result_qubit,
             )
             update_result(
-                self.app_state, self.state.fit_results["pi2_gain"], "qb.pi2_gain_ge"
+                self.app_state,
+                self.state.fit_results["pi2_gain"],
+                "qb.pi2_gain_ge",
+                source="prabi",
+                q_index=self.result_qubit,
             )
             
             # Also update sigma to sidebar
             try:
                 if self.app_state.qick_cfg:
-                    self.app_state.qick_cfg.update("qb.sigma_ge", self.state.sigma, q_index=self.app_state.selected_qubit)
+                    self.app_state.qick_cfg.update("qb.sigma_ge", self.state.sigma, q_index=self.result_qubit, source="prabi")
                     
                     # Reload config to update view_cfg
                     new_cfg = self.app_state.read_config(self.app_state.selected_qubit)
@@ -82,7 +93,7 @@ class PowerRabiController(BaseMeasurementController):
         else:
             ui.notify("No fit results available", type="warning")
 
-    def update_fit_plot(self, gains, iq_data):
+    async def update_fit_plot(self, gains, iq_data):
         if self.fit_plot_container is None:
             return
 
@@ -96,7 +107,7 @@ class PowerRabiController(BaseMeasurementController):
                     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                     title = f"Power Rabi Fit (Time: {timestamp})"
 
-                    fit_params, error, _ = nicegui_plot_final(
+                    fit_params, error, _ = await nicegui_plot_final_async(
                         gains,
                         iq_data,
                         "Gain (a.u)",
@@ -129,22 +140,24 @@ class PowerRabiController(BaseMeasurementController):
             traceback.print_exc()
 
     async def run_measurement(self):
-        self.on_measurement_start()
+        if not self.on_measurement_start():
+            return
 
         if not self.app_state.instrument_connected:
             ui.notify("Not connected to QICK!", type="negative")
-            if self.run_button:
-                self.run_button.enable()
+            self.on_measurement_abort()
             return
 
         soc = self.app_state.soc
         soccfg = self.app_state.soccfg
 
         try:
-            current_cfg = self.app_state.get_qubit(self.app_state.selected_qubit)
+            current_cfg = self.app_state.get_qubit(self.target_qubit)
             config = self.prepare_config(current_cfg)
 
-            prog = AmplitudeRabiProgram(
+            # Reuses the compiled program when the cfg is unchanged
+            prog = get_program(
+                AmplitudeRabiProgram,
                 soccfg,
                 reps=config["reps"],
                 final_delay=config["relax_delay"],
@@ -156,50 +169,38 @@ class PowerRabiController(BaseMeasurementController):
         except Exception as e:
             ui.notify(f"Configuration Error: {e}", type="negative")
             print(f"Configuration Error: {e}")
-            if self.run_button:
-                self.run_button.enable()
+            self.on_measurement_abort()
             return
 
         # Prepare Live Plot
         if self.plot_container is None:
-            if self.run_button:
-                self.run_button.enable()
+            self.on_measurement_abort()
             return
 
-        self.plot_container.clear()
-        with self.plot_container:
-            fig_element = ui.matplotlib(figsize=(9, 4))
-            with fig_element.figure as fig:
-                ax = fig.gca()
-                (line,) = ax.plot(gains, np.zeros_like(gains), "o-", markersize=4)
-                ax.set_xlabel("Gain (a.u)")
-                ax.set_ylabel("|IQ|")
-                ax.set_title("Power Rabi Result (Initializing...)")
-
-        def plot_callback(data: np.ndarray, avg_count: int):
-            line.set_ydata(data)
-            current_min, current_max = np.min(data), np.max(data)
-            if current_max > current_min:
-                ax.set_ylim(current_min * 0.95, current_max * 1.05)
-            ax.set_title(f"Power Rabi Result (Avg: {avg_count})")
-            fig_element.update()
-
-        def update_progress(current: int, total: int, remaining: float):
-            percent = (current / total) * 100
-            etr_text = f"{remaining:.1f}s" if remaining is not None else "?"
-            if self.progress_info_label:
-                self.progress_info_label.text = f"{percent:.1f}% (ETR: {etr_text})"
-            if self.progress_bar:
-                self.progress_bar.value = current / total
+        # Every page viewing this measurement gets the chart; only the new y array is sent per frame
+        self.start_live_plot(
+            gains, x_label="Gain (a.u)", y_label="|IQ|", title="Power Rabi Result (Initializing...)"
+        )
+
+        def render_plot(data: np.ndarray, avg_count: int):
+            self.publish_frame(data, title=f"Power Rabi Result (Avg: {avg_count})")
+
+        # Redraws are throttled; rounds arriving faster than max_fps only keep the newest frame
+        scheduler = RenderScheduler(render_plot, max_fps=self.live_plot_fps)
+        self.accumulator = RoundAccumulator(int(self.state.py_avg))
 
         try:
             iq_data, interrupted = await nicegui_plot(
                 prog=prog,
                 soc=soc,
                 py_avg=int(self.state.py_avg),
-                plot_callback=plot_callback,
-                progress_callback=update_progress,
+                plot_callback=scheduler.submit,
+                progress_callback=self.update_progress,
+                is_running_callback=self.is_running,
+                accumulator=self.accumulator,
             )
+            # Make sure the last averaged frame is drawn
+            scheduler.flush()
 
             if interrupted:
                 ui.notify("Acquisition Interrupted!", type="warning")
@@ -210,8 +211,9 @@ class PowerRabiController(BaseMeasurementController):
             self.state.gains = gains
             self.state.iq_data = iq_data
             self.state.last_plot_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.state.result_qubit = self.target_qubit
 
-            self.update_fit_plot(gains, iq_data)
+            await self.refresh_fit_plot(gains, iq_data)
 
         except Exception as e:
             ui.notify(f"Error during acquisition: {str(e)}", type="negative")
@@ -219,6 +221,7 @@ class PowerRabiController(BaseMeasurementController):
             traceback.print_exc()
 
         finally:
+            scheduler.close()
             self.on_measurement_finish()
 
 
@@ -0,0 +1,128 @@
+# pages/queue.py
+from nicegui import ui
+from layout.layout import page_layout
+from layout.measurement_queue import scheduler
+
+import time
+
+
+def _format_duration(seconds):
+    if seconds is None:
+        return "-"
+    minutes, sec = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{sec:02d}" if hours else f"{minutes}:{sec:02d}"
+
+
+STATUS_COLORS = {
+    "done": "text-green-600",
+    "failed": "text-red-600",
+    "cancelled": "text-gray-500",
+}
+
+
+def add_page(app_state):
+    @ui.page("/queue")
+    def queue_page():
+        def content():
+            ui.label("Measurement Queue").classes("text-xl font-semibold mb-4")
+            ui.label(
+                "Runs from every page are executed here one after the other. "
+                "Press RUN on several pages to stack measurements."
+            ).classes("text-sm text-gray-500")
+
+            def cancel(job_id):
+                if scheduler.cancel(job_id):
+                    ui.notify("Cancel requested", type="info")
+
+            def clear_queue():
+                count = scheduler.clear()
+                ui.notify(f"Removed {count} queued job(s)", type="info")
+
+            # --- Running job: progress only, re-rendered in place ---
+            with ui.card().classes("w-full"):
+                ui.label("Running").classes("font-semibold")
+                current_label = ui.label().classes("text-md")
+                current_bar = ui.linear_progress(value=0, show_value=False).classes("w-full")
+                current_info = ui.label().classes("text-xs text-gray-500")
+                cancel_button = ui.button(
+                    "Cancel", color="red",
+                    on_click=lambda: scheduler.current and cancel(scheduler.current.id),
+                ).props("flat dense")
+
+            def show_current():
+                job = scheduler.current
+                cancel_button.set_visibility(job is not None)
+                current_bar.set_visibility(job is not None)
+                if job is None:
+                    current_label.text = "Idle"
+                    current_info.text = ""
+                    return
+                current_label.text = job.name
+                current_bar.value = job.progress
+                current_info.text = (
+                    f"{job.progress_text}  |  running for {_format_duration(job.duration)}"
+                )
+
+            @ui.refreshable
+            def queue_view():
+                queued = scheduler.queued
+                with ui.card().classes("w-full"):
+                    with ui.row().classes("w-full items-center"):
+                        ui.label(f"Queued ({len(queued)})").classes("font-semibold")
+                        ui.space()
+                        if queued:
+                            ui.button("Clear queue", on_click=clear_queue).props("flat dense")
+                    if not queued:
+                        ui.label("No queued measurements").classes("text-gray-400 italic")
+                    for pos, job in enumerate(queued, start=1):
+                        with ui.row().classes("w-full items-center gap-4"):
+                            ui.label(f"{pos}.").classes("w-6")
+                            ui.label(job.name).classes("flex-1")
+                            waiting = time.time() - job.submitted_at
+                            ui.label(f"waiting {_format_duration(waiting)}").classes(
+                                "text-xs text-gray-500"
+                            )
+                            if pos > 1:
+                                ui.button(
+                                    icon="vertical_align_top",
+                                    on_click=lambda j=job.id: scheduler.promote(j),
+                                ).props("flat dense").tooltip("Run next")
+                            ui.button(
+                                icon="close", on_click=lambda j=job.id: cancel(j)
+                            ).props("flat dense").tooltip("Remove")
+
+                with ui.card().classes("w-full"):
+                    ui.label("History").classes("font-semibold")
+                    if not scheduler.history:
+                        ui.label("No finished measurements").classes("text-gray-400 italic")
+                    for job in scheduler.history:
+                        with ui.row().classes("w-full items-center gap-4"):
+                            ui.label(job.name).classes("flex-1")
+                            ui.label(job.status).classes(STATUS_COLORS.get(job.status, ""))
+                            ui.label(_format_duration(job.duration)).classes(
+                                "text-xs text-gray-500"
+                            )
+                            if job.route:
+                                ui.button(
+                                    icon="open_in_new",
+                                    on_click=lambda r=job.route: ui.navigate.to(r),
+                                ).props("flat dense").tooltip("Open page")
+                        if job.error:
+                            ui.label(job.error).classes("text-xs text-red-500")
+
+            queue_view()
+            show_current()
+
+            seen = {"revision": scheduler.revision}
+
+            def poll():
+                show_current()
+                # Rebuild the lists only when the queue changed
+                if scheduler.revision != seen["revision"]:
+                    seen["revision"] = scheduler.revision
+                    queue_view.refresh()
+
+            ui.timer(0.5, poll)
+
+        page_layout(app_state, content)
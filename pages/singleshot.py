@@ -23,7 +23,7 @@ class SingleshotController(BaseMeasurementController):
         super().__init__(app_state, singleshot_state)
 
     def prepare_config(self, current_cfg: Dict[str, Any]):
-        config = self.app_state.get_qubit(self.app_state.selected_qubit)
+        config = self.app_state.get_qubit(self.target_qubit)
         config["shots"] = self.state.shot_num
         return config
 
@@ -35,6 +35,9 @@ class SingleshotController(BaseMeasurementController):
         # Singleshot plotting is handled in run_measurement via hist()
         pass
 
+    def show_stored_result(self):
+        self.update_plot()
+
     def on_settings_change(self):
         """Called when settings change (e.g. checkboxes)."""
         self.update_plot()
@@ -71,20 +74,22 @@ class SingleshotController(BaseMeasurementController):
                         # Save results to state
                         self.state.fit_results = result
                         self.state.last_plot_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        self.state.result_qubit = self.target_qubit
 
     async def run_measurement(self):
-        self.on_measurement_start()
+        if not self.on_measurement_start():
+            return
 
         if not self.app_state.instrument_connected:
             ui.notify("Not connected to QICK!", type="negative")
-            if self.run_button: self.run_button.enable()
+            self.on_measurement_abort()
             return
 
         soc = self.app_state.soc
         soccfg = self.app_state.soccfg
         
         try:
-            current_cfg = self.app_state.get_qubit(self.app_state.selected_qubit)
+            current_cfg = self.app_state.get_qubit(self.target_qubit)
             config = self.prepare_config(current_cfg)
             
             # 1. Run g-state measurement
@@ -19,7 +19,7 @@ class SingleshotOptController(BaseMeasurementController):
         super().__init__(app_state, singleshot_opt_state)
 
     def prepare_config(self, current_cfg: Dict[str, Any]):
-        config = self.app_state.get_qubit(self.app_state.selected_qubit)
+        config = self.app_state.get_qubit(self.target_qubit)
         config["shots"] = int(self.state.shot_num)
         
         # Always set freq_center from config
@@ -32,7 +32,7 @@ class SingleshotOptController(BaseMeasurementController):
         if self.state.opt_freq is not None:
             try:
                 if self.app_state.qick_cfg:
-                    self.app_state.qick_cfg.update("res.res_freq_ge", self.state.opt_freq, q_index=self.app_state.selected_qubit)
+                    self.app_state.qick_cfg.update("res.res_freq_ge", self.state.opt_freq, q_index=self.result_qubit, source="singleshot_opt")
                     ui.notify(f"Updated res_freq_ge to {self.state.opt_freq:.4f} MHz", type="positive")
             except Exception as e:
                 ui.notify(f"Error updating freq: {str(e)}", type="negative")
@@ -40,7 +40,7 @@ class SingleshotOptController(BaseMeasurementController):
         if self.state.opt_gain is not None:
             try:
                 if self.app_state.qick_cfg:
-                    self.app_state.qick_cfg.update("res.res_gain_ge", self.state.opt_gain, q_index=self.app_state.selected_qubit)
+                    self.app_state.qick_cfg.update("res.res_gain_ge", self.state.opt_gain, q_index=self.result_qubit, source="singleshot_opt")
                     ui.notify(f"Updated res_gain_ge to {self.state.opt_gain:.4f}", type="positive")
             except Exception as e:
                 ui.notify(f"Error updating gain: {str(e)}", type="negative")
@@ -48,7 +48,7 @@ class SingleshotOptController(BaseMeasurementController):
         if self.state.opt_length is not None:
             try:
                 if self.app_state.qick_cfg:
-                    self.app_state.qick_cfg.update("res.ro_length", self.state.opt_length, q_index=self.app_state.selected_qubit)
+                    self.app_state.qick_cfg.update("res.ro_length", self.state.opt_length, q_index=self.result_qubit, source="singleshot_opt")
                     ui.notify(f"Updated ro_length to {self.state.opt_length:.4f} us", type="positive")
             except Exception as e:
                 ui.notify(f"Error updating length: {str(e)}", type="negative")
@@ -62,6 +62,9 @@ class SingleshotOptController(BaseMeasurementController):
         except Exception as e:
             print(f"Error refreshing sidebar: {e}")
 
+    def show_stored_result(self):
+        self.update_fit_plot(None, None)
+
     def update_fit_plot(self, x_data, y_data):
         """Display optimization results."""
         if self.fit_plot_container is None:
@@ -163,19 +166,19 @@ Shots per point: {self.state.shot_num}
                     self.update_button.enable()
 
     async def run_measurement(self):
-        self.on_measurement_start()
+        if not self.on_measurement_start():
+            return
 
         if not self.app_state.instrument_connected:
             ui.notify("Not connected to QICK!", type="negative")
-            if self.run_button:
-                self.run_button.enable()
+            self.on_measurement_abort()
             return
 
         soc = self.app_state.soc
         soccfg = self.app_state.soccfg
 
         try:
-            current_cfg = self.app_state.get_qubit(self.app_state.selected_qubit)
+            current_cfg = self.app_state.get_qubit(self.target_qubit)
             config = self.prepare_config(current_cfg)
             
             # Prepare sweep parameters based on flags
@@ -249,6 +252,7 @@ Shots per point: {self.state.shot_num}
             self.state.max_fidelity = np.max(optimizer.fid_Array)
             self.state.raw_data = optimizer.data
             self.state.last_plot_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self.state.result_qubit = self.target_qubit
             
             # Update plot
             self.update_fit_plot(None, None)
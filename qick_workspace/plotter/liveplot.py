@@ -2,15 +2,16 @@ import threading
 import queue
 import numpy as np
 import matplotlib.pyplot as plt
-import pyvisa
 from IPython.display import display, clear_output, update_display
 from tqdm.auto import tqdm
 
 # ===================================================================
 # User Imports
 # ===================================================================
-from ..tools.YOKOGS200 import YOKOGS200
 from ..tools.system_tool import auto_unit
+from ..tools.acquisition import RoundAccumulator, RoundPipeline
+from ..tools.h5stream import H5StreamWriter
+from ..tools.h5reader import StreamedData
 
 # ===================================================================
 # 1. The Facade Function
@@ -29,6 +30,8 @@ def liveplotfun(
     # --- Yoko-specific parameters ---
     yoko_inst_addr=None,
     yoko_mode="current",
+    stream_path=None,  # HDF5 file the Yoko rows are appended to as they arrive; iqdata is then a StreamedData handle
+    stream_attrs=None,  # json attrs (e.g. config) stored in the stream file
     # --- 1D Scan specific ---
     scan_x_axis=None,  # If provided, enables 1D parameter scan mode
     get_prog_callback=None,  # Callback function to dynamically generate programs for 1D scan
@@ -55,6 +58,8 @@ def liveplotfun(
             x_label=x_label,
             y_label=y_label,
             title_prefix=title_prefix,
+            stream_path=stream_path,
+            stream_attrs=stream_attrs,
         )
 
     # Mode 2: 1D Parameter Scan (e.g., Length Rabi, T1)
@@ -105,13 +110,13 @@ def _liveplot_sw_avg(
     """
     [Internal function] Executes a software-averaged live plot (1D or 2D) using a separate, persistent thread
     for non-blocking visualization. Utilizes a producer-consumer pattern with frame dropping to ensure
-    data acquisition speed is not bottlenecked by rendering performance.
+    data acquisition speed is not bottlenecked by rendering performance. Acquisition itself runs in a
+    RoundPipeline worker so the next round is already running while the current one is averaged.
     """
     # Use a LIFO queue with maxsize=1 to always prefer the latest data frame, implementing "frame dropping"
     data_queue = queue.LifoQueue(maxsize=1)
     stop_event = threading.Event()
 
-    iq = 0
     iqdata = None
     last_i = 0
     interrupted = False
@@ -175,41 +180,47 @@ def _liveplot_sw_avg(
     plot_thread.start()
 
     # --- Producer Loop (Data Acquisition) ---
+    # Rounds are acquired on a worker thread, so the board keeps running
+    # while this loop averages the previous round
+    accumulator = RoundAccumulator(py_avg)
+    pipeline = RoundPipeline(prog, soc, py_avg).start()
+    accumulator.start()
     try:
-        for i in tqdm(range(py_avg), desc="Software Average Count", mininterval=0.1):
-            last_i = i
-
-            # Acquire data from hardware
-            iq_list = prog.acquire(soc, rounds=1, progress=False)
-            iq_data = iq_list[0][0].dot([1, 1j])
-            # Perform cumulative moving average
-            iq = iq_data if i == 0 else iq + iq_data
-            iqdata = iq / (i + 1)
-            plot_data_abs = np.abs(iqdata)
-
-            # Prepare data for plotting (normalization for 2D if needed)
-            if is_2d:
-                row_mins = plot_data_abs.min(axis=1, keepdims=True)
-                row_maxs = plot_data_abs.max(axis=1, keepdims=True)
-                ranges = row_maxs - row_mins
-                ranges[ranges == 0] = 1  # Avoid division by zero
-                data_to_push = (plot_data_abs - row_mins) / ranges
-            else:
-                data_to_push = plot_data_abs
-
-            # Non-blocking push to queue: if full, drop the old frame and push the new one
-            try:
-                data_queue.put_nowait((i, data_to_push))
-            except queue.Full:
+        with tqdm(total=py_avg, desc="Software Average Count", mininterval=0.1) as pbar:
+            for iq_round in pipeline:
+                accumulator.add_iq(iq_round)
+                i = last_i = accumulator.count - 1
+                plot_data_abs = accumulator.magnitude
+
+                # Prepare data for plotting (normalization for 2D if needed)
+                if is_2d:
+                    row_mins = plot_data_abs.min(axis=1, keepdims=True)
+                    row_maxs = plot_data_abs.max(axis=1, keepdims=True)
+                    ranges = row_maxs - row_mins
+                    ranges[ranges == 0] = 1  # Avoid division by zero
+                    data_to_push = (plot_data_abs - row_mins) / ranges
+                else:
+                    # The accumulator buffer is reused, hand the plotter its own copy
+                    data_to_push = plot_data_abs.copy()
+
+                # Non-blocking push to queue: if full, drop the old frame and push the new one
                 try:
-                    data_queue.get_nowait()  # Drop old frame
-                    data_queue.put_nowait((i, data_to_push))  # Push new frame
-                except:
-                    pass  # Ignore race conditions during extreme load
+                    data_queue.put_nowait((i, data_to_push))
+                except queue.Full:
+                    try:
+                        data_queue.get_nowait()  # Drop old frame
+                        data_queue.put_nowait((i, data_to_push))  # Push new frame
+                    except:
+                        pass  # Ignore race conditions during extreme load
+
+                pbar.update(1)
+                pbar.set_postfix(duty=f"{pipeline.duty_cycle or 0:.0%}", refresh=False)
 
     except KeyboardInterrupt:
         interrupted = True
     finally:
+        pipeline.stop()
+        iqdata = accumulator.result()
         # Signal plotter thread to stop and wait for it to finish nicely
         stop_event.set()
         if plot_thread.is_alive():
@@ -271,12 +282,33 @@ def _liveplot_sweep_yoko(
     x_label="X Axis",
     y_label="Y Axis",
     title_prefix="Experiment",
+    stream_path=None,
+    stream_attrs=None,
 ):
+    # VISA is only needed for Yoko sweeps; keep it out of every script import
+    import pyvisa
+    from ..tools.YOKOGS200 import YOKOGS200
+
     rm = pyvisa.ResourceManager()
     yoko = YOKOGS200(yoko_inst_addr, rm)
 
-    iqdata_full = np.zeros((len(y_axis_vals_yoko), len(x_axis_vals)), dtype=complex)
-    data_to_plot = np.zeros((len(y_axis_vals_yoko), len(x_axis_vals)))
+    n_rows, n_cols = len(y_axis_vals_yoko), len(x_axis_vals)
+    data_to_plot = np.zeros((n_rows, n_cols))
+
+    # With a stream file every row goes to disk as soon as it is measured and
+    # only the magnitudes for the plot are kept in memory
+    writer = None
+    if stream_path is not None:
+        writer = H5StreamWriter(stream_path)
+        writer.add_axis(x_label, x_axis_vals, axis="x")
+        writer.add_axis(y_label, y_axis_vals_yoko, axis="y")
+        writer.create_stream("iq_list", (n_cols,), dtype=complex, expected_rows=n_rows)
+        if stream_attrs:
+            writer.set_attrs(**stream_attrs)
+        writer.start_swmr()
+        iqdata_full = None
+    else:
+        iqdata_full = np.zeros((n_rows, n_cols), dtype=complex)
     interrupted = False
     last_idx = 0
 
@@ -331,8 +363,11 @@ def _liveplot_sweep_yoko(
             iq_list = prog.acquire(soc, rounds=py_avg, progress=False)
             iq_data_row = iq_list[0][0].dot([1, 1j])
 
-            iqdata_full[idx, :] = iq_data_row
-            data_to_plot = np.abs(iqdata_full)
+            if writer is not None:
+                writer.append("iq_list", iq_data_row)
+            else:
+                iqdata_full[idx, :] = iq_data_row
+            data_to_plot[idx, :] = np.abs(iq_data_row)
 
             mesh.set_array(data_to_plot.T.ravel())
 
@@ -347,6 +382,14 @@ def _liveplot_sweep_yoko(
     except KeyboardInterrupt:
         interrupted = True
         pass
+    finally:
+        if writer is not None:
+            # Rows already on disk survive any exception raised above. Hand back
+            # a handle to the file; the data is only loaded when the caller asks
+            written = writer.rows("iq_list")
+            writer.close()
+            iqdata_full = StreamedData(stream_path, "iq_list", shape=(n_rows, n_cols))
+            print(f"Sweep data streamed to {stream_path} ({written} rows)")
 
     clear_output(wait=True)
 
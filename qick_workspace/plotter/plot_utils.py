@@ -3,10 +3,10 @@ import matplotlib.pyplot as plt
 from scipy.optimize import curve_fit
 from scipy.special import erf
 from copy import deepcopy
-import seaborn as sns
 import datetime
 import matplotlib.gridspec as gridspec
 from ..tools import fitting as fitter
+from ..tools.quadrature_fit import fit_quadratures
 
 """
 Readout Helpers Module
@@ -799,6 +799,9 @@ def fit_single_shot(d, plot=True, rot=True):
 
 
 def plot_reset(d):
+    # seaborn (and pandas behind it) is only needed here
+    import seaborn as sns
+
     blue = "#4053d3"
     red = "#b51d14"
 
@@ -870,7 +873,18 @@ def plot_reset(d):
     fig.savefig(f"reset_hist_{current_time}.png")
 
 
-def plot_final(xpts, data: np.ndarray, x_label: str, fitfunc, simfunc, return_ax=False):
+def plot_final(
+    xpts,
+    data: np.ndarray,
+    x_label: str,
+    fitfunc,
+    simfunc,
+    return_ax=False,
+    r2_threshold=None,
+    max_rel_err=None,
+    executor=None,
+    cache=None,
+):
     marker_style = {
         "marker": "o",
         "markersize": 5,
@@ -878,18 +892,17 @@ def plot_final(xpts, data: np.ndarray, x_label: str, fitfunc, simfunc, return_ax
         "linestyle": "-",
     }
 
-    data = {
-        "xpts": xpts,
-        "amps": np.abs(data),
-        "phase": np.unwrap(np.angle(data)),
-        "avgi": data.real,
-        "avgq": data.imag,
-    }
-
-    for measure in ("amps", "phase", "avgi", "avgq"):
-        popt, pcov, f = fitfunc(data["xpts"], data[measure])
-        data[f"fit_{measure}"] = popt
-        data[f"fit_err_{measure}"] = pcov
+    # The four quadrature fits run concurrently (see tools/quadrature_fit.py)
+    data = fit_quadratures(
+        xpts,
+        data,
+        fitfunc,
+        simfunc,
+        executor=executor,
+        r2_threshold=r2_threshold,
+        max_rel_err=max_rel_err,
+        cache=cache,
+    )
 
     fit_params, fit_err, best_measure = fitter.get_best_fit(data, fitfunc=None)
 
@@ -904,7 +917,8 @@ def plot_final(xpts, data: np.ndarray, x_label: str, fitfunc, simfunc, return_ax
         ax.plot(data["xpts"], data[measure], **marker_style)
         ax.set_xlabel(x_label)
         ax.set_ylabel(f"{measure} (ADC unit)")
-        if f"fit_{measure}" in data:
+        # Quadratures cut short by r2_threshold / max_rel_err have NaN parameters
+        if np.all(np.isfinite(data.get(f"fit_{measure}", np.nan))):
             ax.plot(
                 data["xpts"],
                 simfunc(data["xpts"], *data[f"fit_{measure}"]),
@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 from scipy.integrate import quad
 from ..tools import fitting as fitter
+from ..tools.shot_stats import readout_stats
 
 # Use np.hist and plt.plot to accomplish plt.hist with less memory usage
 default_colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
@@ -89,52 +90,29 @@ def general_hist(
     if numbins is None:
         numbins = 200
 
-    # total histograms for shots listed as g or e
-    Ig_tot = []
-    Qg_tot = []
-    Ie_tot = []
-    Qe_tot = []
-
-    # the actual total histograms of everything
-    Ig_tot_tot = []
-    Qg_tot_tot = []
-    Ie_tot_tot = []
-    Qe_tot_tot = []
-    for check_i, data_check in enumerate(iqshots):
-        I, Q = data_check
-        Ig_tot_tot = np.concatenate((Ig_tot_tot, I))
-        Qg_tot_tot = np.concatenate((Qg_tot_tot, Q))
-        Ie_tot_tot = np.concatenate((Ig_tot_tot, I))
-        Qe_tot_tot = np.concatenate((Qg_tot_tot, Q))
+    # Shots listed as g or e, collected per category and concatenated once
+    g_parts, e_parts = [], []
+    for check_i, (I, Q) in enumerate(iqshots):
         if check_i in g_states:
-            Ig_tot = np.concatenate((Ig_tot, I))
-            Qg_tot = np.concatenate((Qg_tot, Q))
+            g_parts.append(np.asarray(I) + 1j * np.asarray(Q))
         elif check_i in e_states:
-            Ie_tot = np.concatenate((Ig_tot, I))
-            Qe_tot = np.concatenate((Qg_tot, Q))
+            e_parts.append(np.asarray(I) + 1j * np.asarray(Q))
+    g_shots = np.concatenate(g_parts) if g_parts else np.array([], dtype=complex)
+    e_shots = np.concatenate(e_parts) if e_parts else np.array([], dtype=complex)
+
+    # Rotation angle, threshold and counts from the exact (histogram free) kernel
+    stats = readout_stats([g_shots, e_shots], theta=theta, amplitude_mode=amplitude_mode)
+    theta = stats["theta"]
 
+    all_shots = np.concatenate(
+        [np.asarray(I) + 1j * np.asarray(Q) for I, Q in iqshots]
+    )
     if not amplitude_mode:
-        """Compute the rotation angle"""
-        if theta is None:
-            xg, yg = np.average(Ig_tot), np.average(Qg_tot)
-            xe, ye = np.average(Ie_tot), np.average(Qe_tot)
-            theta = -np.arctan2((ye - yg), (xe - xg))
-        else:
-            theta *= np.pi / 180
-        Ig_tot_tot_new = Ig_tot_tot * np.cos(theta) - Qg_tot_tot * np.sin(theta)
-        Qg_tot_tot_new = Ig_tot_tot * np.sin(theta) + Qg_tot_tot * np.cos(theta)
-        Ie_tot_tot_new = Ie_tot_tot * np.cos(theta) - Qe_tot_tot * np.sin(theta)
-        Qe_tot_tot_new = Ie_tot_tot * np.sin(theta) + Qe_tot_tot * np.cos(theta)
-        I_tot_tot_new = np.concatenate((Ie_tot_tot_new, Ig_tot_tot_new))
-        span = (np.max(I_tot_tot_new) - np.min(I_tot_tot_new)) / 2
-        midpoint = (np.max(I_tot_tot_new) + np.min(I_tot_tot_new)) / 2
+        x_all = (all_shots * np.exp(1j * theta)).real
     else:
-        theta = 0
-        amp_g_tot_tot = np.abs(Ig_tot_tot + 1j * Qg_tot_tot)
-        amp_e_tot_tot = np.abs(Ie_tot_tot + 1j * Qe_tot_tot)
-        amp_tot_tot = np.concatenate((amp_g_tot_tot, amp_e_tot_tot))
-        span = (np.max(amp_tot_tot) - np.min(amp_tot_tot)) / 2
-        midpoint = (np.max(amp_tot_tot) + np.min(amp_tot_tot)) / 2
+        x_all = np.abs(all_shots)
+    span = (np.max(x_all) - np.min(x_all)) / 2
+    midpoint = (np.max(x_all) + np.min(x_all)) / 2
     xlims = [midpoint - span, midpoint + span]
 
     if plot:
@@ -271,10 +249,13 @@ def general_hist(
                 linestyle=linestyle,
             )
 
-        else:  # just getting the n, bins for data processing
+        elif fit or check_qnd:  # just getting the n, bins for data processing
             n, bins = np.histogram(
                 I_new if not amplitude_mode else amp, bins=numbins, range=xlims
             )
+        else:
+            # Threshold / fidelity come from readout_stats, no histogram needed
+            continue
 
         if check_i in g_states:
             n_tot_g += n
@@ -361,33 +342,17 @@ def general_hist(
             popts[check_i] = popt
             pcovs[check_i] = pcov
 
-    """Compute the fidelity using overlap of the histograms"""
+    """Compute the fidelity from the exact threshold"""
     fids = []
-    thresholds = []
-    # this method calculates fidelity as 1-2(Neg + Nge)/N
-    contrast = np.abs(
-        (
-            (np.cumsum(n_tot_g) - np.cumsum(n_tot_e))
-            / (0.5 * n_tot_g.sum() + 0.5 * n_tot_e.sum())
-        )
-    )
-    tind = contrast.argmax()
-    thresholds.append(bins[tind])
-    # thresholds.append(np.average([bins_e[idx_e], bins_g[idx_g]]))
+    thresholds = [stats["thresholds"][0]]
+    g_below, e_below = stats["counts_below_ge"]
     if not fid_avg:
-        fids.append(contrast[tind])
+        # this method calculates fidelity as 1-2(Neg + Nge)/N
+        fids.append(abs(g_below - e_below) / (0.5 * g_shots.size + 0.5 * e_shots.size))
     else:
         # this method calculates fidelity as
         # (Ngg+Nee)/N = Ngg/N + Nee/N=(0.5N-Nge)/N + (0.5N-Neg)/N = 1-(Nge+Neg)/N
-        fids.append(
-            0.5
-            * (
-                1
-                - n_tot_g[tind:].sum() / n_tot_g.sum()
-                + 1
-                - n_tot_e[:tind].sum() / n_tot_e.sum()
-            )
-        )
+        fids.append(stats["fidelity_avg"])
 
     if plot:
         axs[0, 1].set_title(
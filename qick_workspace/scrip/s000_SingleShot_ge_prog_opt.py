@@ -6,6 +6,8 @@ from qick.asm_v2 import AveragerProgramV2
 from qick.asm_v2 import QickSpan, QickSweep1D
 
 # ----- Library ----- #
+import warnings
+
 import matplotlib.pyplot as plt
 import numpy as np
 from tqdm.auto import tqdm
@@ -15,6 +17,7 @@ from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
 from ..tools.system_tool import get_next_filename_labber, hdf5_generator
 from ..tools.yamltool import yml_comment
+from ..tools.shot_stats import fidelity_grid, readout_stats
 
 # from .singleshotplot import hist
 from ..tools.fitting import fit_doublegauss, double_gaussian, fit_gauss, gaussian
@@ -108,52 +111,37 @@ def general_hist(
     has_f_state = len(iqshots) > 2
 
     # --- 1. Data Aggregation ---
-    data_map = {"g": np.array([]), "e": np.array([]), "f": np.array([])}
-    I_tot_all = np.array([])
-    Q_tot_all = np.array([])
-
-    for check_i, data_check in enumerate(iqshots):
-        I, Q = data_check
-        I_tot_all = np.concatenate((I_tot_all, I))
-        Q_tot_all = np.concatenate((Q_tot_all, Q))
-
+    def category(check_i):
         if check_i in g_states:
-            cat = "g"
-        elif check_i in e_states:
-            cat = "e"
-        else:
-            cat = "f"
-
-        if data_map[cat].size == 0:
-            data_map[cat] = I + 1j * Q
-        else:
-            data_map[cat] = np.concatenate((data_map[cat], I + 1j * Q))
-
-    # --- 2. Rotation Calculation ---
-    if not amplitude_mode:
-        if theta is None:
-            xg = np.mean(np.real(data_map["g"])) if data_map["g"].size > 0 else 0
-            yg = np.mean(np.imag(data_map["g"])) if data_map["g"].size > 0 else 0
-            xe = np.mean(np.real(data_map["e"])) if data_map["e"].size > 0 else 1
-            ye = np.mean(np.imag(data_map["e"])) if data_map["e"].size > 0 else 1
-            theta = -np.arctan2((ye - yg), (xe - xg))
-        else:
-            theta *= np.pi / 180
-
-        def rotate_iq(c_data, ang):
-            i_new = np.real(c_data) * np.cos(ang) - np.imag(c_data) * np.sin(ang)
-            q_new = np.real(c_data) * np.sin(ang) + np.imag(c_data) * np.cos(ang)
-            return i_new, q_new
-
-        I_all_new, _ = rotate_iq(I_tot_all + 1j * Q_tot_all, theta)
-        span = (np.max(I_all_new) - np.min(I_all_new)) / 2
-        midpoint = (np.max(I_all_new) + np.min(I_all_new)) / 2
-    else:
-        theta = 0
-        amp_all = np.abs(I_tot_all + 1j * Q_tot_all)
-        span = (np.max(amp_all) - np.min(amp_all)) / 2
-        midpoint = (np.max(amp_all) + np.min(amp_all)) / 2
-
+            return "g"
+        if check_i in e_states:
+            return "e"
+        return "f"
+
+    # Collect per category, then concatenate once
+    parts = {"g": [], "e": [], "f": []}
+    for check_i, (I, Q) in enumerate(iqshots):
+        parts[category(check_i)].append(np.asarray(I) + 1j * np.asarray(Q))
+    data_map = {
+        cat: np.concatenate(chunks) if chunks else np.array([], dtype=complex)
+        for cat, chunks in parts.items()
+    }
+
+    # --- 2. Rotation, Thresholds & Matrix (exact, histogram free) ---
+    stat_states = [data_map["g"], data_map["e"]]
+    if has_f_state:
+        stat_states.append(data_map["f"])
+    stats = readout_stats(stat_states, theta=theta, amplitude_mode=amplitude_mode)
+    theta = stats["theta"]
+
+    def rotate_iq(c_data, ang):
+        i_new = np.real(c_data) * np.cos(ang) - np.imag(c_data) * np.sin(ang)
+        q_new = np.real(c_data) * np.sin(ang) + np.imag(c_data) * np.cos(ang)
+        return i_new, q_new
+
+    proj_all = np.concatenate(stats["projected"])
+    span = (np.max(proj_all) - np.min(proj_all)) / 2
+    midpoint = (np.max(proj_all) + np.min(proj_all)) / 2
     xlims = [midpoint - span, midpoint + span]
 
     # --- 3. Plot Setup ---
@@ -192,8 +180,13 @@ def general_hist(
     popts = []
     pcovs = []
 
+    # Perform fit if 'fit' is True OR if 'gauss_overlap' is True (requires fit)
+    do_fit = fit or gauss_overlap
+
     # --- 4. Process Each Input State ---
-    for check_i, data_check in enumerate(iqshots):
+    # Histograms are only needed for plotting, Gaussian fits and the QND check
+    hist_shots = iqshots if (plot or do_fit or check_qnd) else []
+    for check_i, data_check in enumerate(hist_shots):
         state_label = state_labels[check_i]
         I, Q = data_check
         complex_data = I + 1j * Q
@@ -271,12 +264,7 @@ def general_hist(
         bins_dist = bins
 
         # Accumulate for processing
-        if check_i in g_states:
-            cat = "g"
-        elif check_i in e_states:
-            cat = "e"
-        else:
-            cat = "f"
+        cat = category(check_i)
 
         if n_dist[cat] is None:
             n_dist[cat] = n
@@ -284,9 +272,6 @@ def general_hist(
             n_dist[cat] += n
 
     # --- 5. Fitting (Modified) ---
-    # Perform fit if 'fit' is True OR if 'gauss_overlap' is True (requires fit)
-    do_fit = fit or gauss_overlap
-
     if do_fit and n_dist["g"] is not None and n_dist["e"] is not None:
         bin_centers = (bins_dist[:-1] + bins_dist[1:]) / 2
         n_g = n_dist["g"]
@@ -401,76 +386,23 @@ def general_hist(
                 )
 
     # --- 6. Thresholds & Confusion Matrix ---
-    fids = []
-    thresholds = []
-
-    contrast_ge = np.abs(
-        (np.cumsum(n_dist["g"]) - np.cumsum(n_dist["e"]))
-        / (np.sum(n_dist["g"]) + np.sum(n_dist["e"]))
-    )
-    tind_ge = contrast_ge.argmax()
-    threshold_ge = bins_dist[tind_ge]
-    thresholds.append(threshold_ge)
-
-    if not fid_avg:
-        fids.append(contrast_ge[tind_ge])
-    else:
-        fids.append(
-            0.5
-            * (
-                1
-                - n_dist["g"][tind_ge:].sum() / n_dist["g"].sum()
-                + 1
-                - n_dist["e"][:tind_ge].sum() / n_dist["e"].sum()
-            )
-        )
+    thresholds = stats["thresholds"]
+    g_below, e_below = stats["counts_below_ge"]
+    n_g_tot, n_e_tot = data_map["g"].size, data_map["e"].size
+    fids = [
+        abs(g_below - e_below) / (n_g_tot + n_e_tot)
+        if not fid_avg
+        else stats["fidelity_avg"]
+    ]
 
     # --- Matrix Calculation ---
     if not has_f_state:
-        # 2x2
         matrix_size = 2
         labels = ["|g>", f"|{e_label}>"]
-
-        n00 = n_dist["g"][:tind_ge].sum()
-        n01 = n_dist["g"][tind_ge:].sum()
-        n10 = n_dist["e"][:tind_ge].sum()
-        n11 = n_dist["e"][tind_ge:].sum()
-
-        raw_matrix = np.array([[n00, n01], [n10, n11]])
     else:
-        # 3x3
         matrix_size = 3
         labels = ["|g>", f"|{e_label}>", "|f>"]
-
-        if n_dist["f"] is not None:
-            contrast_ef = np.abs(
-                (np.cumsum(n_dist["e"]) - np.cumsum(n_dist["f"]))
-                / (np.sum(n_dist["e"]) + np.sum(n_dist["f"]))
-            )
-            tind_ef = contrast_ef.argmax()
-            threshold_ef = bins_dist[tind_ef]
-            thresholds.append(threshold_ef)
-
-            sorted_t_indices = sorted([tind_ge, tind_ef])
-            t1, t2 = sorted_t_indices[0], sorted_t_indices[1]
-
-            def classify_counts(n_arr):
-                c0 = n_arr[:t1].sum()
-                c1 = n_arr[t1:t2].sum()
-                c2 = n_arr[t2:].sum()
-                return [c0, c1, c2]
-
-            row_g = classify_counts(n_dist["g"])
-            row_e = classify_counts(n_dist["e"])
-            row_f = classify_counts(n_dist["f"])
-
-            raw_matrix = np.array([row_g, row_e, row_f])
-        else:
-            raw_matrix = np.zeros((3, 3))
-
-    row_sums = raw_matrix.sum(axis=1)[:, np.newaxis]
-    row_sums[row_sums == 0] = 1
-    conf_matrix = 100 * raw_matrix / row_sums
+    conf_matrix = stats["confusion_matrix"]
 
     # --- 7. Finalize Plots ---
     if plot:
@@ -911,13 +843,146 @@ class SingleShotProgram_f(AveragerProgramV2):
         self.trigger(ros=[cfg["ro_ch"]], pins=[0], t=cfg["trig_time"])
 
 
+class SingleShotProgram_ge_sweep(AveragerProgramV2):
+    """
+    g / e single shots with the readout gain and frequency swept in tProc loops.
+
+    Every body measures the ground state, waits ``relax_delay``, then measures
+    the excited state, so iq_list[ro][0] holds the g shots and iq_list[ro][1]
+    the e shots, each with shape (shots, g_steps, f_steps, 2). ``res_gain_ge``
+    and ``res_freq_ge`` may be QickSweep1D over "gainloop" / "freqloop".
+    """
+
+    def _initialize(self, cfg):
+        ro_ch = cfg["ro_ch"]
+        res_ch = cfg["res_ch"]
+        qb_ch = cfg["qb_ch"]
+
+        self.declare_gen(ch=res_ch, nqz=cfg["nqz_res"])
+        if self.soccfg["gens"][qb_ch]["type"] == "axis_sg_int4_v2":
+            self.declare_gen(ch=qb_ch, nqz=cfg["nqz_qb"], mixer_freq=cfg["qb_mixer"])
+        else:
+            self.declare_gen(ch=qb_ch, nqz=cfg["nqz_qb"])
+
+        # tproc configured
+        self.declare_readout(ch=ro_ch, length=cfg["ro_length"])
+
+        # Shots outermost: every shot visits the whole (gain, freq) grid,
+        # so slow drifts are spread evenly over the grid
+        self.add_loop("shotloop", cfg["shots"])
+        self.add_loop("gainloop", cfg["g_steps"])
+        self.add_loop("freqloop", cfg["f_steps"])
+
+        self.add_readoutconfig(
+            ch=ro_ch, name="myro", freq=cfg["res_freq_ge"], gen_ch=res_ch
+        )
+
+        self.add_gauss(
+            ch=res_ch,
+            name="readout",
+            sigma=cfg["res_sigma"],
+            length=5 * cfg["res_sigma"],
+            even_length=True,
+        )
+        self.add_pulse(
+            ch=res_ch,
+            name="res_pulse",
+            ro_ch=ro_ch,
+            style="flat_top",
+            envelope="readout",
+            length=cfg["res_length"],
+            freq=cfg["res_freq_ge"],
+            phase=cfg["res_phase"],
+            gain=cfg["res_gain_ge"],
+        )
+
+        self.add_gauss(
+            ch=qb_ch,
+            name="ramp",
+            sigma=cfg["sigma"],
+            length=cfg["sigma"] * 5,
+            even_length=True,
+        )
+        if cfg["pulse_type"] == "arb":
+            self.add_pulse(
+                ch=qb_ch,
+                name="qb_pulse",
+                ro_ch=ro_ch,
+                style="arb",
+                envelope="ramp",
+                freq=cfg["qb_freq_ge"],
+                phase=cfg["qb_phase"],
+                gain=cfg["pi_gain_ge"],
+            )
+        elif cfg["pulse_type"] == "flat_top":
+            self.add_pulse(
+                ch=qb_ch,
+                name="qb_pulse",
+                ro_ch=ro_ch,
+                style="flat_top",
+                envelope="ramp",
+                freq=cfg["qb_freq_ge"],
+                phase=cfg["qb_phase"],
+                gain=cfg["pi_gain_ge"],
+                length=cfg["qb_flat_top_length_ge"],
+            )
+
+    def _body(self, cfg):
+        self.send_readoutconfig(ch=cfg["ro_ch"], name="myro", t=0)
+
+        # --- g ---
+        self.delay_auto(0.01, tag="wait_g")
+        self.pulse(ch=cfg["res_ch"], name="res_pulse", t=0)
+        self.trigger(ros=[cfg["ro_ch"]], pins=[0], t=cfg["trig_time"])
+
+        # Let the resonator / qubit relax before the e shot
+        self.delay_auto(cfg["relax_delay"], tag="relax_ge")
+
+        # --- e ---
+        self.pulse(ch=cfg["qb_ch"], name="qb_pulse", t=0)
+        self.delay_auto(0.01, tag="wait_e")
+        self.pulse(ch=cfg["res_ch"], name="res_pulse", t=0)
+        self.trigger(ros=[cfg["ro_ch"]], pins=[0], t=cfg["trig_time"])
+
+
+def _hw_sweep(values, loop_name):
+    """
+    Express a sweep axis as a tProc loop.
+
+    Returns:
+        (count, cfg_value) where cfg_value is a QickSweep1D for ``loop_name``
+        (or the single value / None for a one-point axis), or None if the
+        points are not evenly spaced and cannot be swept in hardware.
+    """
+    if len(values) == 1:
+        return 1, values[0]
+    if any(v is None for v in values):
+        return None
+    arr = np.asarray(values, dtype=float)
+    step = np.diff(arr)
+    if step[0] == 0 or not np.allclose(step, step[0], rtol=1e-6, atol=abs(step[0]) * 1e-6):
+        return None
+    return len(arr), QickSweep1D(loop_name, arr[0], arr[-1])
+
+
 class SingleShot_ge_opt:
     def __init__(self, soc, soccfg, config):
         self.soc = soc
         self.soccfg = soccfg
         self.cfg = config
 
-    def run(self, SHOTS, sweep_para: dict, progress_callback=None):
+    def run(self, SHOTS, sweep_para: dict, progress_callback=None, hw_loop=True):
+        """
+        Acquire g / e single shots over a (length, gain, freq) grid.
+
+        Args:
+            SHOTS: Number of shots per state and grid point.
+            sweep_para: {"length": ..., "gain": ..., "freq": ...}, each a value or a list.
+            progress_callback: Optional function called with (current, total) grid points.
+            hw_loop: Sweep gain and frequency in tProc loops with one program per
+                     readout length. Falls back to one program per point when
+                     the gain / freq points are not evenly spaced.
+        """
         self.cfg["shots"] = SHOTS
 
         raw_length = sweep_para.get("length")
@@ -949,6 +1014,23 @@ class SingleShot_ge_opt:
         self.I_e_array = np.full(final_shape, np.nan)
         self.Q_e_array = np.full(final_shape, np.nan)
 
+        if hw_loop:
+            gain_loop = _hw_sweep(self.gain_sweep, "gainloop")
+            freq_loop = _hw_sweep(self.freq_sweep, "freqloop")
+            if gain_loop is not None and freq_loop is not None:
+                self._run_hw_loop(SHOTS, gain_loop, freq_loop, progress_callback)
+                self.data = {
+                    "Ig": self.I_g_array,
+                    "Qg": self.Q_g_array,
+                    "Ie": self.I_e_array,
+                    "Qe": self.Q_e_array,
+                }
+                return
+            warnings.warn(
+                "Gain / freq points are not evenly spaced, using one program per point",
+                UserWarning,
+            )
+
         # --- TQDM 動態設定 ---
         is_l_sweep = len(self.length_sweep) > 1
         is_g_sweep = len(self.gain_sweep) > 1
@@ -998,6 +1080,7 @@ class SingleShot_ge_opt:
 
                     self.cfg.update(cfg_update)
 
+                    # Every grid point is a new cfg: build directly, not through the cache
                     ssp_g = SingleShotProgram_g(
                         self.soccfg,
                         reps=1,
@@ -1036,7 +1119,68 @@ class SingleShot_ge_opt:
             "Qe": self.Q_e_array,
         }
 
-    def analyze(self):
+    def _run_hw_loop(self, SHOTS, gain_loop, freq_loop, progress_callback=None):
+        """One SingleShotProgram_ge_sweep per readout length; gain / freq swept on the tProc."""
+        g_steps, gain_val = gain_loop
+        f_steps, freq_val = freq_loop
+        points_per_length = g_steps * f_steps
+        total_iterations = len(self.length_sweep) * points_per_length
+
+        l_iter = self.length_sweep
+        if len(self.length_sweep) > 1 and progress_callback is None:
+            l_iter = tqdm(self.length_sweep, desc="Length loop")
+
+        for l_idx, l_val in enumerate(l_iter):
+            # Local cfg: the sweep objects must not leak into self.cfg (saved as comment)
+            cfg = dict(self.cfg)
+            cfg.update({"steps": SHOTS, "g_steps": g_steps, "f_steps": f_steps})
+            if l_val is not None:
+                cfg["ro_length"] = l_val
+            if gain_val is not None:
+                cfg["res_gain_ge"] = gain_val
+            if freq_val is not None:
+                cfg["res_freq_ge"] = freq_val
+
+            prog = SingleShotProgram_ge_sweep(
+                self.soccfg,
+                reps=1,
+                final_delay=cfg["relax_delay"],
+                cfg=cfg,
+            )
+            iq_list = prog.acquire(self.soc, rounds=1, progress=False)
+
+            # (shots, gain, freq, IQ) -> (gain, freq, shots)
+            iq_g = np.asarray(iq_list[0][0]).reshape(SHOTS, g_steps, f_steps, 2)
+            iq_e = np.asarray(iq_list[0][1]).reshape(SHOTS, g_steps, f_steps, 2)
+            self.I_g_array[l_idx] = np.moveaxis(iq_g[..., 0], 0, -1)
+            self.Q_g_array[l_idx] = np.moveaxis(iq_g[..., 1], 0, -1)
+            self.I_e_array[l_idx] = np.moveaxis(iq_e[..., 0], 0, -1)
+            self.Q_e_array[l_idx] = np.moveaxis(iq_e[..., 1], 0, -1)
+
+            # Leave self.cfg at the last acquired point, like the per-point path
+            cfg_update = {"steps": SHOTS}
+            if l_val is not None:
+                cfg_update["ro_length"] = l_val
+            if self.gain_sweep[-1] is not None:
+                cfg_update["res_gain_ge"] = self.gain_sweep[-1]
+            if self.freq_sweep[-1] is not None:
+                cfg_update["res_freq_ge"] = self.freq_sweep[-1]
+            self.cfg.update(cfg_update)
+
+            if progress_callback is not None:
+                progress_callback((l_idx + 1) * points_per_length, total_iterations)
+
+    def analyze(self, batch_cells=None, workers=None):
+        """
+        Find the (length, gain, freq) with the best g/e assignment fidelity.
+
+        Args:
+            batch_cells: Grid cells analysed per batch (default: memory bounded).
+            workers: Number of processes for very large grids (None = in process).
+
+        Returns:
+            (length, gain, freq) of the optimum, interpolated when scipy is available.
+        """
         try:
             from scipy.interpolate import RegularGridInterpolator
             from scipy.optimize import minimize
@@ -1053,56 +1197,16 @@ class SingleShot_ge_opt:
             print("Error: 'run' method must be called first to define sweep axes.")
             return
 
-        fid_Array = np.zeros((len_L, len_G, len_F))
-
-        I_g_data = self.data["Ig"]
-        Q_g_data = self.data["Qg"]
-        I_e_data = self.data["Ie"]
-        Q_e_data = self.data["Qe"]
-
-        for l_idx in tqdm(range(len_L), desc="Analyze max fidelity"):
-            for g_idx in range(len_G):
-                for f_idx in range(len_F):
-                    I_g = I_g_data[l_idx, g_idx, f_idx]
-                    Q_g = Q_g_data[l_idx, g_idx, f_idx]
-                    I_e = I_e_data[l_idx, g_idx, f_idx]
-                    Q_e = Q_e_data[l_idx, g_idx, f_idx]
-
-                    vec_I = np.mean(I_e) - np.mean(I_g)
-                    vec_Q = np.mean(Q_e) - np.mean(Q_g)
-                    denom = np.abs(vec_I + 1j * vec_Q) ** 2
-
-                    if denom == 0:
-                        fid_Array[l_idx, g_idx, f_idx] = 0.0
-                        continue
-
-                    gstate = (
-                        (I_g - np.mean(I_g)) * vec_I + (Q_g - np.mean(Q_g)) * vec_Q
-                    ) / denom
-                    estate = (
-                        (I_e - np.mean(I_g)) * vec_I + (Q_e - np.mean(Q_g)) * vec_Q
-                    ) / denom
-
-                    if gstate.size == 0 or estate.size == 0:
-                        fid_Array[l_idx, g_idx, f_idx] = 0.0
-                        continue
-
-                    min_g = np.min(gstate)
-                    max_e = np.max(estate)
-                    if min_g >= max_e:
-                        min_g, max_e = min(min_g, max_e), max(min_g, max_e)
-                        if min_g == max_e:
-                            max_e += 1e-9
-
-                    th_list = np.linspace(min_g, max_e, 1000).reshape(-1, 1)
-                    g_proj = np.array(gstate).reshape(1, -1)
-                    e_proj = np.array(estate).reshape(1, -1)
-
-                    g_cdf = np.sum(g_proj < th_list, axis=1) / g_proj.shape[1]
-                    e_cdf = np.sum(e_proj > th_list, axis=1) / e_proj.shape[1]
-                    fidelity = (g_cdf + e_cdf) / 2
-
-                    fid_Array[l_idx, g_idx, f_idx] = np.max(fidelity)
+        # All (L, G, F) cells at once, exact optimal threshold per cell
+        fid_Array, self.threshold_Array = fidelity_grid(
+            self.data["Ig"],
+            self.data["Qg"],
+            self.data["Ie"],
+            self.data["Qe"],
+            batch_cells=batch_cells,
+            workers=workers,
+            progress=True,
+        )
 
         max_idx = np.unravel_index(np.argmax(fid_Array), fid_Array.shape)
         max_l_idx, max_g_idx, max_f_idx = max_idx
@@ -13,8 +13,10 @@ from tqdm.auto import tqdm
 # ----- User Library ----- #
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.yamltool import yml_comment
+from ..tools.shot_stats import readout_stats
 
 # from .singleshotplot import hist
 from ..tools.fitting import fit_doublegauss, double_gaussian, fit_gauss, gaussian
@@ -109,52 +111,37 @@ def general_hist(
     has_f_state = len(iqshots) > 2
 
     # --- 1. Data Aggregation ---
-    data_map = {"g": np.array([]), "e": np.array([]), "f": np.array([])}
-    I_tot_all = np.array([])
-    Q_tot_all = np.array([])
-
-    for check_i, data_check in enumerate(iqshots):
-        I, Q = data_check
-        I_tot_all = np.concatenate((I_tot_all, I))
-        Q_tot_all = np.concatenate((Q_tot_all, Q))
-
+    def category(check_i):
         if check_i in g_states:
-            cat = "g"
-        elif check_i in e_states:
-            cat = "e"
-        else:
-            cat = "f"
-
-        if data_map[cat].size == 0:
-            data_map[cat] = I + 1j * Q
-        else:
-            data_map[cat] = np.concatenate((data_map[cat], I + 1j * Q))
-
-    # --- 2. Rotation Calculation ---
-    if not amplitude_mode:
-        if theta is None:
-            xg = np.mean(np.real(data_map["g"])) if data_map["g"].size > 0 else 0
-            yg = np.mean(np.imag(data_map["g"])) if data_map["g"].size > 0 else 0
-            xe = np.mean(np.real(data_map["e"])) if data_map["e"].size > 0 else 1
-            ye = np.mean(np.imag(data_map["e"])) if data_map["e"].size > 0 else 1
-            theta = -np.arctan2((ye - yg), (xe - xg))
-        else:
-            theta *= np.pi / 180
-
-        def rotate_iq(c_data, ang):
-            i_new = np.real(c_data) * np.cos(ang) - np.imag(c_data) * np.sin(ang)
-            q_new = np.real(c_data) * np.sin(ang) + np.imag(c_data) * np.cos(ang)
-            return i_new, q_new
-
-        I_all_new, _ = rotate_iq(I_tot_all + 1j * Q_tot_all, theta)
-        span = (np.max(I_all_new) - np.min(I_all_new)) / 2
-        midpoint = (np.max(I_all_new) + np.min(I_all_new)) / 2
-    else:
-        theta = 0
-        amp_all = np.abs(I_tot_all + 1j * Q_tot_all)
-        span = (np.max(amp_all) - np.min(amp_all)) / 2
-        midpoint = (np.max(amp_all) + np.min(amp_all)) / 2
+            return "g"
+        if check_i in e_states:
+            return "e"
+        return "f"
+
+    # Collect per category, then concatenate once
+    parts = {"g": [], "e": [], "f": []}
+    for check_i, (I, Q) in enumerate(iqshots):
+        parts[category(check_i)].append(np.asarray(I) + 1j * np.asarray(Q))
+    data_map = {
+        cat: np.concatenate(chunks) if chunks else np.array([], dtype=complex)
+        for cat, chunks in parts.items()
+    }
 
+    # --- 2. Rotation, Thresholds & Matrix (exact, histogram free) ---
+    stat_states = [data_map["g"], data_map["e"]]
+    if has_f_state:
+        stat_states.append(data_map["f"])
+    stats = readout_stats(stat_states, theta=theta, amplitude_mode=amplitude_mode)
+    theta = stats["theta"]
+
+    def rotate_iq(c_data, ang):
+        i_new = np.real(c_data) * np.cos(ang) - np.imag(c_data) * np.sin(ang)
+        q_new = np.real(c_data) * np.sin(ang) + np.imag(c_data) * np.cos(ang)
+        return i_new, q_new
+
+    proj_all = np.concatenate(stats["projected"])
+    span = (np.max(proj_all) - np.min(proj_all)) / 2
+    midpoint = (np.max(proj_all) + np.min(proj_all)) / 2
     xlims = [midpoint - span, midpoint + span]
 
     # --- 3. Plot Setup ---
@@ -193,8 +180,12 @@ def general_hist(
     b_g_plot, c_g_plot = None, None
     b_e_plot, c_e_plot = None, None
 
+    do_fit = fit or gauss_overlap or plotoverlap
+
     # --- 4. Process Each Input State ---
-    for check_i, data_check in enumerate(iqshots):
+    # Histograms are only needed for plotting / Gaussian fits
+    hist_shots = iqshots if (plot or do_fit) else []
+    for check_i, data_check in enumerate(hist_shots):
         state_label = state_labels[check_i]
         I, Q = data_check
         complex_data = I + 1j * Q
@@ -259,12 +250,7 @@ def general_hist(
             n, bins = np.histogram(data_to_hist, bins=numbins, range=xlims)
 
         bins_dist = bins
-        if check_i in g_states:
-            cat = "g"
-        elif check_i in e_states:
-            cat = "e"
-        else:
-            cat = "f"
+        cat = category(check_i)
 
         if n_dist[cat] is None:
             n_dist[cat] = n
@@ -286,7 +272,6 @@ def general_hist(
     def readout_fidelity_norm(b1, c1, b2, c2):
         return 1 - overlap_area_norm(b1, c1, b2, c2)
 
-    do_fit = fit or gauss_overlap or plotoverlap
     if do_fit and n_dist["g"] is not None and n_dist["e"] is not None:
         bin_centers = (bins_dist[:-1] + bins_dist[1:]) / 2
         n_g, n_e = n_dist["g"], n_dist["e"]
@@ -378,56 +363,20 @@ def general_hist(
                 )
 
     # --- 6. Thresholds & Matrix ---
-    fids, thresholds = [], []
-    contrast_ge = np.abs(
-        (np.cumsum(n_dist["g"]) - np.cumsum(n_dist["e"]))
-        / (np.sum(n_dist["g"]) + np.sum(n_dist["e"]))
-    )
-    tind_ge = contrast_ge.argmax()
-    thresholds.append(bins_dist[tind_ge])
-    fids.append(
-        contrast_ge[tind_ge]
+    thresholds = stats["thresholds"]
+    g_below, e_below = stats["counts_below_ge"]
+    n_g_tot, n_e_tot = data_map["g"].size, data_map["e"].size
+    fids = [
+        abs(g_below - e_below) / (n_g_tot + n_e_tot)
         if not fid_avg
-        else 0.5
-        * (
-            1
-            - n_dist["g"][tind_ge:].sum() / n_dist["g"].sum()
-            + 1
-            - n_dist["e"][:tind_ge].sum() / n_dist["e"].sum()
-        )
-    )
+        else stats["fidelity_avg"]
+    ]
 
     if not has_f_state:
         matrix_size, labels = 2, ["|g>", f"|{e_label}>"]
-        raw_matrix = np.array(
-            [
-                [n_dist["g"][:tind_ge].sum(), n_dist["g"][tind_ge:].sum()],
-                [n_dist["e"][:tind_ge].sum(), n_dist["e"][tind_ge:].sum()],
-            ]
-        )
     else:
         matrix_size, labels = 3, ["|g>", f"|{e_label}>", "|f>"]
-        if n_dist["f"] is not None:
-            contrast_ef = np.abs(
-                (np.cumsum(n_dist["e"]) - np.cumsum(n_dist["f"]))
-                / (np.sum(n_dist["e"]) + np.sum(n_dist["f"]))
-            )
-            tind_ef = contrast_ef.argmax()
-            thresholds.append(bins_dist[tind_ef])
-            ts = sorted([tind_ge, tind_ef])
-
-            def cls(n):
-                return [n[: ts[0]].sum(), n[ts[0] : ts[1]].sum(), n[ts[1] :].sum()]
-
-            raw_matrix = np.array(
-                [cls(n_dist["g"]), cls(n_dist["e"]), cls(n_dist["f"])]
-            )
-        else:
-            raw_matrix = np.zeros((3, 3))
-
-    row_sums = raw_matrix.sum(axis=1)[:, np.newaxis]
-    row_sums[row_sums == 0] = 1
-    conf_matrix = 100 * raw_matrix / row_sums
+    conf_matrix = stats["confusion_matrix"]
 
     # --- 7. Finalize Plots ---
 
@@ -964,7 +913,7 @@ class SingleShot_gef:
             ]
         )
         dict_val = yml_comment(self.cfg)
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={
                 "name": "# shot",
@@ -19,7 +19,8 @@ from qick.asm_v2 import AveragerProgramV2, QickSpan, QickSweep1D
 # ===================================================================
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import hdf5_generator, get_next_filename_labber
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 
 
 ##################
@@ -209,7 +210,7 @@ class TOF:
     def saveLabber(self, qb_idx):
         expt_name = "s001_tof" + f"_{qb_idx}"
         file_path = get_next_filename_labber(DATA_PATH, expt_name)
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={"name": "Time", "unit": "s", "values": self.t * 1e-6},
             z_info={
@@ -220,4 +221,4 @@ class TOF:
             comment=(),
             tag="TOF",
         )
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
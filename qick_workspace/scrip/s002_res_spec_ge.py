@@ -17,7 +17,8 @@ from qick.asm_v2 import AveragerProgramV2, QickSpan, QickSweep1D
 # ===================================================================
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.module_fitzcu import resonator_circlefit, resonator_analyze
 from ..tools.yamltool import yml_comment
 from ..plotter.liveplot import liveplotfun
@@ -230,11 +231,11 @@ class Resonator_onetone:
 
         dict_val = yml_comment(self.cfg)
 
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={"name": "Frequency", "unit": "Hz", "values": self.freqs * 1e6},
             z_info={"name": "Signal", "unit": "ADC unit", "values": self.iqdata},
             comment=(f"f_res = {self.param[0] / 1e6:.4f} MHz, \n{dict_val}"),
             tag="OneTone",
         )
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
@@ -17,7 +17,8 @@ from qick.asm_v2 import AveragerProgramV2, QickSpan, QickSweep1D
 # ===================================================================
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.fitting import *
 from ..tools.yamltool import yml_comment
 from ..plotter.liveplot import liveplotfun
@@ -146,7 +147,7 @@ class SingleToneSpectroscopyPunchout:
 
         dict_val = yml_comment(self.cfg)
 
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={"name": "Frequency", "unit": "Hz", "values": self.freqs * 1e6},
             y_info={"name": "DAC Gains", "unit": "a.u.", "values": self.gains},
@@ -154,4 +155,4 @@ class SingleToneSpectroscopyPunchout:
             comment=(f"{dict_val}"),
             tag="OneTone",
         )
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
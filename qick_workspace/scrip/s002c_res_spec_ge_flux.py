@@ -17,7 +17,8 @@ from qick.asm_v2 import AveragerProgramV2, QickSpan, QickSweep1D
 # 3. User/Local Libraries
 # ===================================================================
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename, get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.yamltool import yml_comment
 from ..plotter.liveplot import liveplotfun
 
@@ -159,6 +160,7 @@ class Resonator_onetone_flux:
         yoko_value: np.ndarray,
         yoko_inst: str = None,
         mode: str = "current",
+        stream_save: bool = False,
     ):
         prog = SingleToneSpectroscopyProgram_yoko(
             self.soccfg,
@@ -169,6 +171,14 @@ class Resonator_onetone_flux:
 
         self.freqs = prog.get_pulse_param("res_pulse", "freq", as_array=True)
 
+        # Opt-in: rows are appended to this file as they arrive, so a crash keeps
+        # them; self.iqdata is then a StreamedData handle instead of an array
+        stream_path = (
+            get_next_filename(DATA_PATH, "s002_onetone_flux_stream", suffix=".h5")
+            if stream_save
+            else None
+        )
+
         iqdata, interrupted, avg_count = liveplotfun(
             prog=prog,
             soc=self.soc,
@@ -180,6 +190,8 @@ class Resonator_onetone_flux:
             title_prefix="Resonator Onetone Flux",
             yoko_inst_addr=yoko_inst,
             yoko_mode=mode,
+            stream_path=stream_path,
+            stream_attrs={"experiment_name": "s002_onetone_flux", "config": self.cfg},
         )
         self.iqdata = iqdata
         self.yoko_currnet = yoko_value
@@ -229,7 +241,7 @@ class Resonator_onetone_flux:
 
         if yoko_value is not None:
             if mode == "current":
-                hdf5_generator(
+                hdf5_generator_async(
                     filepath=file_path,
                     x_info={
                         "name": "Frequency",
@@ -240,13 +252,13 @@ class Resonator_onetone_flux:
                     z_info={
                         "name": "Signal",
                         "unit": "ADC unit",
-                        "values": self.iqdata,
+                        "values": np.asarray(self.iqdata),
                     },
                     comment=(f"{dict_val}"),
                     tag="OneTone",
                 )
             elif mode == "voltage":
-                hdf5_generator(
+                hdf5_generator_async(
                     filepath=file_path,
                     x_info={
                         "name": "Frequency",
@@ -257,9 +269,9 @@ class Resonator_onetone_flux:
                     z_info={
                         "name": "Signal",
                         "unit": "ADC unit",
-                        "values": self.iqdata,
+                        "values": np.asarray(self.iqdata),
                     },
                     comment=(f"{dict_val}"),
                     tag="OneTone",
                 )
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
@@ -16,7 +16,8 @@ from qick.asm_v2 import AveragerProgramV2
 # ===================================================================
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.module_fitzcu import spectrum_analyze
 from ..tools.fitting import fitlor, lorfunc
 from ..tools.yamltool import yml_comment
@@ -243,11 +244,11 @@ class Qubit_Twotone:
 
         dict_val = yml_comment(self.cfg)
 
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={"name": "Frequency", "unit": "Hz", "values": self.freqs * 1e6},
             z_info={"name": "Signal", "unit": "ADC unit", "values": self.iqdata},
             comment=(f"{dict_val}"),
             tag="TwoTone",
         )
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
@@ -16,7 +16,8 @@ from qick.asm_v2 import AveragerProgramV2, QickSpan, QickSweep1D
 # 3. User/Local Libraries
 # ===================================================================
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename, get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.yamltool import yml_comment
 from ..plotter.liveplot import liveplotfun
 
@@ -179,6 +180,7 @@ class Qubit_Twotone_Flux:
         yoko_value: np.ndarray,
         yoko_inst: str = None,
         mode: str = "current",
+        stream_save: bool = False,
     ):
         prog = PulseProbeSpectroscopyProgram(
             self.soccfg,
@@ -188,6 +190,14 @@ class Qubit_Twotone_Flux:
         )
         self.freqs = prog.get_pulse_param("qubit_pulse", "freq", as_array=True)
 
+        # Opt-in: rows are appended to this file as they arrive, so a crash keeps
+        # them; self.iqdata is then a StreamedData handle instead of an array
+        stream_path = (
+            get_next_filename(DATA_PATH, "003_qubit_flux_spec_ge_stream", suffix=".h5")
+            if stream_save
+            else None
+        )
+
         iqdata, interrupted, avg_count = liveplotfun(
             prog=prog,
             soc=self.soc,
@@ -199,6 +209,8 @@ class Qubit_Twotone_Flux:
             title_prefix="Qubit Twotone Flux",
             yoko_inst_addr=yoko_inst,
             yoko_mode=mode,
+            stream_path=stream_path,
+            stream_attrs={"experiment_name": "003_qubit_flux_spec_ge", "config": self.cfg},
         )
 
         self.iqdata = iqdata
@@ -219,7 +231,7 @@ class Qubit_Twotone_Flux:
 
         if yoko_value is not None:
             if mode == "current":
-                hdf5_generator(
+                hdf5_generator_async(
                     filepath=file_path,
                     x_info={
                         "name": "Frequency",
@@ -230,13 +242,13 @@ class Qubit_Twotone_Flux:
                     z_info={
                         "name": "Signal",
                         "unit": "ADC unit",
-                        "values": self.iqdata,
+                        "values": np.asarray(self.iqdata),
                     },
                     comment=(f"{dict_val}"),
                     tag="TwoTone",
                 )
             elif mode == "voltage":
-                hdf5_generator(
+                hdf5_generator_async(
                     filepath=file_path,
                     x_info={
                         "name": "Frequency",
@@ -247,9 +259,9 @@ class Qubit_Twotone_Flux:
                     z_info={
                         "name": "Signal",
                         "unit": "ADC unit",
-                        "values": self.iqdata,
+                        "values": np.asarray(self.iqdata),
                     },
                     comment=(f"{dict_val}"),
                     tag="TwoTone",
                 )
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
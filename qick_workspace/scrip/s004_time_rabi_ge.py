@@ -16,10 +16,12 @@ from qick.asm_v2 import AveragerProgramV2
 # ===================================================================
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.fitting import decaysin, fitdecaysin, fix_phase
 from ..tools.module_fitzcu import lengthrabi_analyze
 from ..tools.yamltool import yml_comment
+from ..tools.program_cache import get_program
 from ..plotter.liveplot import liveplotfun
 from ..plotter.plot_utils import plot_final
 
@@ -164,7 +166,9 @@ class Time_Rabi:
     def liveplot(self, py_avg, time_axis):
         def create_rabi_prog(length_val):
             self.cfg["qb_length_ge"] = length_val
-            return LengthRabiProgram(
+            # Cached: later software-average passes reuse the compiled programs
+            return get_program(
+                LengthRabiProgram,
                 self.soccfg,
                 reps=self.cfg["reps"],
                 final_delay=self.cfg["relax_delay"],
@@ -206,7 +210,7 @@ class Time_Rabi:
         file_path = get_next_filename_labber(DATA_PATH, expt_name, yoko_value)
 
         dict_val = yml_comment(self.cfg)
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={"name": "Time", "unit": "s", "values": self.time_step * 1e-6},
             z_info={"name": "Signal", "unit": "ADC unit", "values": self.iqdata},
@@ -214,4 +218,4 @@ class Time_Rabi:
             tag="Rabi",
         )
 
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
@@ -16,7 +16,8 @@ from qick.asm_v2 import AveragerProgramV2
 # ===================================================================
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.fitting import decaysin, fitdecaysin, expfunc, fitexp
 from ..tools.module_fitzcu import T2fring_analyze
 from ..tools.yamltool import yml_comment
@@ -336,7 +337,7 @@ class SpinEcho:
 
         dict_val = yml_comment(self.cfg)
 
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={"name": "Times", "unit": "us", "values": self.delay_times},
             z_info={"name": "Signal", "unit": "ADC unit", "values": self.iqdata},
@@ -344,4 +345,4 @@ class SpinEcho:
             tag="Spin Echo",
         )
 
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
@@ -12,7 +12,8 @@ from tqdm.auto import tqdm
 # ----- User Library ----- #
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async, saveh5_async
 from ..tools.module_fitzcu import resonator_circlefit, resonator_analyze, post_rotate
 from ..tools.fitting import fit_asym_lor, asym_lorfunc
 from ..system_tool.yamltool import yml_comment
@@ -205,14 +206,14 @@ class Resonator_onetone_ef:
 
         dict_val = yml_comment(self.cfg)
 
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={"name": "Frequency", "unit": "Hz", "values": self.freqs * 1e6},
             z_info={"name": "Signal", "unit": "ADC unit", "values": self.iqdata},
             comment=(f"{dict_val}"),
             tag="OneTone",
         )
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
 
 
 if __name__ == "__main__":
@@ -275,4 +276,4 @@ if __name__ == "__main__":
 
         result = {"T1": "350us", "T2": "130us"}
 
-        saveh5(file_path, data_dict, result)
+        saveh5_async(file_path, data_dict, result)
@@ -12,7 +12,8 @@ from tqdm.auto import tqdm
 # ----- User Library ----- #
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async, saveh5_async
 from ..tools.module_fitzcu import amprabi_analyze, post_rotate, pipulse_analyze
 from ..tools.fitting import decaysin, fitdecaysin
 from ..tools.yamltool import yml_comment
@@ -239,7 +240,7 @@ class Amp_Rabi_ef:
         dict_val = yml_comment(self.cfg)
 
         if save_sim:
-            hdf5_generator(
+            hdf5_generator_async(
                 filepath=file_path,
                 x_info={"name": "Gain", "unit": "DAC unit", "values": self.gains},
                 y_info={"name": "simulate", "unit": "None", "values": np.array([0, 1])},
@@ -252,7 +253,7 @@ class Amp_Rabi_ef:
                 tag="Rabi",
             )
         else:
-            hdf5_generator(
+            hdf5_generator_async(
                 filepath=file_path,
                 x_info={"name": "Gain", "unit": "DAC unit", "values": self.gains},
                 z_info={"name": "Signal", "unit": "ADC unit", "values": self.iqdata},
@@ -260,7 +261,7 @@ class Amp_Rabi_ef:
                 tag="Rabi",
             )
 
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
 
 
 if __name__ == "__main__":
@@ -324,4 +325,4 @@ if __name__ == "__main__":
 
         result = {"T1": "350us", "T2": "130us"}
 
-        saveh5(file_path, data_dict, result)
+        saveh5_async(file_path, data_dict, result)
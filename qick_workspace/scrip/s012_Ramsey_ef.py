@@ -12,7 +12,8 @@ from tqdm.auto import tqdm
 # ----- User Library ----- #
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async, saveh5_async
 from ..tools.module_fitzcu import T2fring_analyze, post_rotate
 from ..tools.fitting import fitdecaysin, decaysin
 from ..system_tool.yamltool import yml_comment
@@ -223,7 +224,7 @@ class Ramsey_ef:
         dict_val = yml_comment(self.cfg)
 
         if save_sim:
-            hdf5_generator(
+            hdf5_generator_async(
                 filepath=file_path,
                 x_info={"name": "Times", "unit": "us", "values": self.delay_times},
                 y_info={"name": "simulate", "unit": "None", "values": np.array([0, 1])},
@@ -236,7 +237,7 @@ class Ramsey_ef:
                 tag="Ramsey",
             )
         else:
-            hdf5_generator(
+            hdf5_generator_async(
                 filepath=file_path,
                 x_info={"name": "Times", "unit": "us", "values": self.delay_times},
                 z_info={"name": "Signal", "unit": "ADC unit", "values": self.iqdata},
@@ -244,7 +245,7 @@ class Ramsey_ef:
                 tag="Ramsey",
             )
 
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
 
 
 if __name__ == "__main__":
@@ -307,4 +308,4 @@ if __name__ == "__main__":
 
         result = {"T1": "350us", "T2": "130us"}
 
-        saveh5(file_path, data_dict, result)
+        saveh5_async(file_path, data_dict, result)
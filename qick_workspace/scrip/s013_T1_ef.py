@@ -12,7 +12,8 @@ from tqdm.auto import tqdm
 # ----- User Library ----- #
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.module_fitzcu import T1_analyze, post_rotate
 from ..tools.fitting import expfunc, fitexp
 from ..system_tool.yamltool import yml_comment
@@ -195,7 +196,7 @@ class T1_ef:
 
         dict_val = yml_comment(self.cfg)
 
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={"name": "Times", "unit": "us", "values": self.delay_times},
             z_info={"name": "Signal", "unit": "ADC unit", "values": self.iqdata},
@@ -203,4 +204,4 @@ class T1_ef:
             tag="T1",
         )
 
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
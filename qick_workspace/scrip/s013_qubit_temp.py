@@ -13,7 +13,8 @@ from scipy.optimize import root_scalar
 # ----- User Library ----- #
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.module_fitzcu import amprabi_analyze, post_rotate, pipulse_analyze
 from ..tools.fitting import decaysin, fitdecaysin
 from ..system_tool.yamltool import yml_comment
@@ -287,7 +288,7 @@ class Qubit_temperature:
         dict_val = yml_comment(self.cfg)
 
         if save_sim:
-            hdf5_generator(
+            hdf5_generator_async(
                 filepath=file_path,
                 x_info={"name": "Gain", "unit": "DAC unit", "values": self.gains},
                 y_info={"name": "simulate", "unit": "None", "values": np.array([0, 1])},
@@ -300,7 +301,7 @@ class Qubit_temperature:
                 tag="Rabi",
             )
         else:
-            hdf5_generator(
+            hdf5_generator_async(
                 filepath=file_path,
                 x_info={"name": "Gain", "unit": "DAC unit", "values": self.gains},
                 z_info={"name": "Signal", "unit": "ADC unit", "values": self.iqdata},
@@ -308,7 +309,7 @@ class Qubit_temperature:
                 tag="Rabi",
             )
 
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
 
 
 if __name__ == "__main__":
@@ -18,7 +18,8 @@ from qick.asm_v2 import AveragerProgramV2, QickSpan, QickSweep1D
 # ===================================================================
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.yamltool import yml_comment
 
 ### AllXY Sequence ###
@@ -268,7 +269,7 @@ class AllXY:
 
         dict_val = yml_comment(self.cfg)
 
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={
                 "name": "Sequence",
@@ -279,4 +280,4 @@ class AllXY:
             comment=(f"{dict_val}"),
             tag="ALLXY",
         )
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
@@ -553,6 +553,7 @@ class RandomizedBenchmarking:
                 full_sequence = expand_full_sequence(pulse_name_seq, total_clifford)
                 self.cfg["gate_seq"] = full_sequence
 
+                # Random sequences rarely repeat: build directly, not through the cache
                 rb = RBProgram(
                     self.soccfg,
                     reps=self.cfg["reps"],
@@ -20,7 +20,9 @@ from qick.asm_v2 import AveragerProgramV2, QickSpan, QickSweep1D
 # ===================================================================
 from ..tools.system_cfg import *
 from ..tools.system_cfg import DATA_PATH
-from ..tools.system_tool import get_next_filename_labber, hdf5_generator
+from ..tools.system_tool import get_next_filename_labber
+from ..tools.config_snapshot import cfg_overlay
+from ..tools.save_queue import hdf5_generator_async
 from ..tools.fitting import *
 from ..tools.yamltool import yml_comment
 
@@ -246,10 +248,7 @@ class Tomography:
     def _run_calibration(self, pyavg):
         """Internal method to calibrate |0> and |1> states."""
         print("Calibrating |0> state...")
-        cfg_g = self.cfg.copy()
-        cfg_g["tomo_axis"] = "Z"
-        cfg_g["cal_pulse"] = "None"
-        cfg_g["prep_pulse"] = None
+        cfg_g = cfg_overlay(self.cfg, tomo_axis="Z", cal_pulse="None", prep_pulse=None)
         prog_g = StateTomography(
             self.soccfg,
             reps=self.cfg["reps"],
@@ -260,10 +259,7 @@ class Tomography:
         iq_g = iq_list_g[0][0].dot([1, 1j])
 
         print("Calibrating |1> state...")
-        cfg_e = self.cfg.copy()
-        cfg_e["tomo_axis"] = "Z"
-        cfg_e["cal_pulse"] = "x180"
-        cfg_e["prep_pulse"] = None
+        cfg_e = cfg_overlay(self.cfg, tomo_axis="Z", cal_pulse="x180", prep_pulse=None)
         prog_e = StateTomography(
             self.soccfg,
             reps=self.cfg["reps"],
@@ -288,10 +284,9 @@ class Tomography:
         for axis in tqdm(
             ["X", "Y", "Z"], desc=f"Tomography (State: {prep_pulse_name})"
         ):
-            cfg = self.cfg.copy()
-            cfg["tomo_axis"] = axis
-            cfg["cal_pulse"] = None
-            cfg["prep_pulse"] = prep_pulse_name
+            cfg = cfg_overlay(
+                self.cfg, tomo_axis=axis, cal_pulse=None, prep_pulse=prep_pulse_name
+            )
             prog = StateTomography(
                 self.soccfg,
                 reps=self.cfg["reps"],
@@ -548,11 +543,11 @@ class Tomography:
             [self.tomo_data_raw["X"], self.tomo_data_raw["Y"], self.tomo_data_raw["Z"]]
         )
 
-        hdf5_generator(
+        hdf5_generator_async(
             filepath=file_path,
             x_info={"name": "Axis", "unit": "None (0=X, 1=Y, 2=Z)", "values": x_vals},
             z_info={"name": "Signal", "unit": "ADC unit", "values": z_vals},
             comment=comment,
             tag="Tomography",
         )
-        print(f"Data save to {file_path}")
+        print(f"Data queued for {file_path}")
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from qick_workspace.tools.acquisition import RoundAccumulator
+
+
+def _rounds(n_rounds, shape, seed):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n_rounds, *shape)) + 1j * rng.normal(size=(n_rounds, *shape))
+
+
+def _check(acc, rounds):
+    assert acc.count == len(rounds)
+    np.testing.assert_allclose(acc.mean, np.mean(rounds, axis=0))
+    np.testing.assert_allclose(acc.magnitude, np.abs(np.mean(rounds, axis=0)))
+    np.testing.assert_allclose(acc.variance, np.var(rounds, axis=0, ddof=1))
+    np.testing.assert_allclose(
+        acc.stderr, np.sqrt(np.var(rounds, axis=0, ddof=1) / len(rounds))
+    )
+
+
+def test_mean_and_variance_match_numpy():
+    rounds = _rounds(25, (3, 17), seed=0)
+    acc = RoundAccumulator(len(rounds))
+    for iq in rounds:
+        acc.add(iq)
+    _check(acc, rounds)
+
+
+def test_add_iq_matches_add():
+    rounds = _rounds(10, (31,), seed=1)
+    acc = RoundAccumulator(len(rounds), shape=(31,))
+    for iq in rounds:
+        acc.add_iq(np.stack([iq.real, iq.imag], axis=-1))
+    _check(acc, rounds)
+
+
+def test_reset_starts_a_fresh_average():
+    first = _rounds(8, (11,), seed=2) + 5.0
+    second = _rounds(12, (11,), seed=3)
+    acc = RoundAccumulator(len(first))
+    for iq in first:
+        acc.add(iq)
+    _check(acc, first)
+
+    acc.reset()
+    assert acc.count == 0
+    assert acc.mean is None and acc.variance is None
+
+    acc.add(second[0])
+    np.testing.assert_allclose(acc.mean, second[0])
+    assert acc.variance is None
+    for iq in second[1:]:
+        acc.add(iq)
+    _check(acc, second)
+
+
+if __name__ == "__main__":
+    test_mean_and_variance_match_numpy()
+    test_add_iq_matches_add()
+    test_reset_starts_a_fresh_average()
+    print("All checks passed!")
@@ -0,0 +1,53 @@
+import copy
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.getcwd())
+
+from qick_workspace.tools.ncfg import config_list
+from qick_workspace.tools.system_tool import ExperimentConfig
+
+
+@pytest.fixture
+def cfg():
+    return ExperimentConfig(copy.deepcopy(config_list))
+
+
+def test_leaf_update_refreshes_only_that_qubit(cfg):
+    other = cfg.snapshot("Q2")
+    cfg.update({"res_gain_ge": 0.3}, q_index="Q1")
+    assert cfg.get_qubit("Q1")["res_gain_ge"] == 0.3
+    assert cfg.read_config("Q1")["res"]["res_gain_ge"] == 0.3
+    assert cfg.snapshot("Q2") is other
+
+
+def test_merge_with_sub_dict_then_leaf(cfg):
+    # Replacing "res" drops res_gain_ge from Q1, so the leaf has nothing to set
+    cfg.update({"res": {"res_freq_ge": 1}, "res_gain_ge": 0.3}, q_index="Q1")
+    assert cfg.read_config("Q1")["res"] == {"res_freq_ge": 1}
+    q1 = cfg.get_qubit("Q1")
+    assert q1["res_freq_ge"] == 1
+    assert cfg.read_config("Q2")["res"]["res_gain_ge"] != 0.3
+
+
+def test_merge_with_leaf_then_sub_dict(cfg):
+    cfg.update(
+        {"qb_gain_ge": 0.5, "res": {"res_freq_ge": 2, "res_gain_ge": 0.1}},
+        q_index="Q1",
+    )
+    assert cfg.read_config("Q1")["res"] == {"res_freq_ge": 2, "res_gain_ge": 0.1}
+    q1 = cfg.get_qubit("Q1")
+    assert q1["res_freq_ge"] == 2
+    assert q1["res_gain_ge"] == 0.1
+
+
+def test_merge_sub_dict_then_leaf_inside_it(cfg):
+    cfg.update({"res": {"res_freq_ge": 1, "res_gain_ge": 0.2}, "res_gain_ge": 0.4}, q_index="Q1")
+    assert cfg.read_config("Q1")["res"] == {"res_freq_ge": 1, "res_gain_ge": 0.4}
+    assert cfg.get_qubit("Q1")["res_gain_ge"] == 0.4
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
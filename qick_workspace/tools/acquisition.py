@@ -0,0 +1,362 @@
+"""
+Acquisition helpers shared by the NiceGUI pages and the notebook live plotters.
+
+RoundAccumulator keeps the running software average of repeated ``prog.acquire``
+rounds in preallocated buffers, so that long 1D/2D sweeps with many averages do
+not allocate new arrays on every round.
+
+RoundPipeline runs the ``prog.acquire`` rounds on a worker thread and hands the
+raw results over through a small bounded queue, so the board keeps acquiring
+the next round while the previous one is being averaged and plotted.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+
+class RoundAccumulator:
+    """
+    Running average of complex IQ rounds with per-point variance and timing.
+
+    All buffers are allocated once (on construction if ``shape`` is given,
+    otherwise on the first round) and updated in place. ``mean``, ``magnitude``
+    and ``variance`` return read-only views of those buffers, so callers must
+    copy them if they want to keep a snapshot across rounds.
+
+    Args:
+        total_rounds: Number of rounds expected (used for progress / ETA).
+        shape: Optional sweep shape (e.g. ``(steps,)`` or ``(rows, steps)``).
+    """
+
+    def __init__(self, total_rounds: int, shape: Optional[Tuple[int, ...]] = None):
+        self.total_rounds = int(total_rounds)
+        self.count = 0
+        self.shape = None
+
+        self._start_time = None
+        self._last_time = None
+        self.last_round_time = None
+
+        if shape is not None:
+            self._allocate(tuple(shape))
+
+    def _allocate(self, shape: Tuple[int, ...]) -> None:
+        self.shape = shape
+        self._sum = np.zeros(shape, dtype=complex)
+        self._mean = np.zeros(shape, dtype=complex)
+        self._magnitude = np.zeros(shape, dtype=float)
+        self._m2 = np.zeros(shape, dtype=float)
+        self._variance = np.zeros(shape, dtype=float)
+
+        # Scratch buffers reused every round
+        self._round = np.zeros(shape, dtype=complex)
+        self._delta = np.zeros(shape, dtype=complex)
+        self._scratch = np.zeros(shape, dtype=float)
+
+    def reset(self) -> None:
+        """Clear the accumulated data but keep the allocated buffers."""
+        self.count = 0
+        self._start_time = None
+        self._last_time = None
+        self.last_round_time = None
+        if self.shape is not None:
+            for buf in (
+                self._sum,
+                self._mean,
+                self._magnitude,
+                self._m2,
+                self._variance,
+                self._round,
+                self._delta,
+                self._scratch,
+            ):
+                buf.fill(0)
+
+    def start(self) -> None:
+        """Start the timing clock (called automatically by the first ``add``)."""
+        self._start_time = time.perf_counter()
+        self._last_time = self._start_time
+
+    def add_iq(self, iq: np.ndarray) -> None:
+        """
+        Add one round of raw readout data.
+
+        Args:
+            iq: Array of shape (*shape, 2) holding I and Q, e.g. ``iq_list[0][0]``.
+        """
+        iq = np.asarray(iq)
+        if self.shape is None:
+            self._allocate(iq.shape[:-1])
+        self._round.real[...] = iq[..., 0]
+        self._round.imag[...] = iq[..., 1]
+        self._accumulate()
+
+    def add(self, iq_data: np.ndarray) -> None:
+        """
+        Add one round of complex IQ data (I + 1j*Q).
+
+        Args:
+            iq_data: Complex array of shape ``shape``.
+        """
+        iq_data = np.asarray(iq_data)
+        if self.shape is None:
+            self._allocate(iq_data.shape)
+        self._round[...] = iq_data
+        self._accumulate()
+
+    def _accumulate(self) -> None:
+        if self._start_time is None:
+            self.start()
+
+        self.count += 1
+        n = self.count
+
+        # Welford update: delta uses the mean *before* this round,
+        # (x - new_mean) = delta * (n - 1) / n, so M2 += |delta|^2 * (n - 1) / n
+        np.subtract(self._round, self._mean, out=self._delta)
+        self._sum += self._round
+        np.divide(self._sum, n, out=self._mean)
+
+        np.abs(self._delta, out=self._scratch)
+        np.multiply(self._scratch, self._scratch, out=self._scratch)
+        self._scratch *= (n - 1) / n
+        self._m2 += self._scratch
+
+        np.abs(self._mean, out=self._magnitude)
+
+        now = time.perf_counter()
+        self.last_round_time = now - self._last_time
+        self._last_time = now
+
+    # ------------------------------------------------------------------ #
+    # Read-only views
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _readonly(buf: np.ndarray) -> np.ndarray:
+        view = buf.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def mean(self) -> Optional[np.ndarray]:
+        """Current complex average (read-only view)."""
+        if self.count == 0:
+            return None
+        return self._readonly(self._mean)
+
+    @property
+    def magnitude(self) -> Optional[np.ndarray]:
+        """Magnitude of the current average (read-only view)."""
+        if self.count == 0:
+            return None
+        return self._readonly(self._magnitude)
+
+    @property
+    def variance(self) -> Optional[np.ndarray]:
+        """Per-point sample variance E|x - mean|^2 across rounds (read-only)."""
+        if self.count < 2:
+            return None
+        np.divide(self._m2, self.count - 1, out=self._variance)
+        return self._readonly(self._variance)
+
+    @property
+    def stderr(self) -> Optional[np.ndarray]:
+        """Per-point standard error of the mean (new array)."""
+        var = self.variance
+        if var is None:
+            return None
+        return np.sqrt(var / self.count)
+
+    def result(self) -> Optional[np.ndarray]:
+        """Return a copy of the current average, safe to keep after the run."""
+        if self.count == 0:
+            return None
+        return self._mean.copy()
+
+    # ------------------------------------------------------------------ #
+    # Timing
+    # ------------------------------------------------------------------ #
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the first round started."""
+        if self._start_time is None:
+            return 0.0
+        return self._last_time - self._start_time
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Average rounds per second, or None before the first round."""
+        if self.count == 0 or self.elapsed <= 0:
+            return None
+        return self.count / self.elapsed
+
+    @property
+    def remaining(self) -> Optional[float]:
+        """Estimated seconds until ``total_rounds`` is reached."""
+        rate = self.rate
+        if rate is None:
+            return None
+        return max(self.total_rounds - self.count, 0) / rate
+
+
+class RoundPipeline:
+    """
+    Double-buffered acquisition: a worker thread keeps issuing single-round
+    ``prog.acquire`` calls while the consumer averages / plots finished rounds.
+
+    The queue is bounded (``depth`` rounds), so if the consumer falls behind the
+    worker blocks instead of piling up data in memory. Rounds are never dropped.
+    An exception raised by ``prog.acquire`` is re-raised in the consumer.
+
+    Typical use::
+
+        pipeline = RoundPipeline(prog, soc, py_avg).start()
+        try:
+            for iq in pipeline:
+                acc.add_iq(iq)
+                ...
+        finally:
+            pipeline.stop()
+
+    Args:
+        prog: The QICK program instance.
+        soc: The QICK SoC instance (or Pyro proxy).
+        rounds: Number of rounds to acquire.
+        depth: Number of finished rounds that may wait in the queue.
+        readout: (readout, trigger) index of the buffer to hand over, i.e. ``iq_list[ro][trig]``.
+    """
+
+    _DONE = object()
+
+    def __init__(
+        self,
+        prog: Any,
+        soc: Any,
+        rounds: int,
+        depth: int = 2,
+        readout: Tuple[int, int] = (0, 0),
+    ):
+        self.prog = prog
+        self.soc = soc
+        self.rounds = int(rounds)
+        self.readout = readout
+
+        self._queue = queue.Queue(maxsize=max(int(depth), 1))
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.acquired = 0
+        self.busy_time = 0.0
+        self._start_time = None
+        self._end_time = None
+
+    def start(self) -> "RoundPipeline":
+        """Start the worker thread. Returns self for chaining."""
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+        return self
+
+    def _put(self, item) -> bool:
+        # Block while the consumer is behind, but keep checking for stop()
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _worker(self) -> None:
+        ro, trig = self.readout
+        try:
+            for _ in range(self.rounds):
+                if self._stop_event.is_set():
+                    break
+                t0 = time.perf_counter()
+                iq_list = self.prog.acquire(self.soc, rounds=1, progress=False)
+                self.busy_time += time.perf_counter() - t0
+                self.acquired += 1
+                if not self._put(iq_list[ro][trig]):
+                    break
+        except BaseException as e:
+            self._put(e)
+        finally:
+            self._end_time = time.perf_counter()
+            if not self._put(self._DONE):
+                # Stopped: still wake up a consumer blocked in get()
+                try:
+                    self._queue.put_nowait(self._DONE)
+                except queue.Full:
+                    pass
+
+    def get(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        """
+        Wait for the next finished round.
+
+        Args:
+            timeout: Seconds to wait, or None to wait forever.
+
+        Returns:
+            The raw (..., 2) I/Q array of the round, or None when all rounds
+            are done or the pipeline was stopped.
+
+        Raises:
+            queue.Empty: If ``timeout`` expires.
+            Exception: Whatever ``prog.acquire`` raised in the worker.
+        """
+        if self._stop_event.is_set():
+            return None
+        item = self._queue.get(timeout=timeout)
+        if item is self._DONE:
+            # Leave the sentinel in place so repeated calls keep returning None
+            self._queue.put_nowait(item)
+            return None
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        while True:
+            iq = self.get()
+            if iq is None:
+                return
+            yield iq
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Ask the worker to stop after the round in flight and wait for it.
+
+        Args:
+            timeout: Seconds to wait for the worker (None waits until the
+                     current ``prog.acquire`` returns).
+        """
+        self._stop_event.set()
+        # Drain so a worker blocked on a full queue can exit
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def duty_cycle(self) -> Optional[float]:
+        """Fraction of wall time the worker spent inside ``prog.acquire``."""
+        if self._start_time is None:
+            return None
+        end = self._end_time if self._end_time is not None else time.perf_counter()
+        if end <= self._start_time:
+            return None
+        return self.busy_time / (end - self._start_time)
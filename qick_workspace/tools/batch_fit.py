@@ -0,0 +1,189 @@
+"""
+Batched fitting of many traces with the fitters of ``fitting.py``.
+
+Flux maps, punchout maps and repeated T1 / T2 monitoring produce hundreds to
+thousands of 1D traces. ``fit_batch`` fits all rows of a 2D array with one of
+the single-trace fitters (``fitexp``, ``fitdecaysin``, ``fitlor``,
+``fithanger``, ``fitrb``, ...) and returns stacked results:
+
+* Consecutive traces are usually close (neighbouring flux points, repeated
+  T1 runs), so each trace is warm-started from the solution of the previous
+  one when that fit succeeded. This cuts iterations and avoids the bad initial
+  guesses of the per-trace heuristics on noisy rows. Some fitters scale
+  their curve_fit bounds with an initial parameter (the amplitude of
+  ``fitdecaysin``, ``fitsin``, ...); those parameters are not warm-started,
+  so the bounds always follow the current trace as in a cold fit.
+* With ``workers > 1`` the rows are split into contiguous chunks that are
+  fitted in a process pool; warm-starting happens inside each chunk.
+
+Usage::
+
+    from qick_workspace.tools import fitting
+    from qick_workspace.tools.batch_fit import fit_batch
+
+    res = fit_batch(fitting.fitexp, times, t1_traces, workers=4)
+    t1 = res.popt[:, 2]
+    t1[~res.success] = np.nan
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+# fitparams entries that fitters derive their curve_fit bounds from. A warm
+# start keeps them at their cold value: seeding them from the previous trace
+# would move the bounds with it, pinning the fit after a jump in the data
+_BOUND_PARAMS = {
+    "fitsin": (0,),
+    "fitdecaysin": (0, 1),
+    "fittwofreq_decaysin": (0,),
+    "fit_gauss": (0, 2),
+}
+
+
+@dataclass
+class BatchFitResult:
+    """
+    Stacked results of ``fit_batch`` (one row per trace).
+
+    Attributes:
+        popt: (n_traces, n_params) optimized parameters, NaN where a fit failed.
+        pcov: (n_traces, n_params, n_params) covariance matrices, inf where unknown.
+        success: (n_traces,) True where the fit converged to finite parameters
+                 with a finite covariance.
+        warm_started: (n_traces,) True where the fit started from the previous
+                      trace's solution.
+    """
+
+    popt: np.ndarray
+    pcov: np.ndarray
+    success: np.ndarray
+    warm_started: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.popt)
+
+
+def _fit_one(fitter, xdata, ydata, fitparams, n_params):
+    """Run one fitter call and return (popt, pcov, success)."""
+    popt = np.full(n_params, np.nan)
+    pcov = np.full((n_params, n_params), np.inf)
+    try:
+        # Fitters fill in their guesses in place, so always hand over a copy
+        result = fitter(xdata, ydata, None if fitparams is None else list(fitparams))
+    except Exception as e:
+        print(f"Warning: batch fit of one trace failed: {e}")
+        return popt, pcov, False
+
+    p = np.asarray(result[0], dtype=float)
+    c = np.asarray(result[1], dtype=float)
+    if p.shape == (n_params,):
+        popt = p
+    if c.shape == (n_params, n_params):
+        pcov = c
+    success = bool(np.all(np.isfinite(popt)) and np.all(np.isfinite(np.diag(pcov))))
+    return popt, pcov, success
+
+
+def _fit_chunk(fitter, xdata, ydata, fitparams, n_params, warm_start):
+    """Fit the rows of ydata one after the other, warm-starting from the last good fit."""
+    n = len(ydata)
+    popt = np.full((n, n_params), np.nan)
+    pcov = np.full((n, n_params, n_params), np.inf)
+    success = np.zeros(n, dtype=bool)
+    warm = np.zeros(n, dtype=bool)
+
+    bound_params = _BOUND_PARAMS.get(getattr(fitter, "__name__", ""), ())
+    previous = None
+    for i in range(n):
+        start = fitparams
+        if warm_start and previous is not None:
+            start = list(previous)
+            for j in bound_params:
+                start[j] = None if fitparams is None else fitparams[j]
+            warm[i] = True
+        popt[i], pcov[i], success[i] = _fit_one(fitter, xdata, ydata[i], start, n_params)
+
+        if not success[i] and warm[i]:
+            # A neighbour's solution can be a bad start across a jump: retry cold
+            popt[i], pcov[i], success[i] = _fit_one(fitter, xdata, ydata[i], fitparams, n_params)
+            warm[i] = False
+        if success[i]:
+            previous = popt[i]
+    return popt, pcov, success, warm
+
+
+def _n_params(fitter, xdata, ydata, fitparams) -> int:
+    if fitparams is not None:
+        return len(fitparams)
+    # Probe with the first finite trace; fitters define their own parameter count
+    for row in ydata:
+        if np.all(np.isfinite(row)):
+            result = fitter(xdata, row, None)
+            return len(result[0])
+    raise ValueError("fit_batch: no finite trace to fit")
+
+
+def fit_batch(
+    fitter: Callable,
+    xdata: np.ndarray,
+    ydata: np.ndarray,
+    fitparams: Optional[Sequence[Optional[float]]] = None,
+    warm_start: bool = True,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> BatchFitResult:
+    """
+    Fit every row of ydata with a single-trace fitter.
+
+    Args:
+        fitter: A fitter of fitting.py, called as fitter(xdata, y, fitparams)
+                and returning (pOpt, pCov, ...).
+        xdata: (n_points,) x axis shared by all traces.
+        ydata: (n_traces, n_points) traces; a 1D array is fitted as one trace.
+        fitparams: Initial parameters for cold starts (None entries are guessed
+                   by the fitter).
+        warm_start: Start each trace from the previous successful solution.
+        workers: Processes to fit with; None / 0 / 1 fits in this process,
+                 -1 uses os.cpu_count().
+        chunk_size: Traces per process task (default: split evenly over workers).
+
+    Returns:
+        BatchFitResult with stacked popt / pcov and per-trace success flags.
+    """
+    xdata = np.asarray(xdata, dtype=float)
+    ydata = np.atleast_2d(np.asarray(ydata))
+    if ydata.shape[1] != len(xdata):
+        raise ValueError(
+            f"fit_batch: traces have {ydata.shape[1]} points but xdata has {len(xdata)}"
+        )
+    if fitparams is not None:
+        fitparams = list(fitparams)
+
+    n_traces = len(ydata)
+    n_params = _n_params(fitter, xdata, ydata, fitparams)
+
+    if workers == -1:
+        workers = os.cpu_count() or 1
+    workers = min(int(workers or 1), n_traces)
+
+    if workers <= 1:
+        chunks = [_fit_chunk(fitter, xdata, ydata, fitparams, n_params, warm_start)]
+    else:
+        if chunk_size is None:
+            chunk_size = -(-n_traces // workers)
+        bounds: List[int] = list(range(0, n_traces, max(int(chunk_size), 1))) + [n_traces]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _fit_chunk, fitter, xdata, ydata[lo:hi], fitparams, n_params, warm_start
+                )
+                for lo, hi in zip(bounds[:-1], bounds[1:])
+            ]
+            chunks = [f.result() for f in futures]
+
+    popt, pcov, success, warm = (np.concatenate(parts) for parts in zip(*chunks))
+    return BatchFitResult(popt=popt, pcov=pcov, success=success, warm_started=warm)
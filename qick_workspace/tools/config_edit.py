@@ -0,0 +1,207 @@
+"""
+Transactional edit sessions for ExperimentConfig.
+
+The sidebar used to call ``ExperimentConfig.update`` (and re-read the whole
+nested config) on every change event, i.e. once per typed character. A
+``ConfigEditSession`` buffers those edits instead: ``stage`` only records the
+latest value per (qubit, key path), ``commit`` validates the whole batch and
+applies it as one transaction, and every committed transaction can be undone
+and redone.
+
+Usage::
+
+    session = ConfigEditSession(exp_cfg)
+    session.stage("res.res_freq_ge", "5351.898", q_id="Q1")
+    session.stage("reps", 1000.0, q_id="Q1")
+    edits = session.commit()        # [ConfigEdit(...), ConfigEdit(...)]
+    session.undo()                  # restores both values
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple, Union
+
+
+@dataclass(frozen=True)
+class ConfigEdit:
+    """One applied change of a nested config value."""
+
+    q_index: int
+    key_path: str
+    old: Any
+    new: Any
+
+
+class ConfigEditSession:
+    """
+    Buffer, validate and apply config edits in transactions with undo/redo.
+
+    Args:
+        exp_cfg: The ExperimentConfig to edit.
+        max_history: Number of committed transactions kept for undo.
+        source: Source recorded in the config change journal.
+    """
+
+    # Keys (or key-path prefixes) that only take integer values
+    integer_keys = ("reps", "steps", "py_avg")
+    integer_prefixes = ("ch",)
+
+    def __init__(self, exp_cfg, max_history: int = 100, source: str = "sidebar"):
+        self.exp_cfg = exp_cfg
+        self.source = source
+        self.max_history = max_history
+        self._pending: Dict[Tuple[int, str], Any] = {}
+        self._undo: List[List[ConfigEdit]] = []
+        self._redo: List[List[ConfigEdit]] = []
+        self._lock = threading.RLock()
+
+    # --- Staging -------------------------------------------------------------
+
+    def stage(self, key_path: str, value: Any, q_id: Union[int, str]) -> None:
+        """Record a new value; a later stage of the same key replaces it."""
+        idx = self.exp_cfg._resolve_indices(q_id)[0]
+        with self._lock:
+            self._pending.pop((idx, key_path), None)
+            self._pending[(idx, key_path)] = value
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    @property
+    def pending(self) -> List[Tuple[int, str]]:
+        """(qubit index, key path) of every staged edit."""
+        with self._lock:
+            return list(self._pending)
+
+    def discard(self) -> List[Tuple[int, str]]:
+        """Drop all staged edits and return their (qubit, key path) pairs."""
+        with self._lock:
+            dropped = list(self._pending)
+            self._pending.clear()
+        return dropped
+
+    # --- Transactions ----------------------------------------------------------
+
+    def validate(self) -> List[ConfigEdit]:
+        """
+        Check and coerce every staged value against the stored one.
+
+        Returns:
+            The edits that would change the config.
+
+        Raises:
+            ValueError: Listing every staged value that is invalid.
+        """
+        with self._lock:
+            pending = list(self._pending.items())
+
+        edits, errors = [], []
+        for (idx, key_path), value in pending:
+            try:
+                old = self.exp_cfg.get_value(key_path, idx)
+                new = self._coerce(key_path, old, value)
+            except (KeyError, TypeError, ValueError) as e:
+                errors.append(f"{key_path}: {e}")
+                continue
+            if type(new) is not type(old) or new != old:
+                edits.append(ConfigEdit(idx, key_path, old, new))
+
+        if errors:
+            raise ValueError("; ".join(errors))
+        return edits
+
+    def commit(self) -> List[ConfigEdit]:
+        """
+        Validate and apply all staged edits as one transaction.
+
+        The batch is all-or-nothing: if any value is invalid, nothing is
+        applied, the staged edits are dropped and ValueError is raised.
+
+        Returns:
+            The applied edits (empty if nothing changed).
+        """
+        with self._lock:
+            try:
+                edits = self.validate()
+            finally:
+                self._pending.clear()
+            if not edits:
+                return []
+
+            self._apply(edits, undo=False)
+            self._undo.append(edits)
+            del self._undo[: -self.max_history]
+            self._redo.clear()
+        return edits
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def undo(self) -> List[ConfigEdit]:
+        """Revert the last committed transaction and return its edits."""
+        with self._lock:
+            if not self._undo:
+                return []
+            edits = self._undo.pop()
+            self._apply(edits, undo=True)
+            self._redo.append(edits)
+        return edits
+
+    def redo(self) -> List[ConfigEdit]:
+        """Re-apply the last undone transaction and return its edits."""
+        with self._lock:
+            if not self._redo:
+                return []
+            edits = self._redo.pop()
+            self._apply(edits, undo=False)
+            self._undo.append(edits)
+        return edits
+
+    # --- Helpers ---------------------------------------------------------------
+
+    def _apply(self, edits: List[ConfigEdit], undo: bool) -> None:
+        source = f"{self.source}:undo" if undo else self.source
+        for edit in reversed(edits) if undo else edits:
+            value = edit.old if undo else edit.new
+            self.exp_cfg.update(
+                edit.key_path, value, q_index=edit.q_index, source=source
+            )
+
+    def _coerce(self, key_path: str, old: Any, value: Any) -> Any:
+        """Convert a UI value to the type of the stored value."""
+        if isinstance(value, str):
+            value = value.strip()
+        keys = key_path.split(".")
+
+        if isinstance(old, bool):
+            if isinstance(value, str):
+                if value.lower() not in ("true", "false"):
+                    raise ValueError(f"expected true/false, got {value!r}")
+                return value.lower() == "true"
+            return bool(value)
+
+        if keys[-1] in self.integer_keys or keys[0] in self.integer_prefixes:
+            if value is None or value == "":
+                raise ValueError("value is empty")
+            number = float(value)
+            if not number.is_integer():
+                raise ValueError(f"expected an integer, got {value!r}")
+            return int(number)
+
+        if isinstance(old, (int, float)):
+            if value is None or value == "":
+                raise ValueError("value is empty")
+            number = float(value)
+            # Keep ints as ints unless a fractional value was entered
+            return int(number) if isinstance(old, int) and number.is_integer() else number
+
+        if isinstance(old, str) or old is None:
+            return value if old is None else str(value)
+
+        raise TypeError(f"cannot edit values of type {type(old).__name__}")
@@ -0,0 +1,152 @@
+"""
+Immutable per-qubit config snapshots with copy-on-write overlays.
+
+``ExperimentConfig.snapshot`` hands out a ``ConfigSnapshot``: the flat cfg of
+one qubit at a given config version. Snapshots are cached by the config and
+shared between callers, so they refuse in-place edits. Per-run changes
+(steps, sweeps, ``gate_seq`` ...) go into a ``ConfigOverlay`` instead, which
+shares the snapshot's values and only owns what was written to it.
+
+Snapshot values are scalars, so an overlay is a C-level shallow copy of the
+snapshot plus its overrides; neither ``copy.deepcopy`` nor an AddictDict
+rebuild is needed per run.
+
+Usage::
+
+    snap = exp_cfg.snapshot("Q1")
+    cfg = snap.overlay(steps=101, gate_seq=["X", "Y"])
+    cfg["wait_time"] = QickSweep1D("waitloop", 0, 50)   # snap is untouched
+"""
+
+import copy
+from typing import Any, Dict, Optional
+
+from addict import Dict as AddictDict
+
+
+class ConfigSnapshot(dict):
+    """
+    Read-only flat cfg of one qubit.
+
+    Args:
+        data: Flat key -> value mapping.
+        version: ``ExperimentConfig.version`` the snapshot was taken at.
+        q_index: Index of the qubit in the config list.
+    """
+
+    __slots__ = ("version", "q_index")
+
+    def __init__(self, data: Dict[str, Any], version: int = 0, q_index: Optional[int] = None):
+        dict.__init__(self, data)
+        self.version = version
+        self.q_index = q_index
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(
+            "ConfigSnapshot is read-only; use .overlay() for per-run changes."
+        )
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    update = setdefault = pop = popitem = clear = _readonly
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        if name in ConfigSnapshot.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            self._readonly()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (ConfigSnapshot, (dict(self), self.version, self.q_index))
+
+    def __repr__(self):
+        return f"ConfigSnapshot(q_index={self.q_index}, version={self.version}, {dict.__repr__(self)})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain, mutable dict with the snapshot's values."""
+        return dict(self)
+
+    def overlay(self, overrides: Optional[Dict[str, Any]] = None, **kwargs) -> "ConfigOverlay":
+        """Return a mutable overlay on this snapshot with the given overrides."""
+        return ConfigOverlay.over(self, overrides, **kwargs)
+
+
+class ConfigOverlay(AddictDict):
+    """
+    Mutable cfg layered on a ``ConfigSnapshot``.
+
+    It is an ``addict.Dict`` like the configs ``get_qubit`` always returned,
+    so dot access and existing callers keep working. Writes only ever touch
+    the overlay; ``base`` is the snapshot it was created from.
+    """
+
+    @classmethod
+    def over(
+        cls,
+        base: ConfigSnapshot,
+        overrides: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> "ConfigOverlay":
+        layer = cls()
+        dict.update(layer, base)
+        if overrides:
+            dict.update(layer, overrides)
+        if kwargs:
+            dict.update(layer, kwargs)
+        object.__setattr__(
+            layer, "_base", base if isinstance(base, ConfigSnapshot) else None
+        )
+        return layer
+
+    @property
+    def base(self) -> Optional[ConfigSnapshot]:
+        try:
+            return object.__getattribute__(self, "_base")
+        except AttributeError:
+            return None
+
+    def changes(self) -> Dict[str, Any]:
+        """Keys whose value differs from (or is missing in) the base snapshot."""
+        base = self.base or {}
+        missing = object()
+        return {
+            k: v for k, v in self.items() if base.get(k, missing) is not v
+        }
+
+    def copy(self) -> "ConfigOverlay":
+        """Shallow copy sharing the same base snapshot."""
+        return self.overlay()
+
+    def overlay(self, overrides: Optional[Dict[str, Any]] = None, **kwargs) -> "ConfigOverlay":
+        """Return a new overlay with this one's values plus the given overrides."""
+        layer = ConfigOverlay.over(self, overrides, **kwargs)
+        object.__setattr__(layer, "_base", self.base)
+        return layer
+
+
+def cfg_overlay(cfg: Dict[str, Any], overrides: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+    """
+    Per-run copy of ``cfg`` with overrides applied, without touching ``cfg``.
+
+    Snapshots and overlays are layered cheaply; any other mapping is shallow
+    copied, as ``cfg.copy()`` did before.
+    """
+    if isinstance(cfg, (ConfigSnapshot, ConfigOverlay)):
+        return cfg.overlay(overrides, **kwargs)
+    layer = copy.copy(cfg)
+    if overrides:
+        layer.update(overrides)
+    if kwargs:
+        layer.update(kwargs)
+    return layer
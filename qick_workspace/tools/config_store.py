@@ -0,0 +1,201 @@
+"""
+Persistent store for the experiment config list.
+
+``ExperimentConfig.save_to_py`` pretty-prints Python source, which is slow to
+write, slow to load and loses the history of how a value got there. A
+``ConfigStore`` keeps two files in one directory instead:
+
+* ``config_snapshot.json`` - the full config list, written atomically
+  (temp file + fsync + ``os.replace``), so a crash never leaves half a file.
+* ``config_journal.jsonl`` - append-only, one line per parameter change with
+  timestamp, qubit, key path, old / new value and the source (experiment page,
+  sidebar, ...).
+
+``load`` reads the snapshot and replays only the journal lines written after
+it. JSON is encoded with ``orjson`` when installed and the standard ``json``
+module otherwise. The Python / YAML exports of ``ExperimentConfig`` remain as
+human-readable outputs.
+
+Usage::
+
+    store = ConfigStore("config_store")
+    exp_cfg = ExperimentConfig(store.load() or config_list, store=store)
+    exp_cfg.update("res.res_freq_ge", 5351.9, "Q1", source="onetone")
+    store.history("res.res_freq_ge", qubit="Q1")
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, complex):
+        return {"real": obj.real, "imag": obj.imag}
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    raise TypeError(f"Cannot store {type(obj).__name__} in the config")
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode obj as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(obj, default=_json_default, separators=(",", ":")).encode()
+
+
+def loads(data: bytes) -> Any:
+    """Decode JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Write data to path via a temp file in the same directory and os.replace."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def set_path(config_list: List[Dict[str, Any]], q_index: int, key_path: str, value: Any) -> None:
+    """Set a dot-notation key path of one qubit config, creating dicts as needed."""
+    target = config_list[q_index]
+    keys = key_path.split(".")
+    for k in keys[:-1]:
+        target = target.setdefault(k, {})
+    target[keys[-1]] = value
+
+
+class ConfigStore:
+    """
+    Snapshot + change journal of a config list, kept in one directory.
+
+    Args:
+        directory: Directory of the store; created if missing.
+        durable: fsync every journal append (edits are rare, so this is cheap).
+    """
+
+    snapshot_name = "config_snapshot.json"
+    journal_name = "config_journal.jsonl"
+
+    def __init__(self, directory: str, durable: bool = True):
+        self.directory = os.path.abspath(directory)
+        self.durable = durable
+        os.makedirs(self.directory, exist_ok=True)
+        self.snapshot_path = os.path.join(self.directory, self.snapshot_name)
+        self.journal_path = os.path.join(self.directory, self.journal_name)
+        self._lock = threading.Lock()
+
+    def has_snapshot(self) -> bool:
+        return os.path.exists(self.snapshot_path)
+
+    def _journal_size(self) -> int:
+        try:
+            return os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            return 0
+
+    def save_snapshot(self, config_list: List[Dict[str, Any]], version: int = 0) -> str:
+        """Atomically write the full config list; later loads replay the journal from here."""
+        with self._lock:
+            payload = {
+                "saved_at": time.time(),
+                "version": version,
+                "journal_offset": self._journal_size(),
+                "config": config_list,
+            }
+            atomic_write(self.snapshot_path, dumps(payload))
+        return self.snapshot_path
+
+    def record(self, changes: Iterable[Dict[str, Any]]) -> None:
+        """
+        Append changes to the journal.
+
+        Each change is a dict with "q_index", "key" (dot-notation path), "new"
+        and optionally "qubit", "old", "version" and "source". A timestamp is
+        added when missing.
+        """
+        now = time.time()
+        lines = []
+        for change in changes:
+            entry = {"ts": now, **change}
+            lines.append(dumps(entry) + b"\n")
+        if not lines:
+            return
+        with self._lock:
+            with open(self.journal_path, "ab") as f:
+                f.write(b"".join(lines))
+                f.flush()
+                if self.durable:
+                    os.fsync(f.fileno())
+
+    def _read_journal(self, offset: int = 0) -> List[Dict[str, Any]]:
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        entries = []
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                entries.append(loads(line))
+            except ValueError:
+                # A torn last line from a crash mid-append
+                print(f"Skipping unreadable journal line in {self.journal_path}")
+        return entries
+
+    def load(self) -> Optional[List[Dict[str, Any]]]:
+        """Return the config list (snapshot + newer journal entries), or None if empty."""
+        with self._lock:
+            try:
+                with open(self.snapshot_path, "rb") as f:
+                    payload = loads(f.read())
+            except FileNotFoundError:
+                return None
+            entries = self._read_journal(payload.get("journal_offset", 0))
+
+        config_list = payload["config"]
+        for entry in entries:
+            set_path(config_list, entry["q_index"], entry["key"], entry["new"])
+        return config_list
+
+    def history(
+        self, key_path: Optional[str] = None, qubit: Optional[Any] = None
+    ) -> List[Dict[str, Any]]:
+        """All journal entries, optionally filtered by key path and qubit name / index."""
+        entries = self._read_journal()
+        if key_path is not None:
+            entries = [e for e in entries if e.get("key") == key_path]
+        if qubit is not None:
+            entries = [
+                e for e in entries if qubit in (e.get("qubit"), e.get("q_index"))
+            ]
+        return entries
@@ -0,0 +1,269 @@
+"""
+Persistent experiment-name -> last-index table for data file naming.
+
+``get_next_filename_labber`` used to walk the whole DATA_PATH tree on every
+save to find the highest ``<exp_name>_<n>.hdf5``. That cost grows with every
+file ever taken. The index keeps the last index per experiment name in a small
+SQLite database stored next to the data (``DATA_PATH/.qick_file_index.sqlite``),
+so a save only needs one short transaction.
+
+Reservations run inside ``BEGIN IMMEDIATE`` transactions, so two processes (or
+threads) saving at the same time never receive the same index, and SQLite's
+journal keeps the table consistent if a save crashes half-way.
+
+The first time an index is opened on an existing data tree it scans the tree
+once. If files are copied in by hand, rebuild the index with::
+
+    python -m qick_workspace.tools.file_index <DATA_PATH> --rebuild
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+INDEX_FILENAME = ".qick_file_index.sqlite"
+
+# Scope of the global Labber numbering (<exp_name>_<nnn>.hdf5 anywhere in the tree)
+LABBER_SCOPE = "labber"
+LABBER_PATTERN = re.compile(r"^(.+)_(\d+)\.hdf5$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    scope      TEXT    NOT NULL,
+    exp_name   TEXT    NOT NULL,
+    last_index INTEGER NOT NULL,
+    PRIMARY KEY (scope, exp_name)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def scan_labber_indices(root: str) -> Dict[str, int]:
+    """
+    Walk ``root`` once and return the highest Labber index per experiment name.
+
+    Args:
+        root: Data directory to scan.
+
+    Returns:
+        dict mapping exp_name -> highest index found.
+    """
+    found: Dict[str, int] = {}
+    for _, _, files in os.walk(root):
+        for f in files:
+            match = LABBER_PATTERN.match(f)
+            if match:
+                name, index = match.group(1), int(match.group(2))
+                if index > found.get(name, 0):
+                    found[name] = index
+    return found
+
+
+def _max_index_in_dir(directory: str, exp_name: str, suffix: str) -> int:
+    pattern = re.compile(rf"^{re.escape(exp_name)}_(\d+){re.escape(suffix)}$")
+    max_index = 0
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    for f in names:
+        match = pattern.match(f)
+        if match:
+            max_index = max(max_index, int(match.group(1)))
+    return max_index
+
+
+class FileIndex:
+    """
+    SQLite-backed allocator of experiment file indices.
+
+    A new connection is opened per call, so one instance can be shared between
+    threads and several processes can use the same database file.
+
+    Args:
+        root: Data directory (DATA_PATH). The database lives inside it.
+        db_path: Override the database location.
+        timeout: Seconds to wait for a lock held by another writer.
+    """
+
+    def __init__(self, root: str, db_path: Optional[str] = None, timeout: float = 30.0):
+        self.root = os.path.abspath(root)
+        self.db_path = db_path or os.path.join(self.root, INDEX_FILENAME)
+        self.timeout = timeout
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # isolation_level=None: transactions are managed explicitly below
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _ensure_scanned(self, conn: sqlite3.Connection) -> None:
+        """Seed the Labber counters from disk the first time (call inside a transaction)."""
+        row = conn.execute("SELECT value FROM meta WHERE key = 'labber_scanned'").fetchone()
+        if row is not None:
+            return
+        self._store_scan(conn, scan_labber_indices(self.root))
+
+    @staticmethod
+    def _store_scan(conn: sqlite3.Connection, found: Dict[str, int]) -> None:
+        conn.executemany(
+            "INSERT INTO counters (scope, exp_name, last_index) VALUES (?, ?, ?) "
+            "ON CONFLICT (scope, exp_name) DO UPDATE SET "
+            "last_index = MAX(last_index, excluded.last_index)",
+            [(LABBER_SCOPE, name, index) for name, index in found.items()],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('labber_scanned', '1')"
+        )
+
+    def _reserve(self, conn: sqlite3.Connection, scope: str, exp_name: str, seed) -> int:
+        row = conn.execute(
+            "SELECT last_index FROM counters WHERE scope = ? AND exp_name = ?",
+            (scope, exp_name),
+        ).fetchone()
+        last = row[0] if row is not None else seed()
+        index = last + 1
+        conn.execute(
+            "INSERT OR REPLACE INTO counters (scope, exp_name, last_index) VALUES (?, ?, ?)",
+            (scope, exp_name, index),
+        )
+        return index
+
+    def reserve_labber(self, exp_name: str, save_path: str) -> int:
+        """
+        Reserve the next global Labber index for ``exp_name``.
+
+        Args:
+            exp_name: Experiment name (file prefix).
+            save_path: Directory the file will be written to. If a file with the
+                       reserved index already exists there (copied in by hand),
+                       the next free index is taken instead.
+
+        Returns:
+            int: The reserved index.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._ensure_scanned(conn)
+                while True:
+                    index = self._reserve(conn, LABBER_SCOPE, exp_name, lambda: 0)
+                    target = os.path.join(save_path, f"{exp_name}_{index:03d}.hdf5")
+                    if not os.path.exists(target):
+                        break
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        return index
+
+    def reserve_in_dir(self, directory: str, exp_name: str, suffix: str = ".h5") -> int:
+        """
+        Reserve the next per-directory index for ``<exp_name>_<n><suffix>``.
+
+        The directory is listed only the first time a name is seen there.
+
+        Args:
+            directory: Directory the file will be written to.
+            exp_name: Experiment name (file prefix).
+            suffix: File extension.
+
+        Returns:
+            int: The reserved index.
+        """
+        directory = os.path.abspath(directory)
+        scope = f"dir:{os.path.relpath(directory, self.root)}:{suffix}"
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    index = self._reserve(
+                        conn, scope, exp_name,
+                        lambda: _max_index_in_dir(directory, exp_name, suffix),
+                    )
+                    target = os.path.join(directory, f"{exp_name}_{index}{suffix}")
+                    if not os.path.exists(target):
+                        break
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        return index
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        Rescan the data tree and reset all counters from disk.
+
+        Returns:
+            dict mapping exp_name -> highest Labber index found.
+        """
+        found = scan_labber_indices(self.root)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM counters")
+                self._store_scan(conn, found)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        return found
+
+    def counters(self, scope: str = LABBER_SCOPE) -> Dict[str, int]:
+        """Return the stored exp_name -> last index table for ``scope``."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT exp_name, last_index FROM counters WHERE scope = ? ORDER BY exp_name",
+                (scope,),
+            ).fetchall()
+        finally:
+            conn.close()
+        return dict(rows)
+
+
+_indices: Dict[str, FileIndex] = {}
+_indices_lock = threading.Lock()
+
+
+def get_file_index(root: str) -> FileIndex:
+    """Return the shared FileIndex for a data directory."""
+    root = os.path.abspath(root)
+    with _indices_lock:
+        if root not in _indices:
+            _indices[root] = FileIndex(root)
+        return _indices[root]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Inspect or rebuild the data file index.")
+    parser.add_argument("data_path", help="Data directory (DATA_PATH)")
+    parser.add_argument("--rebuild", action="store_true", help="Rescan the tree and reset counters")
+    args = parser.parse_args(argv)
+
+    index = get_file_index(args.data_path)
+    if args.rebuild:
+        found = index.rebuild()
+        print(f"Rebuilt {index.db_path}: {len(found)} experiment names")
+    for name, last in index.counters().items():
+        print(f"{name}: {last}")
+
+
+if __name__ == "__main__":
+    main()
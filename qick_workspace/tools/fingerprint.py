@@ -0,0 +1,86 @@
+"""
+Canonical hashing of experiment configurations.
+
+``config_fingerprint`` turns a (possibly nested) cfg made of dicts, lists,
+numpy arrays, numbers and QICK sweep objects into a stable hex digest, so two
+configs that would produce the same program get the same key regardless of
+dict ordering or container type (dict / addict.Dict, list / tuple).
+"""
+
+import hashlib
+import math
+from typing import Any
+
+import numpy as np
+
+
+def _feed(h, obj: Any, exact: bool = False) -> None:
+    """Write a canonical, type-tagged encoding of ``obj`` into the hash ``h``."""
+    if obj is None:
+        h.update(b"N")
+    elif isinstance(obj, bool):
+        h.update(b"B1" if obj else b"B0")
+    elif isinstance(obj, (int, np.integer)):
+        h.update(b"I" + str(int(obj)).encode())
+    elif isinstance(obj, (float, np.floating)):
+        value = float(obj)
+        if not exact and value.is_integer() and math.isfinite(value):
+            # 5 and 5.0 give the same program, hash them the same way
+            h.update(b"I" + str(int(value)).encode())
+        else:
+            h.update(b"F" + repr(value).encode())
+    elif isinstance(obj, (complex, np.complexfloating)):
+        h.update(b"C" + repr(complex(obj)).encode())
+    elif isinstance(obj, str):
+        data = obj.encode()
+        h.update(b"S" + str(len(data)).encode() + b":" + data)
+    elif isinstance(obj, bytes):
+        h.update(b"Y" + str(len(obj)).encode() + b":" + obj)
+    elif isinstance(obj, np.ndarray):
+        arr = np.ascontiguousarray(obj)
+        h.update(b"A" + arr.dtype.str.encode() + repr(arr.shape).encode())
+        if arr.dtype == object:
+            for item in arr.ravel():
+                _feed(h, item, exact)
+        else:
+            h.update(arr.tobytes())
+    elif isinstance(obj, dict):
+        items = sorted(obj.items(), key=lambda kv: str(kv[0]))
+        h.update(b"D" + str(len(items)).encode())
+        for key, value in items:
+            _feed(h, str(key))
+            _feed(h, value, exact)
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"L" + str(len(obj)).encode())
+        for item in obj:
+            _feed(h, item, exact)
+    elif isinstance(obj, (set, frozenset)):
+        h.update(b"T" + str(len(obj)).encode())
+        for digest in sorted(config_fingerprint(item, exact) for item in obj):
+            h.update(digest.encode())
+    elif hasattr(obj, "to_dict") and callable(obj.to_dict):
+        _feed(h, obj.to_dict(), exact)
+    elif hasattr(obj, "__dict__"):
+        # e.g. QickParam / QickSweep1D: hash the class and its fields
+        cls = type(obj)
+        h.update(b"O" + f"{cls.__module__}.{cls.__qualname__}".encode())
+        _feed(h, vars(obj), exact)
+    else:
+        h.update(b"R" + repr(obj).encode())
+
+
+def config_fingerprint(obj: Any, exact: bool = False) -> str:
+    """
+    Return a stable hex digest of a configuration object.
+
+    Args:
+        obj: cfg dict (or any nested structure of dicts, lists, arrays and scalars).
+        exact: Hash integral floats as floats (5.0 != 5), for callers that
+            care about the rendered value rather than the program.
+
+    Returns:
+        str: 32-character hex digest.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _feed(h, obj, exact)
+    return h.hexdigest()
@@ -0,0 +1,167 @@
+"""
+Benchmark of the fitting.py fitters with analytic vs finite-difference Jacobians.
+
+Each case fits synthetic noisy traces with the real fitter twice, once with
+``fitting.USE_ANALYTIC_JACOBIANS`` on and once off, and reports the time per
+fit, the speedup, the number of model evaluations and the largest parameter
+difference relative to the parameter's fit error (so "unchanged results" means
+a difference well below 1 sigma).
+
+Usage (from the repository root)::
+
+    python -m qick_workspace.tools.fit_bench
+    python -m qick_workspace.tools.fit_bench --traces 200 --cases decaysin hanger
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import fitting
+
+
+def _cases(rng: np.random.Generator) -> Dict[str, Tuple[Callable, Callable, Callable]]:
+    """name -> (fitter, model, trace generator returning (x, y, fitparams))."""
+
+    def exp_trace():
+        x = np.linspace(0, 60, 101)
+        p = [0.2, 1.0, rng.uniform(8, 20)]
+        return x, fitting.expfunc(x, *p) + 0.02 * rng.standard_normal(len(x)), None
+
+    def lor_trace():
+        x = np.linspace(4000, 4010, 201)
+        p = [0.1, 1.0, rng.uniform(4004, 4006), rng.uniform(0.2, 0.6)]
+        return x, fitting.lorfunc(x, *p) + 0.02 * rng.standard_normal(len(x)), None
+
+    def decaysin_trace():
+        x = np.linspace(0, 10, 151)
+        p = [0.5, rng.uniform(0.8, 1.5), rng.uniform(-90, 90), rng.uniform(3, 8), 0.5]
+        return x, fitting.decaysin(x, *p) + 0.02 * rng.standard_normal(len(x)), None
+
+    def decayslopesin_trace():
+        x = np.linspace(0, 10, 151)
+        p = [0.5, rng.uniform(0.8, 1.5), rng.uniform(-90, 90), rng.uniform(3, 8), 0.5, 0.1]
+        return x, fitting.decayslopesin(x, *p) + 0.02 * rng.standard_normal(len(x)), None
+
+    def gauss_trace():
+        x = np.linspace(-5, 5, 101)
+        p = [1.0, rng.uniform(-1, 1), rng.uniform(0.5, 1.5), 0.05]
+        return x, fitting.gaussian(x, *p) + 0.02 * rng.standard_normal(len(x)), None
+
+    def doublegauss_trace():
+        x = np.linspace(-6, 6, 121)
+        p = [1.0, -2.0, 0.8, 0.6, rng.uniform(1.5, 2.5), 0.8]
+        guess = [0.9, -1.8, 0.7, 0.5, 2.0, 0.9]
+        return x, fitting.double_gaussian(x, *p) + 0.02 * rng.standard_normal(len(x)), guess
+
+    def hanger_trace():
+        x = np.linspace(6000, 6002, 201)
+        p = [rng.uniform(6000.8, 6001.2), 8, 3, 0.2, 1.0, 0.0]
+        return x, fitting.hangerS21func_sloped(x, *p) + 0.005 * rng.standard_normal(len(x)), None
+
+    def rb_trace():
+        x = np.arange(1, 200, 5).astype(float)
+        p = [rng.uniform(0.97, 0.995), 0.45, 0.5]
+        return x, fitting.rb_func(x, *p) + 0.005 * rng.standard_normal(len(x)), None
+
+    return {
+        "exp": (fitting.fitexp, fitting.expfunc, exp_trace),
+        "lor": (fitting.fitlor, fitting.lorfunc, lor_trace),
+        "decaysin": (fitting.fitdecaysin, fitting.decaysin, decaysin_trace),
+        "decayslopesin": (fitting.fitdecayslopesin, fitting.decayslopesin, decayslopesin_trace),
+        "gauss": (fitting.fit_gauss, fitting.gaussian, gauss_trace),
+        "doublegauss": (fitting.fit_doublegauss, fitting.double_gaussian, doublegauss_trace),
+        "hanger": (fitting.fithanger, fitting.hangerS21func_sloped, hanger_trace),
+        "rb": (fitting.fitrb, fitting.rb_func, rb_trace),
+    }
+
+
+class _CountCalls:
+    """Wraps a model function in the fitting module to count its evaluations."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.original = getattr(fitting, name)
+        self.calls = 0
+
+    def __enter__(self):
+        original = self.original
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return original(*args, **kwargs)
+
+        setattr(fitting, self.name, counted)
+        # Keep the registered Jacobian reachable under the wrapped model
+        jac = fitting.MODEL_JACOBIANS.get(original)
+        if jac is not None:
+            fitting.MODEL_JACOBIANS[counted] = jac
+        self.counted = counted
+        return self
+
+    def __exit__(self, *exc):
+        setattr(fitting, self.name, self.original)
+        fitting.MODEL_JACOBIANS.pop(self.counted, None)
+
+
+def run_case(
+    fitter: Callable, model: Callable, traces: List[tuple], analytic: bool
+) -> Tuple[float, float, List[np.ndarray], List[np.ndarray]]:
+    """Fit all traces; returns (seconds per fit, model calls per fit, popts, perrs)."""
+    fitting.USE_ANALYTIC_JACOBIANS = analytic
+    popts, perrs = [], []
+    with _CountCalls(model.__name__) as counter, contextlib.redirect_stdout(io.StringIO()):
+        t0 = time.perf_counter()
+        for x, y, guess in traces:
+            result = fitter(x, y, None if guess is None else list(guess))
+            popts.append(np.asarray(result[0], dtype=float))
+            perrs.append(np.sqrt(np.abs(np.diag(np.asarray(result[1], dtype=float)))))
+        elapsed = time.perf_counter() - t0
+    fitting.USE_ANALYTIC_JACOBIANS = True
+    n = max(len(traces), 1)
+    return elapsed / n, counter.calls / n, popts, perrs
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--traces", type=int, default=100, help="synthetic traces per case")
+    parser.add_argument("--cases", nargs="*", help="subset of cases to run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    cases = _cases(np.random.default_rng(args.seed))
+    names = args.cases or list(cases)
+
+    print(
+        f"{'case':<15}{'fd ms':>9}{'jac ms':>9}{'speedup':>9}"
+        f"{'fd evals':>10}{'jac evals':>10}{'max |dp|/err':>14}"
+    )
+    for name in names:
+        fitter, model, make_trace = cases[name]
+        traces = [make_trace() for _ in range(args.traces)]
+        # Warm up imports and caches so the first timed case is not penalized
+        run_case(fitter, model, traces[:3], analytic=False)
+        t_fd, n_fd, p_fd, _ = run_case(fitter, model, traces, analytic=False)
+        t_jac, n_jac, p_jac, e_jac = run_case(fitter, model, traces, analytic=True)
+
+        # Parameter difference in units of the fit error, over traces where both fits worked
+        deltas = [
+            np.max(np.abs(a - b) / np.where(e > 0, e, np.inf))
+            for a, b, e in zip(p_fd, p_jac, e_jac)
+            if np.all(np.isfinite(a)) and np.all(np.isfinite(b)) and np.all(np.isfinite(e))
+        ]
+        delta = f"{max(deltas):.2e}" if deltas else "n/a"
+        print(
+            f"{name:<15}{t_fd * 1e3:9.2f}{t_jac * 1e3:9.2f}{t_fd / t_jac:9.2f}"
+            f"{n_fd:10.1f}{n_jac:10.1f}{delta:>14}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+Cache of fit results keyed by the data they were computed from.
+
+Measurement pages redraw the fit of the stored result every time a page is
+opened, and a notch-port ``autofit`` or the four quadrature fits of a Ramsey /
+T1 / Rabi trace take far longer than the drawing. ``FitCache`` keys a result by
+a canonical hash of (fit function, x, y, options) and hands back a copy of the
+stored result on a hit, so revisiting a page or reopening the browser shows the
+fit without recomputing it.
+
+Results are kept in an in-memory LRU and, only when a directory is set, pickled
+to disk as well so they survive a restart of the GUI (``reload=True`` restarts
+it on every code change). The disk copy is off by default: loading an entry
+unpickles it, so the directory must be one only trusted users can write to.
+The key includes a digest of the fit function's module source and of the
+analysis code in this package (fitting, guesses, resonator tools), so results
+pickled before a code change are not served after it.
+
+Usage::
+
+    from qick_workspace.tools.fit_cache import fit_cache
+
+    popt, pcov, _ = fit_cache.cached(fitexp, times, np.abs(iq_data))
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .fingerprint import config_fingerprint
+
+# Bump to drop every disk entry (code changes are picked up by code_digest)
+FIT_CACHE_VERSION = 1
+
+
+@functools.lru_cache(maxsize=None)
+def _package_digest() -> str:
+    """Digest of the sources of this package (fitting.py, fit_guess.py, resonator_tools, ...)."""
+    h = hashlib.blake2b(digest_size=16)
+    root = os.path.dirname(os.path.abspath(__file__))
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        for name in sorted(filenames):
+            if name.endswith(".py"):
+                path = os.path.join(dirpath, name)
+                h.update(os.path.relpath(path, root).encode())
+                with open(path, "rb") as f:
+                    h.update(f.read())
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _module_digest(module_name: str) -> str:
+    module = sys.modules.get(module_name)
+    try:
+        source = inspect.getsource(module) if module is not None else ""
+    except (OSError, TypeError):
+        source = ""
+    return hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+
+
+def code_digest(fitfunc: Any) -> str:
+    """Digest of the code behind fitfunc: its bytecode, its module and this package."""
+    code = getattr(fitfunc, "__code__", None)
+    return config_fingerprint(
+        (
+            code.co_code if code is not None else b"",
+            _module_digest(getattr(fitfunc, "__module__", None) or ""),
+            _package_digest(),
+        )
+    )
+
+
+def function_key(func: Callable) -> Tuple[str, str]:
+    """(qualified name, code_digest) of a function, as used in cache keys."""
+    name = f"{getattr(func, '__module__', '')}.{getattr(func, '__qualname__', repr(func))}"
+    return name, code_digest(func)
+
+
+class FitCache:
+    """
+    Thread-safe LRU cache of fit results, optionally mirrored on disk.
+
+    Values are deep-copied on the way in and out, so callers may modify the
+    returned arrays (``get_best_fit`` does) without touching the cache.
+
+    Args:
+        maxsize: Maximum number of results kept in memory.
+        directory: Directory for the on-disk copy, or None for memory only.
+        disk_maxsize: Maximum number of files kept in directory; the oldest
+                      are removed first.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        directory: Optional[str] = None,
+        disk_maxsize: int = 2000,
+    ):
+        self.maxsize = maxsize
+        self.disk_maxsize = disk_maxsize
+        self.directory: Optional[str] = None
+        self._results: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.set_directory(directory)
+
+    def set_directory(self, directory: Optional[str]) -> None:
+        """Enable (or with None, disable) the on-disk copy; use a trusted directory."""
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    @staticmethod
+    def make_key(fitfunc: Any, xdata: Any, ydata: Any, **options) -> str:
+        """Hash of the fit function (name and code), the data and the options."""
+        if callable(fitfunc):
+            func_id = function_key(fitfunc)
+        else:
+            func_id = (str(fitfunc), _package_digest())
+        # Functions among the options (e.g. a model) are keyed the same way
+        options = {
+            k: function_key(v) if callable(v) else v for k, v in options.items()
+        }
+        return config_fingerprint(
+            (FIT_CACHE_VERSION, func_id, xdata, ydata, options), exact=True
+        )
+
+    # --- Lookup --------------------------------------------------------------
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, result) for key, looking in memory and then on disk."""
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return True, copy.deepcopy(self._results[key])
+
+        found, value = self._load(key)
+        if found:
+            with self._lock:
+                self.disk_hits += 1
+                self._store(key, value)
+            return True, copy.deepcopy(value)
+
+        with self._lock:
+            self.misses += 1
+        return False, None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result in memory and, if enabled, on disk."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._store(key, value)
+        self._dump(key, value)
+
+    def cached(
+        self,
+        fitfunc: Callable,
+        xdata: Any,
+        ydata: Any,
+        compute: Optional[Callable[[], Any]] = None,
+        **options,
+    ) -> Any:
+        """
+        Return the cached result of a fit, computing it on a miss.
+
+        Args:
+            fitfunc: Fit function; its qualified name and code are part of the key.
+            xdata: X data of the fit.
+            ydata: Y data of the fit.
+            compute: Called without arguments on a miss; by default
+                     ``fitfunc(xdata, ydata, **options)``.
+            **options: Other inputs that change the result; part of the key
+                       (functions by name and code).
+
+        Returns:
+            A copy of the (possibly cached) result.
+        """
+        key = self.make_key(fitfunc, xdata, ydata, **options)
+        found, value = self.get(key)
+        if found:
+            return value
+        if compute is None:
+            value = fitfunc(xdata, ydata, **options)
+        else:
+            value = compute()
+        self.put(key, value)
+        return value
+
+    def _store(self, key: str, value: Any) -> None:
+        # Caller holds the lock
+        self._results[key] = value
+        self._results.move_to_end(key)
+        while self.maxsize is not None and len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+            self.evictions += 1
+
+    # --- Disk ----------------------------------------------------------------
+
+    def _path(self, key: str) -> Optional[str]:
+        if self.directory is None:
+            return None
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _load(self, key: str) -> Tuple[bool, Any]:
+        path = self._path(key)
+        if path is None or not os.path.exists(path):
+            return False, None
+        try:
+            with open(path, "rb") as f:
+                return True, pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable fit cache entry {path}: {e}")
+            return False, None
+
+    def _dump(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        if path is None:
+            return
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # Unpicklable results stay memory-only
+            print(f"Warning: Could not write fit cache entry {path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        if self.directory is None or self.disk_maxsize is None:
+            return
+        entries = [e for e in os.scandir(self.directory) if e.name.endswith(".pkl")]
+        if len(entries) <= self.disk_maxsize:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[: len(entries) - self.disk_maxsize]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    # --- Maintenance ---------------------------------------------------------
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop the cached results; with disk=True also remove the files."""
+        with self._lock:
+            self._results.clear()
+        if disk and self.directory is not None:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".pkl"):
+                    os.remove(entry.path)
+
+    def reset_stats(self) -> None:
+        self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters as a dict."""
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "directory": self.directory,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+# Shared cache used by the GUI pages (memory only until a directory is set)
+fit_cache = FitCache()
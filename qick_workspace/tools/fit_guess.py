@@ -0,0 +1,338 @@
+"""
+Closed-form initial guesses for the fitters of ``fitting.py``.
+
+The fitters used to seed oscillation fits with the largest FFT bin
+(``fourier_init``), whose frequency resolution is 1 / span, and then retried
+with inverted phases when ``curve_fit`` did not converge. The estimators here
+solve for the parameters directly, so the least-squares fit starts next to the
+optimum:
+
+* Damped sinusoids (``guess_decaysin``, ``guess_decayslopesin``,
+  ``guess_twofreq_decaysin``): matrix pencil. The signal poles
+  z = exp((-1/decay + 2πi·freq)·dx) are the eigenvalues of a shifted pair of
+  dominant singular vectors of the trace's Hankel matrix; amplitude, phase and
+  offset then follow from a linear least-squares fit on the resulting basis.
+* Exponentials (``guess_exp``): the rate comes from the integral form of
+  y = y0 + yscale·exp(-x/decay), which is linear in the unknowns, so unlike a
+  plain log-linear fit it needs no prior estimate of the offset y0.
+* Lorentzians (``guess_lor``): baseline from the edges, then center and width
+  from the moments (centroid, height and area) of the peak or dip.
+
+Every estimator takes a 1D trace or a 2D (n_traces, n_points) batch sharing
+one x axis and returns the parameters in the fitter's order, shape (n_params,)
+or (n_traces, n_params). Entries are NaN where the estimator does not apply
+(e.g. no oscillation found); the fitters fall back to their old heuristics
+there.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+# Rows of the Hankel matrix per pencil column: L = N // _PENCIL_DIV (N/3 is
+# the usual noise-robust choice between N/3 and N/2)
+_PENCIL_DIV = 3
+# Decay guesses are capped at this many spans (undamped oscillations)
+_MAX_DECAY_SPANS = 10
+
+
+def _batch(xdata: np.ndarray, ydata: np.ndarray) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """(x, 2D y, input was 1D)."""
+    xdata = np.asarray(xdata, dtype=float)
+    ydata = np.asarray(ydata, dtype=float)
+    single = ydata.ndim == 1
+    ydata = np.atleast_2d(ydata)
+    if ydata.shape[1] != len(xdata):
+        raise ValueError(
+            f"Traces have {ydata.shape[1]} points but xdata has {len(xdata)}"
+        )
+    return xdata, ydata, single
+
+
+def _result(params: np.ndarray, single: bool) -> np.ndarray:
+    return params[0] if single else params
+
+
+def _uniform(xdata: np.ndarray, ydata: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Step and traces on a uniform grid (resampled if xdata is not uniform)."""
+    steps = np.diff(xdata)
+    dx = (xdata[-1] - xdata[0]) / (len(xdata) - 1)
+    if np.allclose(steps, dx, rtol=1e-6, atol=0):
+        return dx, ydata
+    grid = np.linspace(xdata[0], xdata[-1], len(xdata))
+    return dx, np.array([np.interp(grid, xdata, row) for row in ydata])
+
+
+def _pencil_applies(n_points: int, order: int) -> bool:
+    """Whether a trace of n_points is long enough for a pencil of this order."""
+    return n_points - max(n_points // _PENCIL_DIV, order) >= order
+
+
+def matrix_pencil_poles(ydata: np.ndarray, order: int) -> np.ndarray:
+    """
+    Signal poles of uniformly sampled traces by the matrix pencil method.
+
+    Args:
+        ydata: (n_traces, n_points) traces.
+        order: Number of complex exponentials in the model, e.g. 3 for a
+               damped sinusoid with an offset (one conjugate pair plus z = 1).
+
+    Returns:
+        (n_traces, order) complex poles, z = exp(s·dx) for each exponential.
+    """
+    n_points = ydata.shape[1]
+    if not _pencil_applies(n_points, order):
+        raise ValueError(f"Too few points ({n_points}) for a pencil of order {order}")
+    pencil = max(n_points // _PENCIL_DIV, order)
+
+    # Hankel matrices of all traces: (n_traces, n_points - pencil, pencil + 1)
+    hankel = np.lib.stride_tricks.sliding_window_view(ydata, pencil + 1, axis=-1)
+    _, _, vh = np.linalg.svd(hankel, full_matrices=False)
+    # Dominant right singular vectors span the signal subspace; truncating to
+    # `order` of them filters the noise
+    v = np.swapaxes(vh[:, :order, :], -1, -2)
+    shift = np.linalg.pinv(v[:, :-1, :]) @ v[:, 1:, :]
+    return np.linalg.eigvals(shift)
+
+
+def _oscillating_poles(poles: np.ndarray, count: int) -> np.ndarray:
+    """
+    The `count` poles with the largest positive angle, sorted by angle.
+
+    Poles on the real axis (offsets, pure decays, or a pair that collapsed on
+    noise) do not count; missing ones are returned as NaN.
+    """
+    angles = np.where(poles.imag > 1e-12, np.angle(poles), -np.inf)
+    order = np.argsort(angles, axis=-1)[:, ::-1][:, :count]
+    picked = np.take_along_axis(poles, order, axis=-1)
+    valid = np.take_along_axis(angles, order, axis=-1) > 0
+    picked = np.where(valid, picked, np.nan)
+    # Ascending frequency
+    return np.take_along_axis(picked, np.argsort(np.angle(picked), axis=-1), axis=-1)
+
+
+def _pole_decay(poles: np.ndarray, dx: float, span: float) -> np.ndarray:
+    """Decay constant of poles; growing or undamped poles give the cap."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_mag = np.log(np.abs(poles))
+        decay = np.where(log_mag < 0, -dx / log_mag, np.inf)
+    return np.where(np.isnan(poles), np.nan, np.minimum(decay, _MAX_DECAY_SPANS * span))
+
+
+def _linear_fit(basis: np.ndarray, ydata: np.ndarray) -> np.ndarray:
+    """
+    Batched linear least squares.
+
+    Args:
+        basis: (n_traces, n_points, n_terms) design matrices.
+        ydata: (n_traces, n_points) traces.
+
+    Returns:
+        (n_traces, n_terms) coefficients, NaN where the basis is not finite.
+    """
+    ok = np.all(np.isfinite(basis), axis=(1, 2))
+    coef = np.full(basis.shape[::2], np.nan)
+    if np.any(ok):
+        coef[ok] = (np.linalg.pinv(basis[ok]) @ ydata[ok, :, None])[..., 0]
+    return coef
+
+
+def _damped_basis(xdata: np.ndarray, freqs: np.ndarray, decay: np.ndarray):
+    """exp(-x/decay)·sin and ·cos columns, each (n_traces, n_points)."""
+    envelope = np.exp(-xdata / decay[:, None])
+    arg = 2 * np.pi * freqs[:, None] * xdata
+    return envelope, envelope * np.sin(arg), envelope * np.cos(arg)
+
+
+def _sine_seed(xdata: np.ndarray, ydata: np.ndarray, order: int, count: int):
+    """Pencil frequencies (n_traces, count) and common decay (n_traces,); NaN for short traces."""
+    if not _pencil_applies(len(xdata), order):
+        return np.full((len(ydata), count), np.nan), np.full(len(ydata), np.nan)
+    span = xdata[-1] - xdata[0]
+    dx, uniform = _uniform(xdata, ydata)
+    poles = _oscillating_poles(matrix_pencil_poles(uniform, order), count)
+    freqs = np.angle(poles) / (2 * np.pi * dx)
+    decay = np.mean(_pole_decay(poles, dx, span), axis=-1)
+    return freqs, decay
+
+
+def guess_decaysin(xdata: np.ndarray, ydata: np.ndarray) -> np.ndarray:
+    """
+    Initial [yscale, freq, phase_deg, decay, y0] for ``fitting.decaysin``.
+
+    Args:
+        xdata: (n_points,) x axis.
+        ydata: (n_points,) trace or (n_traces, n_points) batch.
+
+    Returns:
+        (5,) or (n_traces, 5) parameters; NaN rows where no oscillation is found.
+    """
+    xdata, ydata, single = _batch(xdata, ydata)
+    freqs, decay = _sine_seed(xdata, ydata, order=3, count=1)
+    freq = freqs[:, 0]
+
+    envelope, s, c = _damped_basis(xdata, freq, decay)
+    coef = _linear_fit(np.stack([np.ones_like(s), s, c], axis=-1), ydata)
+    # yscale·sin(θ + φ) = yscale·cos(φ)·sin(θ) + yscale·sin(φ)·cos(θ)
+    yscale = np.hypot(coef[:, 1], coef[:, 2])
+    phase_deg = np.degrees(np.arctan2(coef[:, 2], coef[:, 1]))
+
+    params = np.stack([yscale, freq, phase_deg, decay, coef[:, 0]], axis=-1)
+    return _result(params, single)
+
+
+def guess_decayslopesin(xdata: np.ndarray, ydata: np.ndarray) -> np.ndarray:
+    """
+    Initial [yscale, freq, phase_deg, decay, y0, slope] for ``fitting.decayslopesin``.
+
+    Args:
+        xdata: (n_points,) x axis.
+        ydata: (n_points,) trace or (n_traces, n_points) batch.
+
+    Returns:
+        (6,) or (n_traces, 6) parameters; NaN rows where no oscillation is found.
+    """
+    xdata, ydata, single = _batch(xdata, ydata)
+    freqs, decay = _sine_seed(xdata, ydata, order=3, count=1)
+    freq = freqs[:, 0]
+
+    envelope, s, c = _damped_basis(xdata, freq, decay)
+    coef = _linear_fit(np.stack([np.ones_like(s), envelope, s, c], axis=-1), ydata)
+    yscale = np.hypot(coef[:, 2], coef[:, 3])
+    phase_deg = np.degrees(np.arctan2(coef[:, 3], coef[:, 2]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = coef[:, 1] / yscale
+
+    params = np.stack([yscale, freq, phase_deg, decay, coef[:, 0], slope], axis=-1)
+    return _result(params, single)
+
+
+def guess_twofreq_decaysin(xdata: np.ndarray, ydata: np.ndarray) -> np.ndarray:
+    """
+    Initial parameters for ``fitting.twofreq_decaysin``.
+
+    The product of the two sines is a sum of cosines at freq0 ± freq1, which the
+    pencil resolves as two pole pairs (fa < fb): freq0 = (fa + fb) / 2 and
+    freq1 = (fb - fa) / 2, with yscale1 = 1 and y01 = 0.
+
+    Args:
+        xdata: (n_points,) x axis.
+        ydata: (n_points,) trace or (n_traces, n_points) batch.
+
+    Returns:
+        (10,) or (n_traces, 10) parameters
+        [yscale0, freq0, phase_deg0, decay0, y00, x00, yscale1, freq1, phase_deg1, y01];
+        NaN rows where two frequencies are not found.
+    """
+    xdata, ydata, single = _batch(xdata, ydata)
+    freqs, decay = _sine_seed(xdata, ydata, order=5, count=2)
+
+    _, s_a, c_a = _damped_basis(xdata, freqs[:, 0], decay)
+    _, s_b, c_b = _damped_basis(xdata, freqs[:, 1], decay)
+    coef = _linear_fit(np.stack([np.ones_like(s_a), c_a, s_a, c_b, s_b], axis=-1), ydata)
+
+    # A·cos(θ + ψ) = A·cos(ψ)·cos(θ) - A·sin(ψ)·sin(θ)
+    amp_a = np.hypot(coef[:, 1], coef[:, 2])
+    amp_b = np.hypot(coef[:, 3], coef[:, 4])
+    psi_a = np.arctan2(-coef[:, 2], coef[:, 1])
+    psi_b = np.arctan2(-coef[:, 4], coef[:, 3])
+    # sin(θ0)·sin(θ1) = cos(θ0 - θ1) / 2 - cos(θ0 + θ1) / 2
+    phase0 = (psi_b - np.pi + psi_a) / 2
+    phase1 = (psi_b - np.pi - psi_a) / 2
+
+    n = len(ydata)
+    params = np.stack(
+        [
+            amp_a + amp_b,
+            (freqs[:, 0] + freqs[:, 1]) / 2,
+            np.degrees(phase0),
+            decay,
+            coef[:, 0],
+            np.full(n, xdata[0]),
+            np.ones(n),
+            (freqs[:, 1] - freqs[:, 0]) / 2,
+            np.degrees(phase1),
+            np.zeros(n),
+        ],
+        axis=-1,
+    )
+    params[~np.all(np.isfinite(params), axis=-1)] = np.nan
+    return _result(params, single)
+
+
+def guess_exp(xdata: np.ndarray, ydata: np.ndarray) -> np.ndarray:
+    """
+    Initial [y0, yscale, decay] for ``fitting.expfunc``.
+
+    Integrating dy/dx = -(y - y0)/decay from x[0] gives
+    y - y[0] = (y0/decay)·(x - x[0]) - S(x)/decay with S(x) = ∫ y dx, which is
+    linear in the unknowns; the rate is the coefficient of S. y0 and yscale
+    then follow from a linear fit on [1, exp(-x/decay)].
+
+    Args:
+        xdata: (n_points,) x axis.
+        ydata: (n_points,) trace or (n_traces, n_points) batch.
+
+    Returns:
+        (3,) or (n_traces, 3) parameters; NaN rows for rising or flat traces
+        that do not decay.
+    """
+    xdata, ydata, single = _batch(xdata, ydata)
+    span = xdata[-1] - xdata[0]
+
+    # Cumulative trapezoid integral S(x), starting at 0
+    trapezoids = (ydata[:, 1:] + ydata[:, :-1]) / 2 * np.diff(xdata)
+    integral = np.concatenate(
+        [np.zeros((len(ydata), 1)), np.cumsum(trapezoids, axis=-1)], axis=-1
+    )
+    shifted_x = np.broadcast_to(xdata - xdata[0], ydata.shape)
+    rate = _linear_fit(np.stack([shifted_x, integral], axis=-1), ydata - ydata[:, :1])[:, 1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        decay = np.where(rate < 0, -1 / rate, np.nan)
+    decay = np.minimum(decay, _MAX_DECAY_SPANS * span)
+
+    with np.errstate(over="ignore"):
+        envelope = np.exp(-xdata / decay[:, None])
+    coef = _linear_fit(np.stack([np.ones_like(envelope), envelope], axis=-1), ydata)
+    params = np.stack([coef[:, 0], coef[:, 1], decay], axis=-1)
+    return _result(params, single)
+
+
+def guess_lor(xdata: np.ndarray, ydata: np.ndarray) -> np.ndarray:
+    """
+    Initial [y0, yscale, x0, xscale] for ``fitting.lorfunc``.
+
+    The baseline y0 is the median of the outer 10% of points on both sides.
+    For a peak (or dip) of height yscale, x0 is the centroid of the part above
+    half height and the half width follows from the area, π·yscale·xscale.
+
+    Args:
+        xdata: (n_points,) x axis.
+        ydata: (n_points,) trace or (n_traces, n_points) batch.
+
+    Returns:
+        (4,) or (n_traces, 4) parameters.
+    """
+    xdata, ydata, single = _batch(xdata, ydata)
+    n_edge = max(len(xdata) // 10, 1)
+    edges = np.concatenate([ydata[:, :n_edge], ydata[:, -n_edge:]], axis=-1)
+    y0 = np.median(edges, axis=-1)
+
+    signal = ydata - y0[:, None]
+    # Peak or dip: whichever deviates more from the baseline
+    sign = np.where(signal.max(axis=-1) >= -signal.min(axis=-1), 1.0, -1.0)
+    signal = np.clip(signal * sign[:, None], 0, None)
+    height = signal.max(axis=-1)
+
+    top = np.where(signal >= height[:, None] / 2, signal, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x0 = np.sum(top * xdata, axis=-1) / np.sum(top, axis=-1)
+        area = np.abs(np.sum((signal[:, 1:] + signal[:, :-1]) / 2 * np.diff(xdata), axis=-1))
+        xscale = area / (np.pi * height)
+
+    span = abs(xdata[-1] - xdata[0])
+    step = span / max(len(xdata) - 1, 1)
+    xscale = np.clip(xscale, step / 2, span)
+    params = np.stack([y0, sign * height, x0, xscale], axis=-1)
+    return _result(params, single)
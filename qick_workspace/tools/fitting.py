@@ -11,11 +11,53 @@ import scipy as sp
 import traceback
 from typing import Tuple, List, Optional, Callable, Dict, Any, Union
 
+from .fit_guess import (
+    guess_decaysin,
+    guess_decayslopesin,
+    guess_exp,
+    guess_lor,
+    guess_twofreq_decaysin,
+)
+
 # ====================================================== #
 # Utility Functions
 # ====================================================== #
 
 
+# Analytic Jacobians of the model functions, registered with @jacobian(model).
+# generic_fit and the specific fitters pass them to curve_fit, which otherwise
+# estimates derivatives by finite differences (one extra model evaluation per
+# parameter and iteration). Set USE_ANALYTIC_JACOBIANS = False to compare.
+MODEL_JACOBIANS: Dict[Callable, Callable] = {}
+USE_ANALYTIC_JACOBIANS = True
+
+
+def jacobian(model: Callable) -> Callable:
+    """
+    Decorator registering jac(x, *p) as the analytic Jacobian of model.
+
+    The Jacobian returns an array of shape (len(x), len(p)).
+    """
+
+    def register(jac: Callable) -> Callable:
+        MODEL_JACOBIANS[model] = jac
+        return jac
+
+    return register
+
+
+def model_jacobian(model: Callable) -> Optional[Callable]:
+    """The registered Jacobian of model, or None (finite differences)."""
+    if not USE_ANALYTIC_JACOBIANS:
+        return None
+    return MODEL_JACOBIANS.get(model)
+
+
+def _stack_columns(x: np.ndarray, *columns) -> np.ndarray:
+    """Stack per-parameter derivatives (arrays or scalars) into a (len(x), n) Jacobian."""
+    return np.stack([np.broadcast_to(c, x.shape) for c in columns], axis=-1)
+
+
 def get_r2(
     xdata: np.ndarray, ydata: np.ndarray, fitfunc: Callable, fit_params: List[float]
 ) -> float:
@@ -112,6 +154,33 @@ def fourier_init(
     return max_freq, max_phase
 
 
+def fill_guess(
+    fitparams: List[Optional[float]], guess: np.ndarray, fallback: Callable[[], List[float]]
+) -> List[float]:
+    """
+    Fill the None entries of fitparams from a closed-form guess (see fit_guess.py).
+
+    Args:
+        fitparams: Initial parameters; None entries are filled in place
+        guess: Guessed parameters, NaN where the estimator did not apply
+        fallback: Returns heuristic parameters; only called if a needed guess is NaN
+
+    Returns:
+        The filled fitparams
+    """
+    fallback_params = None
+    for i, param in enumerate(fitparams):
+        if param is not None:
+            continue
+        if np.isfinite(guess[i]):
+            fitparams[i] = float(guess[i])
+        else:
+            if fallback_params is None:
+                fallback_params = fallback()
+            fitparams[i] = fallback_params[i]
+    return fitparams
+
+
 def validate_bounds(
     fitparams: List[float], bounds: Tuple[List[float], List[float]]
 ) -> List[float]:
@@ -162,13 +231,16 @@ def generic_fit(
     pOpt = fitparams
     pCov = np.full(shape=(len(fitparams), len(fitparams)), fill_value=np.inf)
 
+    jac = model_jacobian(fitfunc)
     try:
         if bounds:
             pOpt, pCov = sp.optimize.curve_fit(
-                fitfunc, xdata, ydata, p0=fitparams, bounds=bounds
+                fitfunc, xdata, ydata, p0=fitparams, bounds=bounds, jac=jac
             )
         else:
-            pOpt, pCov = sp.optimize.curve_fit(fitfunc, xdata, ydata, p0=fitparams)
+            pOpt, pCov = sp.optimize.curve_fit(
+                fitfunc, xdata, ydata, p0=fitparams, jac=jac
+            )
     except RuntimeError:
         print(error_message)
         pOpt = [np.nan] * len(pOpt)
@@ -363,6 +435,15 @@ def expfunc(x: np.ndarray, *p) -> np.ndarray:
     return y0 + yscale * np.exp(-x / decay)
 
 
+@jacobian(expfunc)
+def expfunc_jac(x: np.ndarray, *p) -> np.ndarray:
+    """Jacobian of expfunc with respect to [y0, yscale, decay]."""
+    x = np.asarray(x, dtype=float)
+    y0, yscale, decay = p
+    e = np.exp(-x / decay)
+    return _stack_columns(x, 1.0, e, yscale * e * x / decay**2)
+
+
 def expfunc2(x: np.ndarray, *p) -> np.ndarray:
     """
     Exponential decay function with x offset.
@@ -396,12 +477,15 @@ def fitexp(
         fitparams = [None] * 3
 
     # Initialize parameters if not provided
-    if fitparams[0] is None:
-        fitparams[0] = ydata[-1]  # y0
-    if fitparams[1] is None:
-        fitparams[1] = ydata[0] - ydata[-1]  # yscale
-    if fitparams[2] is None:
-        fitparams[2] = (xdata[-1] - xdata[0]) / 4  # decay
+    fill_guess(
+        fitparams,
+        guess_exp(xdata, ydata),
+        lambda: [
+            ydata[-1],  # y0
+            ydata[0] - ydata[-1],  # yscale
+            (xdata[-1] - xdata[0]) / 4,  # decay
+        ],
+    )
 
     return generic_fit(
         expfunc,
@@ -432,6 +516,17 @@ def lorfunc(x: np.ndarray, *p) -> np.ndarray:
     return y0 + yscale / (1 + (x - x0) ** 2 / xscale**2)
 
 
+@jacobian(lorfunc)
+def lorfunc_jac(x: np.ndarray, *p) -> np.ndarray:
+    """Jacobian of lorfunc with respect to [y0, yscale, x0, xscale]."""
+    x = np.asarray(x, dtype=float)
+    y0, yscale, x0, xscale = p
+    u = (x - x0) / xscale
+    lor = 1 / (1 + u**2)
+    d = yscale * lor**2 * 2 * u / xscale
+    return _stack_columns(x, 1.0, lor, d, d * u)
+
+
 def fitlor(
     xdata: np.ndarray, ydata: np.ndarray, fitparams: Optional[List[float]] = None
 ) -> Tuple[List[float], np.ndarray, List[float]]:
@@ -449,15 +544,17 @@ def fitlor(
     if fitparams is None:
         fitparams = [None] * 4
 
-    # Initialize parameters if not provided
-    if fitparams[0] is None:
-        fitparams[0] = (ydata[0] + ydata[-1]) / 2  # y0
-    if fitparams[1] is None:
-        fitparams[1] = max(ydata) - min(ydata)  # yscale
-    if fitparams[2] is None:
-        fitparams[2] = xdata[np.argmax(abs(ydata - fitparams[0]))]  # x0
-    if fitparams[3] is None:
-        fitparams[3] = (max(xdata) - min(xdata)) / 10  # xscale
+    def heuristic_guess():
+        y0 = (ydata[0] + ydata[-1]) / 2
+        return [
+            y0,  # y0
+            max(ydata) - min(ydata),  # yscale
+            xdata[np.argmax(abs(ydata - y0))],  # x0
+            (max(xdata) - min(xdata)) / 10,  # xscale
+        ]
+
+    # Initialize parameters if not provided (moments of the peak, see fit_guess.py)
+    fill_guess(fitparams, guess_lor(xdata, ydata), heuristic_guess)
 
     return generic_fit(
         lorfunc,
@@ -524,6 +621,16 @@ def sinfunc(x: np.ndarray, *p) -> np.ndarray:
     return yscale * np.sin(2 * np.pi * freq * x + phase_deg * np.pi / 180) + y0
 
 
+@jacobian(sinfunc)
+def sinfunc_jac(x: np.ndarray, *p) -> np.ndarray:
+    """Jacobian of sinfunc with respect to [yscale, freq, phase_deg, y0]."""
+    x = np.asarray(x, dtype=float)
+    yscale, freq, phase_deg, y0 = p
+    arg = 2 * np.pi * freq * x + phase_deg * np.pi / 180
+    c = yscale * np.cos(arg)
+    return _stack_columns(x, np.sin(arg), c * 2 * np.pi * x, c * np.pi / 180, 1.0)
+
+
 def fitsin(
     xdata: np.ndarray,
     ydata: np.ndarray,
@@ -593,6 +700,20 @@ def decaysin(x: np.ndarray, *p) -> np.ndarray:
     )
 
 
+@jacobian(decaysin)
+def decaysin_jac(x: np.ndarray, *p) -> np.ndarray:
+    """Jacobian of decaysin with respect to [yscale, freq, phase_deg, decay, y0]."""
+    x = np.asarray(x, dtype=float)
+    yscale, freq, phase_deg, decay, y0 = p
+    arg = 2 * np.pi * freq * x + phase_deg * np.pi / 180
+    e = np.exp(-x / decay)
+    s = np.sin(arg) * e
+    c = yscale * np.cos(arg) * e
+    return _stack_columns(
+        x, s, c * 2 * np.pi * x, c * np.pi / 180, yscale * s * x / decay**2, 1.0
+    )
+
+
 def fitdecaysin(
     xdata: np.ndarray,
     ydata: np.ndarray,
@@ -614,30 +735,36 @@ def fitdecaysin(
     if fitparams is None:
         fitparams = [None] * 5
 
-    # Initialize using Fourier transform
-    max_freq, max_phase = fourier_init(xdata, ydata, debug)
-
-    # Initialize parameters if not provided
-    if fitparams[0] is None:
-        fitparams[0] = (max(ydata) - min(ydata)) / 2  # yscale
-    if fitparams[1] is None:
-        fitparams[1] = max_freq  # freq
-    if fitparams[2] is None:
-        fitparams[2] = max_phase * 180 / np.pi + 90  # phase_deg
-    if fitparams[3] is None:
-        fitparams[3] = max(xdata) - min(xdata)  # decay
-    if fitparams[4] is None:
-        fitparams[4] = np.mean(ydata)  # y0
-
+    def fourier_guess():
+        max_freq, max_phase = fourier_init(xdata, ydata, debug)
+        return [
+            (max(ydata) - min(ydata)) / 2,  # yscale
+            max_freq,  # freq
+            max_phase * 180 / np.pi + 90,  # phase_deg
+            max(xdata) - min(xdata),  # decay
+            np.mean(ydata),  # y0
+        ]
+
+    # Initialize with the matrix pencil estimate (see fit_guess.py); the
+    # Fourier transform is the fallback for traces without a clear oscillation
+    guess = guess_decaysin(xdata, ydata)
+    if debug or not np.all(np.isfinite(guess)):
+        guess = np.where(np.isfinite(guess), guess, fourier_guess())
+    span = max(xdata) - min(xdata)
+    # Keep the decay guess inside the lower bound below
+    guess[3] = max(guess[3], 0.35 * span)
+    fill_guess(fitparams, guess, fourier_guess)
+
+    # Frequency bounds follow the caller's freq when one is given
     bounds = (
         [
             0.75 * fitparams[0],
-            0.1 * max_freq,
+            0.1 * fitparams[1],
             -360,
-            0.3 * (max(xdata) - min(xdata)),
+            0.3 * span,
             np.min(ydata),
         ],
-        [1.25 * fitparams[0], 1.5 * max_freq, 360, np.inf, np.max(ydata)],
+        [1.25 * fitparams[0], 1.5 * fitparams[1], 360, np.inf, np.max(ydata)],
     )
 
     fitparams = validate_bounds(fitparams, bounds)
@@ -646,7 +773,8 @@ def fitdecaysin(
 
     try:
         pOpt, pCov = sp.optimize.curve_fit(
-            decaysin, xdata, ydata, p0=fitparams, bounds=bounds
+            decaysin, xdata, ydata, p0=fitparams, bounds=bounds,
+            jac=model_jacobian(decaysin),
         )
 
     except RuntimeError:
@@ -654,7 +782,8 @@ def fitdecaysin(
             # Try with inverted phase
             fitparams[2] = -fitparams[2]
             pOpt, pCov = sp.optimize.curve_fit(
-                decaysin, xdata, ydata, p0=fitparams, bounds=bounds
+                decaysin, xdata, ydata, p0=fitparams, bounds=bounds,
+                jac=model_jacobian(decaysin),
             )
         except:
             print("Warning: Fit decaying sine failed!")
@@ -683,6 +812,26 @@ def decayslopesin(x: np.ndarray, *p) -> np.ndarray:
     )
 
 
+@jacobian(decayslopesin)
+def decayslopesin_jac(x: np.ndarray, *p) -> np.ndarray:
+    """Jacobian of decayslopesin with respect to [yscale, freq, phase_deg, decay, y0, slope]."""
+    x = np.asarray(x, dtype=float)
+    yscale, freq, phase_deg, decay, y0, slope = p
+    arg = 2 * np.pi * freq * x + phase_deg * np.pi / 180
+    e = np.exp(-x / decay)
+    s = (np.sin(arg) + slope) * e
+    c = yscale * np.cos(arg) * e
+    return _stack_columns(
+        x,
+        s,
+        c * 2 * np.pi * x,
+        c * np.pi / 180,
+        yscale * s * x / decay**2,
+        1.0,
+        yscale * e,
+    )
+
+
 def fitdecayslopesin(
     xdata: np.ndarray,
     ydata: np.ndarray,
@@ -704,22 +853,23 @@ def fitdecayslopesin(
     if fitparams is None:
         fitparams = [None] * 6
 
-    # Initialize using Fourier transform
-    max_freq, max_phase = fourier_init(xdata, ydata, debug)
-
-    # Initialize parameters if not provided
-    if fitparams[0] is None:
-        fitparams[0] = max(ydata) - min(ydata)  # yscale
-    if fitparams[1] is None:
-        fitparams[1] = max_freq  # freq
-    if fitparams[2] is None:
-        fitparams[2] = max_phase * 180 / np.pi + 90  # phase_deg
-    if fitparams[3] is None:
-        fitparams[3] = (max(xdata) - min(xdata)) / 4  # decay
-    if fitparams[4] is None:
-        fitparams[4] = np.mean(ydata)  # y0
-    if fitparams[5] is None:
-        fitparams[5] = 0  # slope
+    def fourier_guess():
+        max_freq, max_phase = fourier_init(xdata, ydata, debug)
+        return [
+            max(ydata) - min(ydata),  # yscale
+            max_freq,  # freq
+            max_phase * 180 / np.pi + 90,  # phase_deg
+            (max(xdata) - min(xdata)) / 4,  # decay
+            np.mean(ydata),  # y0
+            0,  # slope
+        ]
+
+    # Initialize with the matrix pencil estimate (see fit_guess.py); the
+    # Fourier transform is the fallback for traces without a clear oscillation
+    guess = guess_decayslopesin(xdata, ydata)
+    if debug or not np.all(np.isfinite(guess)):
+        guess = np.where(np.isfinite(guess), guess, fourier_guess())
+    fill_guess(fitparams, guess, fourier_guess)
 
     bounds = (
         [0.6 * fitparams[0], 1e-3, -360, 0.1, np.min(ydata), -np.inf],
@@ -731,20 +881,25 @@ def fitdecayslopesin(
     pCov = np.full(shape=(len(fitparams), len(fitparams)), fill_value=np.inf)
 
     try:
-        pOpt, pCov = sp.optimize.curve_fit(decayslopesin, xdata, ydata, p0=fitparams)
+        pOpt, pCov = sp.optimize.curve_fit(
+            decayslopesin, xdata, ydata, p0=fitparams,
+            jac=model_jacobian(decayslopesin),
+        )
     except RuntimeError:
         try:
             # Try with phase shifted by -90 degrees
             fitparams[2] = fitparams[2] - 90
             pOpt, pCov = sp.optimize.curve_fit(
-                decayslopesin, xdata, ydata, p0=fitparams
+                decayslopesin, xdata, ydata, p0=fitparams,
+                jac=model_jacobian(decayslopesin),
             )
         except:
             try:
                 # Try with phase shifted by +180 degrees
                 fitparams[2] = fitparams[2] + 180
                 pOpt, pCov = sp.optimize.curve_fit(
-                    decayslopesin, xdata, ydata, p0=fitparams
+                    decayslopesin, xdata, ydata, p0=fitparams,
+                    jac=model_jacobian(decayslopesin),
                 )
             except:
                 print("Warning: Fit decaying slope sine failed!")
@@ -787,40 +942,34 @@ def fittwofreq_decaysin(
     if fitparams is None:
         fitparams = [None] * 10
 
-    # Initialize using Fourier transform
-    fourier = np.fft.fft(ydata)
-    fft_freqs = np.fft.fftfreq(len(ydata), d=xdata[1] - xdata[0])
-    fft_phases = np.angle(fourier)
-    sorted_fourier = np.sort(fourier)
-    max_ind = np.argwhere(fourier == sorted_fourier[-1])[0][0]
-
-    if max_ind == 0:
-        max_ind = np.argwhere(fourier == sorted_fourier[-2])[0][0]
-
-    max_freq = np.abs(fft_freqs[max_ind])
-    max_phase = fft_phases[max_ind]
-
-    # Initialize parameters if not provided
-    if fitparams[0] is None:
-        fitparams[0] = max(ydata) - min(ydata)  # yscale0
-    if fitparams[1] is None:
-        fitparams[1] = max_freq  # freq0
-    if fitparams[2] is None:
-        fitparams[2] = max_phase * 180 / np.pi  # phase_deg0
-    if fitparams[3] is None:
-        fitparams[3] = max(xdata) - min(xdata)  # decay0
-    if fitparams[4] is None:
-        fitparams[4] = np.mean(ydata)  # y00
-    if fitparams[5] is None:
-        fitparams[5] = xdata[0]  # x00
-    if fitparams[6] is None:
-        fitparams[6] = 1  # yscale1
-    if fitparams[7] is None:
-        fitparams[7] = 1 / 10  # freq1
-    if fitparams[8] is None:
-        fitparams[8] = 0  # phase_deg1
-    if fitparams[9] is None:
-        fitparams[9] = 0  # y01
+    def fourier_guess():
+        fourier = np.fft.fft(ydata)
+        fft_freqs = np.fft.fftfreq(len(ydata), d=xdata[1] - xdata[0])
+        fft_phases = np.angle(fourier)
+        sorted_fourier = np.sort(fourier)
+        max_ind = np.argwhere(fourier == sorted_fourier[-1])[0][0]
+
+        if max_ind == 0:
+            max_ind = np.argwhere(fourier == sorted_fourier[-2])[0][0]
+
+        max_freq = np.abs(fft_freqs[max_ind])
+        max_phase = fft_phases[max_ind]
+        return [
+            max(ydata) - min(ydata),  # yscale0
+            max_freq,  # freq0
+            max_phase * 180 / np.pi,  # phase_deg0
+            max(xdata) - min(xdata),  # decay0
+            np.mean(ydata),  # y00
+            xdata[0],  # x00
+            1,  # yscale1
+            1 / 10,  # freq1
+            0,  # phase_deg1
+            0,  # y01
+        ]
+
+    # Initialize from the two pole pairs at freq0 ± freq1 (matrix pencil, see
+    # fit_guess.py); the Fourier transform is the fallback
+    fill_guess(fitparams, guess_twofreq_decaysin(xdata, ydata), fourier_guess)
 
     bounds = (
         [
@@ -866,6 +1015,15 @@ def gaussian(x, a, x0, sigma, y0):
     return a * np.exp(-((x - x0) ** 2) / (2 * sigma**2)) + y0
 
 
+@jacobian(gaussian)
+def gaussian_jac(x, a, x0, sigma, y0):
+    """Jacobian of gaussian with respect to [a, x0, sigma, y0]."""
+    x = np.asarray(x, dtype=float)
+    dx = x - x0
+    g = np.exp(-(dx**2) / (2 * sigma**2))
+    return _stack_columns(x, g, a * g * dx / sigma**2, a * g * dx**2 / sigma**3, 1.0)
+
+
 def fit_gauss(xdata, ydata, fitparams=None):
     # xmed, xstd should be gotten from the single shot data prior to fitting the histogram
     if fitparams is None:
@@ -900,6 +1058,7 @@ def fit_gauss(xdata, ydata, fitparams=None):
             ydata,
             p0=np.array(fitparams, dtype="float64"),
             bounds=bounds,
+            jac=model_jacobian(gaussian),
         )
         # return pOpt, pCov
     except RuntimeError:
@@ -923,6 +1082,18 @@ def double_gaussian(x, a1, b1, c1, a2, b2, c2):
     )
 
 
+@jacobian(double_gaussian)
+def double_gaussian_jac(x, a1, b1, c1, a2, b2, c2):
+    """Jacobian of double_gaussian with respect to [a1, b1, c1, a2, b2, c2]."""
+    x = np.asarray(x, dtype=float)
+    columns = []
+    for a, b, c in ((a1, b1, c1), (a2, b2, c2)):
+        dx = x - b
+        g = np.exp(-(dx**2) / (2 * c**2))
+        columns += [g, a * g * dx / c**2, a * g * dx**2 / c**3]
+    return _stack_columns(x, *columns)
+
+
 def fit_doublegauss(xdata, ydata, fitparams):
     """
     Robust fitting function for double Gaussian distributions.
@@ -960,6 +1131,7 @@ def fit_doublegauss(xdata, ydata, fitparams):
             p0=fitparams,
             bounds=(lb, ub),
             maxfev=10000,  # Increase max iterations for convergence
+            jac=model_jacobian(double_gaussian),
         )
     except Exception as e:
         # print(f"Fit failed: {e}")
@@ -1022,6 +1194,33 @@ def hangerS21func_sloped(x: np.ndarray, *p) -> np.ndarray:
     return hangerS21func(x, f0, 1e4 * Qi, 1e4 * Qe, phi, scale) + slope * (x - f0)
 
 
+@jacobian(hangerS21func_sloped)
+def hangerS21func_sloped_jac(x: np.ndarray, *p) -> np.ndarray:
+    """Jacobian of hangerS21func_sloped with respect to [f0, Qi, Qe, phi, scale, slope]."""
+    x = np.asarray(x, dtype=float)
+    f0, Qi, Qe, phi, scale, slope = p
+    Qi, Qe = 1e4 * Qi, 1e4 * Qe
+    Q0 = 1 / (1 / Qi + 1 / Qe)
+    rot = np.exp(1j * phi)
+    D = 1 + 2j * Q0 * (x - f0) / f0
+    ND = Q0 / Qe * rot / D  # S21 = scale * (1 - ND)
+    S = scale * (1 - ND)
+
+    # d(ND)/dQ0 at fixed Qe, then the chain through Q0(Qi, Qe)
+    dND_dQ0 = rot / Qe / D - ND / D * 2j * (x - f0) / f0
+    dS = [
+        scale * ND / D * 2j * Q0 * (-x / f0**2),  # f0 (through D)
+        -scale * dND_dQ0 * Q0**2 / Qi**2 * 1e4,  # Qi
+        -scale * (dND_dQ0 * Q0**2 / Qe**2 - ND / Qe) * 1e4,  # Qe
+        -scale * 1j * ND,  # phi
+        1 - ND,  # scale
+    ]
+    mag = np.abs(S)
+    columns = [np.real(np.conj(S) * d) / mag for d in dS]
+    columns[0] = columns[0] - slope
+    return _stack_columns(x, *columns, x - f0)
+
+
 def hangerphasefunc(x: np.ndarray, *p) -> np.ndarray:
     """
     Phase of Hanger function for resonator fitting.
@@ -1078,10 +1277,12 @@ def fithanger(
 
     try:
         pOpt, pCov = sp.optimize.curve_fit(
-            hangerS21func_sloped, xdata, ydata, p0=fitparams, bounds=bounds
+            hangerS21func_sloped, xdata, ydata, p0=fitparams, bounds=bounds,
+            jac=model_jacobian(hangerS21func_sloped),
         )
         pOpt, pCov = sp.optimize.curve_fit(
-            hangerS21func_sloped, xdata, ydata, p0=pOpt, bounds=bounds
+            hangerS21func_sloped, xdata, ydata, p0=pOpt, bounds=bounds,
+            jac=model_jacobian(hangerS21func_sloped),
         )
     except RuntimeError:
         print("Warning: Fit hanger failed!")
@@ -1111,6 +1312,15 @@ def rb_func(depth: np.ndarray, p: float, a: float, b: float) -> np.ndarray:
     return a * p**depth + b
 
 
+@jacobian(rb_func)
+def rb_func_jac(depth: np.ndarray, p: float, a: float, b: float) -> np.ndarray:
+    """Jacobian of rb_func with respect to [p, a, b]."""
+    depth = np.asarray(depth, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dp = np.where(depth == 0, 0.0, a * depth * p ** (depth - 1))
+    return _stack_columns(depth, dp, p**depth, 1.0)
+
+
 def rb_error(p: float, d: int) -> float:
     """
     Calculate average error rate over all gates in sequence.
@@ -1187,7 +1397,8 @@ def fitrb(
 
     try:
         pOpt, pCov = sp.optimize.curve_fit(
-            rb_func, xdata, ydata, p0=fitparams, bounds=bounds
+            rb_func, xdata, ydata, p0=fitparams, bounds=bounds,
+            jac=model_jacobian(rb_func),
         )
         print(pOpt)
         print(pCov[0][0], pCov[1][1], pCov[2][2])
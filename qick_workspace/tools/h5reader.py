@@ -0,0 +1,263 @@
+"""
+Lazy access to experiment HDF5 files.
+
+``read_h5_file`` loads every dataset into memory, which is wasteful when only
+one trace of a 2D flux map or one grid point of a single-shot optimizer file
+is needed. ``open_h5`` keeps the file open in a context manager and returns
+``LazyDataset`` proxies that only read what is sliced::
+
+    with open_h5(path) as data:
+        trace = data["z_value"][42]             # one row
+        preview = data["z_value"].preview(200)  # strided overview for plotting
+        for row in data["z_value"].rows():      # row by row, chunk-sized reads
+            ...
+        shots = data["data"]["I_g"][:, 3, 5]    # any dataset of the "data" group
+
+Contiguous, uncompressed datasets are memory-mapped with ``numpy.memmap``, so
+slicing them is a plain array view backed by the OS page cache.
+
+``StreamedData`` is a path-backed handle to a stream file (see h5stream.py)
+that long sweeps return instead of the full array.
+"""
+
+import json
+import math
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import h5py
+import numpy as np
+
+
+class LazyDataset:
+    """
+    Array-like proxy of an h5py dataset.
+
+    Args:
+        dataset: The h5py dataset (its file must stay open while slicing).
+        mmap: Memory-map the dataset when its storage allows it.
+    """
+
+    def __init__(self, dataset: h5py.Dataset, mmap: bool = True):
+        self.dataset = dataset
+        self._memmap = self._open_memmap(dataset) if mmap else None
+
+    @staticmethod
+    def _open_memmap(ds: h5py.Dataset) -> Optional[np.memmap]:
+        """Memory-map a contiguous, unfiltered dataset; None if not possible."""
+        if ds.chunks is not None or ds.compression is not None or ds.size == 0:
+            return None
+        if ds.dtype.kind not in "biufc":
+            return None
+        offset = ds.id.get_offset()
+        if offset is None:
+            return None
+        try:
+            return np.memmap(
+                ds.file.filename, mode="r", dtype=ds.dtype, shape=ds.shape, offset=offset
+            )
+        except (OSError, ValueError):
+            return None
+
+    @property
+    def shape(self):
+        return self.dataset.shape
+
+    @property
+    def dtype(self):
+        return self.dataset.dtype
+
+    @property
+    def ndim(self) -> int:
+        return self.dataset.ndim
+
+    @property
+    def size(self) -> int:
+        return self.dataset.size
+
+    @property
+    def memory_mapped(self) -> bool:
+        return self._memmap is not None
+
+    def __len__(self) -> int:
+        return self.dataset.shape[0] if self.dataset.ndim else 1
+
+    def __getitem__(self, key) -> np.ndarray:
+        if self._memmap is not None:
+            return self._memmap[key]
+        return self.dataset[key]
+
+    def __array__(self, dtype=None, copy=None):
+        data = self[()] if self.ndim == 0 else self[...]
+        return np.asarray(data, dtype=dtype)
+
+    def rows(self, block: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Iterate over axis 0, reading ``block`` rows at a time.
+
+        Args:
+            block: Rows per read. Defaults to the chunk height (or 1).
+        """
+        if block is None:
+            block = self.dataset.chunks[0] if self.dataset.chunks else 1
+        for start in range(0, len(self), block):
+            for row in self[start : start + block]:
+                yield row
+
+    def preview(self, max_points: int = 1000) -> np.ndarray:
+        """
+        Strided subsample with at most ``max_points`` samples along every axis.
+
+        Returns:
+            Downsampled array (every k-th sample, no averaging).
+        """
+        key = tuple(
+            slice(None, None, max(1, math.ceil(n / max_points))) for n in self.shape
+        )
+        return np.asarray(self[key])
+
+    def read(self) -> np.ndarray:
+        """Load the whole dataset."""
+        return np.asarray(self)
+
+    def __repr__(self) -> str:
+        mode = "mmap" if self.memory_mapped else "h5py"
+        return f"<LazyDataset {self.dataset.name} shape={self.shape} dtype={self.dtype} ({mode})>"
+
+
+def _attr_json(attrs, key: str) -> Any:
+    if key not in attrs:
+        return None
+    value = attrs[key]
+    if isinstance(value, bytes):
+        value = value.decode()
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return value
+
+
+@contextmanager
+def open_h5(file_path: str, mmap: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Open an experiment HDF5 file for lazy reading.
+
+    Yields a dict with the same keys as ``read_h5_file`` ("x_name", "x_value",
+    "y_name", "y_value", "z_name", "z_value", "experiment_name", "config",
+    "result"), where the values are ``LazyDataset`` proxies, plus "data": a dict
+    of every dataset in the "data" group (e.g. single-shot files from
+    ``saveshot``). Missing axes are None. Proxies are only valid inside the
+    ``with`` block.
+
+    Args:
+        file_path: HDF5 file written by saveh5 / saveshot / H5StreamWriter.
+        mmap: Memory-map contiguous, uncompressed datasets.
+    """
+    with h5py.File(file_path, "r", libver="latest", swmr=True) as f:
+        out: Dict[str, Any] = {
+            "x_name": None,
+            "x_value": None,
+            "y_name": None,
+            "y_value": None,
+            "z_name": None,
+            "z_value": None,
+        }
+
+        if "parameter" in f:
+            for key, subgroup in f["parameter"].items():
+                for axis in ("x", "y"):
+                    if f"{axis}_axis_value" in subgroup:
+                        out[f"{axis}_name"] = key
+                        out[f"{axis}_value"] = LazyDataset(
+                            subgroup[f"{axis}_axis_value"], mmap=mmap
+                        )
+
+        datasets = {}
+        if "data" in f:
+            datasets = {
+                name: LazyDataset(ds, mmap=mmap)
+                for name, ds in f["data"].items()
+                if isinstance(ds, h5py.Dataset)
+            }
+        out["data"] = datasets
+        if datasets:
+            out["z_name"] = next(iter(datasets))
+            out["z_value"] = datasets[out["z_name"]]
+
+        out["experiment_name"] = _attr_json(f.attrs, "experiment_name")
+        out["config"] = _attr_json(f.attrs, "config")
+        out["result"] = _attr_json(f.attrs, "result")
+
+        yield out
+
+
+class StreamedData:
+    """
+    Handle to a dataset of a file written by ``H5StreamWriter``.
+
+    Unlike ``LazyDataset`` it keeps no file open: every read opens the file,
+    so the handle can be returned from a sweep and kept around. Nothing is
+    loaded until it is sliced or converted with ``np.asarray``.
+
+    Args:
+        file_path: HDF5 stream file.
+        name: Dataset in the "data" group.
+        shape: Full shape of the sweep; reading the whole array pads rows that
+               were never written (interrupted sweep) with zeros. Defaults to
+               the written rows.
+    """
+
+    def __init__(self, file_path: str, name: str, shape: Optional[tuple] = None):
+        self.file_path = file_path
+        self.name = name
+        self._shape = shape
+
+    @contextmanager
+    def _dataset(self) -> Iterator[h5py.Dataset]:
+        with h5py.File(self.file_path, "r", libver="latest", swmr=True) as f:
+            yield f["data"][self.name]
+
+    @property
+    def rows_written(self) -> int:
+        with self._dataset() as ds:
+            return ds.shape[0]
+
+    @property
+    def shape(self) -> tuple:
+        if self._shape is not None:
+            return tuple(self._shape)
+        with self._dataset() as ds:
+            return ds.shape
+
+    @property
+    def dtype(self):
+        with self._dataset() as ds:
+            return ds.dtype
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key) -> np.ndarray:
+        """Slice the written rows (rows never written are not included)."""
+        with self._dataset() as ds:
+            return ds[key]
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.read(), dtype=dtype)
+
+    def read(self) -> np.ndarray:
+        """Load the whole array, zero-padded to ``shape``."""
+        with self._dataset() as ds:
+            written = ds[...]
+        if self._shape is None or written.shape == tuple(self._shape):
+            return written
+        full = np.zeros(self._shape, dtype=written.dtype)
+        full[: len(written)] = written
+        return full
+
+    def __repr__(self) -> str:
+        return f"<StreamedData {self.file_path}:data/{self.name} shape={self.shape}>"
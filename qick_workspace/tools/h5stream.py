@@ -0,0 +1,202 @@
+"""
+Streaming HDF5 writer for long sweeps.
+
+``saveh5`` writes a whole run at the end, so a sweep that crashes half-way
+leaves nothing on disk. ``H5StreamWriter`` creates chunked, resizable
+datasets when the run starts and appends each row (or each average) as it
+arrives, flushing after every write. The layout matches ``saveh5``
+(``parameter/<x_name>/x_axis_value``, ``data/<z_name>``, json attrs), so
+``read_h5_file`` reads finished and partial files alike.
+
+With ``swmr=True`` the file is switched to single-writer / multiple-reader
+mode once the datasets exist, and other processes can follow the run with::
+
+    with h5py.File(path, "r", libver="latest", swmr=True) as f:
+        ds = f["data/iq_list"]
+        ds.refresh()
+        rows = ds[:]
+
+HDF5 does not allow attributes to be created while in SWMR mode, so
+``set_attrs`` writes immediately before ``start_swmr`` and otherwise keeps the
+values until ``close``.
+
+Compression: "gzip" (always available), "lzf", or "lz4" / "blosc" when the
+optional ``hdf5plugin`` package is installed (falls back to gzip otherwise).
+"""
+
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import h5py
+import numpy as np
+
+try:
+    import hdf5plugin
+except ImportError:
+    hdf5plugin = None
+
+
+def compression_kwargs(compression: Optional[str], level: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Keyword arguments for ``create_dataset`` selecting a compression filter.
+
+    Args:
+        compression: None, "gzip", "lzf", "lz4" or "blosc".
+        level: Compression level (gzip 0-9, blosc clevel).
+
+    Returns:
+        dict to unpack into ``h5py.Group.create_dataset``.
+    """
+    if compression is None:
+        return {}
+    compression = compression.lower()
+    if compression in ("lz4", "blosc"):
+        if hdf5plugin is not None:
+            if compression == "lz4":
+                return dict(hdf5plugin.LZ4())
+            return dict(hdf5plugin.Blosc(cname="lz4", clevel=5 if level is None else level))
+        print(f"hdf5plugin not installed, using gzip instead of {compression}")
+        compression = "gzip"
+    if compression == "gzip":
+        return {"compression": "gzip", "compression_opts": 4 if level is None else level}
+    if compression == "lzf":
+        return {"compression": "lzf"}
+    raise ValueError(f"Unknown compression '{compression}'")
+
+
+def _json_default(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+
+class H5StreamWriter:
+    """
+    Append-only HDF5 writer with chunked, resizable datasets.
+
+    Args:
+        file_path: Output file (created / truncated).
+        compression: See ``compression_kwargs``.
+        compression_level: Optional compression level.
+        swmr: Enable single-writer / multiple-reader mode in ``start_swmr``.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        compression: Optional[str] = "gzip",
+        compression_level: Optional[int] = None,
+        swmr: bool = True,
+    ):
+        self.file_path = file_path
+        self.swmr = swmr
+        self._filter = compression_kwargs(compression, compression_level)
+        self._pending_attrs: Dict[str, str] = {}
+        self._rows: Dict[str, int] = {}
+
+        self.file = h5py.File(file_path, "w", libver="latest" if swmr else None)
+        self.param_grp = self.file.create_group("parameter")
+        self.data_grp = self.file.create_group("data")
+
+    # -------------------------------------------------------------- #
+    # Layout (call before start_swmr)
+    # -------------------------------------------------------------- #
+
+    def add_axis(self, name: str, values: Sequence[float], axis: str = "x") -> None:
+        """Store sweep axis values as ``parameter/<name>/<axis>_axis_value``."""
+        grp = self.param_grp.create_group(name)
+        grp.create_dataset(f"{axis}_axis_value", data=np.asarray(values))
+
+    def create_stream(
+        self,
+        name: str,
+        row_shape: Tuple[int, ...] = (),
+        dtype: Any = complex,
+        expected_rows: Optional[int] = None,
+        chunk_rows: int = 1,
+    ) -> h5py.Dataset:
+        """
+        Create an empty dataset that grows along axis 0.
+
+        Args:
+            name: Dataset name in the "data" group.
+            row_shape: Shape of one appended row.
+            dtype: Data type.
+            expected_rows: Upper bound on the number of rows (None = unlimited).
+            chunk_rows: Rows per chunk; 1 makes every append land in its own chunk.
+
+        Returns:
+            The h5py dataset.
+        """
+        row_shape = tuple(row_shape)
+        ds = self.data_grp.create_dataset(
+            name,
+            shape=(0,) + row_shape,
+            maxshape=(expected_rows,) + row_shape,
+            chunks=(max(1, chunk_rows),) + row_shape,
+            dtype=dtype,
+            **self._filter,
+        )
+        self._rows[name] = 0
+        return ds
+
+    def start_swmr(self) -> None:
+        """Switch to SWMR mode; no new datasets or attributes can be created afterwards."""
+        if self.swmr and not self.file.swmr_mode:
+            self.file.flush()
+            self.file.swmr_mode = True
+
+    # -------------------------------------------------------------- #
+    # Streaming
+    # -------------------------------------------------------------- #
+
+    def append(self, name: str, row: Any) -> int:
+        """
+        Append one row to a stream and flush it to disk.
+
+        Returns:
+            int: Number of rows now in the stream.
+        """
+        ds = self.data_grp[name]
+        n = self._rows[name]
+        ds.resize(n + 1, axis=0)
+        ds[n] = row
+        ds.flush()
+        self._rows[name] = n + 1
+        return n + 1
+
+    def set_attrs(self, **attrs: Any) -> None:
+        """Store json-encoded file attributes (e.g. config=..., result=...)."""
+        encoded = {k: json.dumps(v, default=_json_default) for k, v in attrs.items()}
+        if self.file.swmr_mode:
+            self._pending_attrs.update(encoded)
+            return
+        for key, value in encoded.items():
+            self.file.attrs[key] = value
+        self.file.flush()
+
+    def rows(self, name: str) -> int:
+        return self._rows[name]
+
+    def read(self, name: str) -> np.ndarray:
+        """Read back everything written to a stream so far."""
+        return self.data_grp[name][: self._rows[name]]
+
+    def close(self) -> None:
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        if self._pending_attrs:
+            with h5py.File(self.file_path, "a") as f:
+                for key, value in self._pending_attrs.items():
+                    f.attrs[key] = value
+            self._pending_attrs = {}
+
+    def __enter__(self) -> "H5StreamWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,154 @@
+"""
+Import-time benchmark for the GUI and the qick_workspace scripts.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter per
+module and run, and reports the cumulative import time of the module and of
+its slowest dependencies. A saved baseline turns it into a regression check.
+
+Usage (from the repository root)::
+
+    python -m qick_workspace.tools.import_bench                 # default targets
+    python -m qick_workspace.tools.import_bench main pages.onetone --top 15
+    python -m qick_workspace.tools.import_bench --save import_baseline.json
+    python -m qick_workspace.tools.import_bench --baseline import_baseline.json --tolerance 0.25
+
+With ``--baseline`` the exit code is 1 when any module got slower than its
+baseline by more than ``tolerance`` (and ``--min-delta-ms``, to ignore noise).
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_TARGETS = [
+    "main",
+    "state.app_state",
+    "layout.layout",
+    "qick_workspace.tools.system_tool",
+    "qick_workspace.plotter.liveplot",
+]
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """Parse ``-X importtime`` output into (module, self_us, cumulative_us, depth)."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cum_us, indent, name = match.groups()
+            # Nested imports are indented by two spaces per level
+            entries.append((name, int(self_us), int(cum_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure(module: str, runs: int = 3, cwd: Optional[str] = None) -> Dict[str, object]:
+    """
+    Import module in fresh interpreters and return the fastest run.
+
+    Returns:
+        dict with "module", "total_ms" (cumulative time of module itself),
+        "error" (stderr tail if the import failed) and "children" (cumulative
+        ms of the direct imports of module in that run).
+    """
+    best = None
+    for _ in range(max(1, runs)):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+        )
+        entries = parse_importtime(proc.stderr)
+        if proc.returncode != 0:
+            tail = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+            return {"module": module, "total_ms": None, "error": "\n".join(tail[-3:]), "children": {}}
+
+        pos = next(
+            (i for i in range(len(entries) - 1, -1, -1) if entries[i][0] == module), None
+        )
+        if pos is None:
+            continue
+        total = entries[pos][2]
+        if best is None or total < best[0]:
+            # Children are printed before their parent, one level deeper
+            children = {}
+            for name, _, cum, depth in reversed(entries[:pos]):
+                if depth <= entries[pos][3]:
+                    break
+                if depth == entries[pos][3] + 1:
+                    children[name] = cum / 1000
+            best = (total, children)
+
+    if best is None:
+        return {"module": module, "total_ms": None, "error": "no importtime output", "children": {}}
+    return {"module": module, "total_ms": best[0] / 1000, "error": None, "children": best[1]}
+
+
+def compare(
+    results: List[Dict[str, object]],
+    baseline: Dict[str, float],
+    tolerance: float,
+    min_delta_ms: float,
+) -> List[str]:
+    """Return a message for every module slower than its baseline."""
+    regressions = []
+    for res in results:
+        module, total = res["module"], res["total_ms"]
+        ref = baseline.get(module)
+        if total is None or ref is None:
+            continue
+        if total > ref * (1 + tolerance) and total - ref > min_delta_ms:
+            regressions.append(f"{module}: {total:.1f} ms (baseline {ref:.1f} ms)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_TARGETS)
+    parser.add_argument("--runs", type=int, default=3, help="runs per module, fastest is kept")
+    parser.add_argument("--top", type=int, default=8, help="slowest dependencies to list")
+    parser.add_argument("--save", help="write the results as a baseline JSON file")
+    parser.add_argument("--baseline", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=20.0)
+    args = parser.parse_args(argv)
+
+    results = []
+    for module in args.modules:
+        res = measure(module, runs=args.runs, cwd=os.getcwd())
+        results.append(res)
+        if res["error"]:
+            print(f"{module:<40} import failed: {res['error']}")
+            continue
+        print(f"{module:<40} {res['total_ms']:9.1f} ms")
+        slowest = sorted(res["children"].items(), key=lambda kv: kv[1], reverse=True)
+        for name, ms in slowest[: args.top]:
+            print(f"    {name:<36} {ms:9.1f} ms")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(
+                {r["module"]: r["total_ms"] for r in results if r["total_ms"] is not None},
+                f,
+                indent=2,
+            )
+        print(f"Baseline saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        for msg in regressions:
+            print(f"REGRESSION {msg}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+LRU cache of compiled QICK programs.
+
+Building an AveragerProgramV2 subclass runs ``_initialize`` / ``_body`` and
+generates the ASM, which is a noticeable cost when a page is re-run with the
+same parameters or a script rebuilds a program for every sweep point. The
+cache keys a program by its class, a canonical hash of the cfg, the soccfg
+instance and the reps / final_delay arguments, and hands back the already
+compiled program on a hit.
+
+Usage::
+
+    from ..tools.program_cache import get_program
+
+    prog = get_program(T1Program, soccfg, reps=cfg["reps"],
+                       final_delay=cfg["relax_delay"], cfg=cfg)
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .fingerprint import config_fingerprint
+
+
+class ProgramCache:
+    """
+    Thread-safe LRU cache of program instances.
+
+    The cfg is deep-copied when a program is built, so later in-place edits of
+    the caller's cfg (common in the sweep scripts) cannot desynchronise a cached
+    program from its key.
+
+    A hit returns the same instance to every caller, including its acquire
+    buffers, which are not reset. Take results from the return value of
+    ``acquire`` rather than from program attributes, and do not acquire with
+    one instance from two threads (the board job queue runs one job at a time).
+    Only route programs through the cache when the same cfg really repeats
+    (page re-runs, software-average passes); one-off sweep points only evict
+    the programs that are reused.
+
+    Args:
+        maxsize: Maximum number of programs kept; least recently used are evicted.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._programs: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(prog_cls: type, soccfg: Any, cfg: Dict[str, Any], **kwargs) -> tuple:
+        return (
+            f"{prog_cls.__module__}.{prog_cls.__qualname__}",
+            id(soccfg),
+            config_fingerprint(kwargs),
+            config_fingerprint(cfg),
+        )
+
+    def get(self, prog_cls: type, soccfg: Any, cfg: Dict[str, Any], **kwargs) -> Any:
+        """
+        Return a program for (prog_cls, soccfg, cfg, kwargs), building it on a miss.
+
+        Args:
+            prog_cls: Program class, e.g. ``T1Program``.
+            soccfg: The QICK soccfg the program is compiled for.
+            cfg: Experiment cfg dict passed to the program.
+            **kwargs: Other constructor arguments (reps, final_delay, ...).
+
+        Returns:
+            The (possibly cached) program instance.
+        """
+        key = self.make_key(prog_cls, soccfg, cfg, **kwargs)
+        with self._lock:
+            entry = self._programs.get(key)
+            # id() can be reused after a soccfg is garbage collected: check identity
+            if entry is not None and entry[0] is soccfg:
+                self._programs.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        # addict.Dict does not deepcopy cleanly, go through a plain dict
+        cfg_copy = copy.deepcopy(cfg.to_dict() if hasattr(cfg, "to_dict") else cfg)
+        prog = prog_cls(soccfg, cfg=cfg_copy, **kwargs)
+
+        with self._lock:
+            self.misses += 1
+            self._programs[key] = (soccfg, prog)
+            self._programs.move_to_end(key)
+            while self.maxsize is not None and len(self._programs) > self.maxsize:
+                self._programs.popitem(last=False)
+                self.evictions += 1
+        return prog
+
+    def clear(self) -> None:
+        """Drop all cached programs (e.g. after reconnecting to a new board)."""
+        with self._lock:
+            self._programs.clear()
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._programs)
+
+    @property
+    def hit_rate(self) -> Optional[float]:
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters as a dict."""
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+
+# Shared cache used by the GUI pages and the experiment scripts
+program_cache = ProgramCache()
+
+
+def get_program(prog_cls: type, soccfg: Any, cfg: Dict[str, Any], **kwargs) -> Any:
+    """Build or fetch ``prog_cls(soccfg, cfg=cfg, **kwargs)`` from the shared cache."""
+    return program_cache.get(prog_cls, soccfg, cfg, **kwargs)
@@ -0,0 +1,182 @@
+"""
+Concurrent fitting of the four quadratures of a complex IQ trace.
+
+``plot_final`` (plotter/plot_utils.py) and ``nicegui_plot_final``
+(layout/nicegui_plot.py) fit the same model to amps, phase, avgi and avgq and
+then let ``fitting.get_best_fit`` pick one. ``fit_quadratures`` submits the
+four fits to a shared executor at once instead of running them back to back:
+
+* The default executor is a small thread pool, so callers on the GUI event
+  loop can also run the whole analysis with ``asyncio.to_thread``. Pass
+  ``executor="process"`` (or any ``concurrent.futures.Executor``) to fit in
+  worker processes; fit functions must then be importable module functions.
+* Opt-in: with ``r2_threshold`` / ``max_rel_err`` set, the first finished fit
+  of a checked measure that is good enough ends the wait: the remaining fits
+  are cancelled (or left to finish in the background) and reported as failed,
+  so ``get_best_fit`` selects the good one and the plots show no curve for
+  them. By default all four quadratures are fitted.
+
+Measures whose fit failed get NaN parameters and an infinite covariance, which
+``get_best_fit`` already ranks last. With ``cache`` (see fit_cache.py) the
+result is looked up by the data and fit options before fitting.
+"""
+
+import threading
+from concurrent.futures import (
+    Executor,
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .fit_cache import FitCache
+
+MEASURES = ("amps", "phase", "avgi", "avgq")
+# Measures get_best_fit chooses from by default
+CHECK_MEASURES = ("amps", "avgi", "avgq")
+
+_pools: Dict[str, Executor] = {}
+_pools_lock = threading.Lock()
+
+
+def analysis_executor(kind: str = "thread") -> Executor:
+    """Shared executor for fits: "thread" (default) or "process"."""
+    with _pools_lock:
+        if kind not in _pools:
+            if kind == "thread":
+                _pools[kind] = ThreadPoolExecutor(
+                    max_workers=len(MEASURES), thread_name_prefix="fit"
+                )
+            elif kind == "process":
+                _pools[kind] = ProcessPoolExecutor(max_workers=len(MEASURES))
+            else:
+                raise ValueError(f"Unknown executor kind {kind!r}")
+        return _pools[kind]
+
+
+def quadrature_data(xpts: np.ndarray, data: np.ndarray) -> Dict[str, Any]:
+    """Split complex IQ data into the amps / phase / avgi / avgq traces."""
+    return {
+        "xpts": xpts,
+        "amps": np.abs(data),
+        "phase": np.unwrap(np.angle(data)),
+        "avgi": data.real,
+        "avgq": data.imag,
+    }
+
+
+def _fit_measure(fitfunc: Callable, xpts: np.ndarray, ydata: np.ndarray) -> Tuple[Any, Any]:
+    popt, pcov = fitfunc(xpts, ydata)[:2]
+    return popt, pcov
+
+
+def fit_quality(
+    xpts: np.ndarray, ydata: np.ndarray, simfunc: Callable, popt, pcov
+) -> Tuple[float, float]:
+    """(R², mean relative parameter error) of one fit; (-inf, inf) if unusable."""
+    popt = np.asarray(popt, dtype=float)
+    pcov = np.asarray(pcov, dtype=float)
+    if not np.all(np.isfinite(popt)) or not np.all(np.isfinite(np.diag(pcov))):
+        return -np.inf, np.inf
+    ss_res = np.sum((simfunc(xpts, *popt) - ydata) ** 2)
+    ss_tot = np.sum((ydata - np.mean(ydata)) ** 2)
+    r2 = 1 - ss_res / ss_tot if ss_tot > 0 else -np.inf
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel_err = np.mean(np.sqrt(np.abs(np.diag(pcov))) / np.abs(popt))
+    return r2, rel_err if np.isfinite(rel_err) else np.inf
+
+
+def fit_quadratures(
+    xpts: np.ndarray,
+    data: np.ndarray,
+    fitfunc: Callable,
+    simfunc: Optional[Callable] = None,
+    executor: Union[None, str, Executor] = None,
+    r2_threshold: Optional[float] = None,
+    max_rel_err: Optional[float] = None,
+    check_measures: Sequence[str] = CHECK_MEASURES,
+    cache: Optional[FitCache] = None,
+) -> Dict[str, Any]:
+    """
+    Fit amps, phase, avgi and avgq of complex data concurrently.
+
+    Args:
+        xpts: X axis.
+        data: Complex IQ data.
+        fitfunc: Fitter of fitting.py, returning (pOpt, pCov, ...).
+        simfunc: Model function; needed for the short-circuit (R²).
+        executor: None / "thread" for the shared thread pool, "process" for
+                  the shared process pool, or an Executor.
+        r2_threshold: Stop waiting once a checked measure reaches this R²...
+        max_rel_err: ...and a mean relative parameter error below this.
+        check_measures: Measures allowed to end the wait early.
+        cache: FitCache to reuse the result of a previous call on the same
+               data and options.
+
+    Returns:
+        The quadrature data dict with "fit_<measure>" / "fit_err_<measure>"
+        entries, as expected by fitting.get_best_fit.
+    """
+    if cache is not None:
+        return cache.cached(
+            fitfunc,
+            xpts,
+            data,
+            compute=lambda: fit_quadratures(
+                xpts, data, fitfunc, simfunc, executor, r2_threshold, max_rel_err, check_measures
+            ),
+            analysis="quadratures",
+            # The model decides the short-circuit R², so it is part of the key
+            simfunc=simfunc,
+            r2_threshold=r2_threshold,
+            max_rel_err=max_rel_err,
+            check_measures=tuple(check_measures),
+        )
+
+    data_dict = quadrature_data(xpts, data)
+    if executor is None or isinstance(executor, str):
+        executor = analysis_executor(executor or "thread")
+    short_circuit = simfunc is not None and (r2_threshold is not None or max_rel_err is not None)
+
+    pending = {
+        executor.submit(_fit_measure, fitfunc, xpts, data_dict[measure]): measure
+        for measure in MEASURES
+    }
+    n_params = None
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        good_enough = False
+        for future in done:
+            measure = pending.pop(future)
+            try:
+                popt, pcov = future.result()
+            except Exception as e:
+                print(f"Fit failed for {measure}: {e}")
+                continue
+            data_dict[f"fit_{measure}"] = popt
+            data_dict[f"fit_err_{measure}"] = pcov
+            n_params = len(popt)
+
+            if short_circuit and measure in check_measures:
+                r2, rel_err = fit_quality(xpts, data_dict[measure], simfunc, popt, pcov)
+                # Several futures can finish together: any passing one is enough
+                good_enough = good_enough or (
+                    (r2_threshold is None or r2 >= r2_threshold)
+                    and (max_rel_err is None or rel_err <= max_rel_err)
+                )
+        if good_enough:
+            for future in pending:
+                future.cancel()
+            break
+
+    # Unfinished or failed measures rank last in get_best_fit
+    if n_params is not None:
+        for measure in MEASURES:
+            if f"fit_{measure}" not in data_dict:
+                data_dict[f"fit_{measure}"] = np.full(n_params, np.nan)
+                data_dict[f"fit_err_{measure}"] = np.full((n_params, n_params), np.inf)
+    return data_dict
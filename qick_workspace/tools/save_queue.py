@@ -0,0 +1,265 @@
+"""
+Background writer for experiment data files.
+
+``hdf5_generator`` / ``saveh5`` / ``saveshot`` write synchronously, so a large
+single-shot array or 2D flux map holds up the next measurement until the file
+is on disk. ``SaveQueue`` runs the writes on one dedicated thread instead:
+
+* ``submit`` snapshots the data (numpy arrays are copied), puts the job on a
+  bounded queue and returns a ``concurrent.futures.Future`` right away. When
+  the queue is full, ``submit`` blocks, which keeps memory bounded if the disk
+  cannot keep up.
+* Failed writes are retried with a growing delay before the future fails.
+  Files a failed attempt may have left half-written (``partial_paths``) are
+  removed first; if such a file already existed before the job, it is not
+  touched and the write is not retried.
+* After a successful write the files are fsync'ed, so a resolved future means
+  the data is on disk.
+* Jobs still queued at interpreter exit are written before the process ends.
+
+Usage::
+
+    from ..tools.save_queue import hdf5_generator_async
+
+    future = hdf5_generator_async(filepath=file_path, x_info=..., z_info=...)
+    future.result()  # only if the caller needs to wait
+"""
+
+import atexit
+import copy
+import os
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+from .system_tool import hdf5_generator, saveh5, saveshot
+
+
+def _snapshot(obj: Any) -> Any:
+    """Copy arrays (also inside dicts / lists) so later in-place edits do not leak into the file."""
+    if isinstance(obj, np.ndarray):
+        return obj.copy()
+    if isinstance(obj, dict):
+        # Shallow copy keeps the subclass and its state (defaultdict factory, ...)
+        snap = copy.copy(obj)
+        for k, v in obj.items():
+            snap[k] = _snapshot(v)
+        return snap
+    if isinstance(obj, list):
+        return [_snapshot(v) for v in obj]
+    if isinstance(obj, tuple):
+        return tuple(_snapshot(v) for v in obj)
+    return obj
+
+
+def _fsync(path: str) -> None:
+    with open(path, "r+b") as f:
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class _SaveJob:
+    __slots__ = (
+        "fn", "args", "kwargs", "fsync_paths", "partial_paths", "description", "future"
+    )
+
+    def __init__(self, fn, args, kwargs, fsync_paths, partial_paths, description):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.fsync_paths = list(fsync_paths)
+        self.partial_paths = list(partial_paths)
+        self.description = description
+        self.future: Future = Future()
+
+
+_STOP = object()
+
+
+class SaveQueue:
+    """
+    Single-thread background writer with a bounded job queue.
+
+    Args:
+        maxsize: Maximum number of queued jobs; ``submit`` blocks when full.
+        retries: Extra attempts after a failed write.
+        retry_delay: Delay before the first retry in seconds (doubled each time).
+    """
+
+    def __init__(self, maxsize: int = 8, retries: int = 3, retry_delay: float = 1.0):
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.current: Optional[str] = None
+        self.last_error: Optional[str] = None
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._worker, name="save-queue", daemon=True
+                )
+                self._thread.start()
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        fsync_paths: Iterable[str] = (),
+        partial_paths: Iterable[str] = (),
+        description: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Future:
+        """
+        Queue ``fn(*args, **kwargs)`` for the writer thread.
+
+        Args:
+            fn: Function that writes the file(s).
+            *args, **kwargs: Arguments for ``fn``; arrays are copied at submit time.
+            fsync_paths: Files to fsync once ``fn`` has returned.
+            partial_paths: Files ``fn`` creates without truncating (e.g. a Labber
+                log); a failed attempt's file is removed before retrying.
+            description: Label shown in the status / error messages.
+
+        Returns:
+            Future resolving to the return value of ``fn`` once the data is on disk.
+        """
+        job = _SaveJob(
+            fn,
+            _snapshot(args),
+            _snapshot(kwargs),
+            fsync_paths,
+            partial_paths,
+            description or getattr(fn, "__name__", "save"),
+        )
+        with self._lock:
+            self.pending += 1
+        self._ensure_thread()
+        self._queue.put(job)
+        return job.future
+
+    def _run(self, job: _SaveJob) -> Any:
+        delay = self.retry_delay
+        # A retry would append to a file that was there before: do not touch it
+        retries = self.retries
+        if any(os.path.exists(path) for path in job.partial_paths):
+            retries = 0
+        for attempt in range(retries + 1):
+            try:
+                result = job.fn(*job.args, **job.kwargs)
+                for path in job.fsync_paths:
+                    if os.path.exists(path):
+                        _fsync(path)
+                return result
+            except Exception as e:
+                if attempt == retries:
+                    raise
+                for path in job.partial_paths:
+                    if os.path.exists(path):
+                        os.remove(path)
+                print(f"Save '{job.description}' failed ({e}), retrying in {delay:.1f} s")
+                time.sleep(delay)
+                delay *= 2
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                self.current = job.description
+                try:
+                    result = self._run(job)
+                except Exception as e:
+                    self.failed += 1
+                    self.last_error = f"{job.description}: {e}"
+                    print(f"Save '{job.description}' failed:")
+                    traceback.print_exc()
+                    job.future.set_exception(e)
+                else:
+                    self.completed += 1
+                    job.future.set_result(result)
+            finally:
+                if job is not _STOP:
+                    self.current = None
+                    with self._lock:
+                        self.pending -= 1
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every queued job has been written (or has failed)."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Write the remaining jobs and stop the writer thread."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._thread = None
+
+    def status(self) -> Dict[str, Any]:
+        """Return the queue counters as a dict (used by the GUI status label)."""
+        return {
+            "pending": self.pending,
+            "current": self.current,
+            "completed": self.completed,
+            "failed": self.failed,
+            "last_error": self.last_error,
+        }
+
+
+# Shared writer used by the experiment scripts
+save_queue = SaveQueue()
+atexit.register(save_queue.close)
+
+
+def hdf5_generator_async(filepath: str, *args: Any, **kwargs: Any) -> Future:
+    """Queue ``hdf5_generator``; Labber writes to ``<filepath>.hdf5``."""
+    return save_queue.submit(
+        hdf5_generator,
+        filepath,
+        *args,
+        fsync_paths=[f"{filepath}.hdf5"],
+        partial_paths=[f"{filepath}.hdf5"],
+        description=os.path.basename(filepath),
+        **kwargs,
+    )
+
+
+def saveh5_async(file_path: str, *args: Any, **kwargs: Any) -> Future:
+    """Queue ``saveh5``."""
+    return save_queue.submit(
+        saveh5,
+        file_path,
+        *args,
+        fsync_paths=[file_path],
+        description=os.path.basename(file_path),
+        **kwargs,
+    )
+
+
+def saveshot_async(file_path: str, *args: Any, **kwargs: Any) -> Future:
+    """Queue ``saveshot``."""
+    return save_queue.submit(
+        saveshot,
+        file_path,
+        *args,
+        fsync_paths=[file_path],
+        description=os.path.basename(file_path),
+        **kwargs,
+    )
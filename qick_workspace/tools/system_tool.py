@@ -4,18 +4,20 @@ import math
 import os
 import pprint
 import re
+import sqlite3
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import h5py
 import numpy as np
 import yaml
 from addict import Dict as AddictDict
 
-try:
-    import Labber
-except ImportError:
-    print("No Labber module")
+from .config_snapshot import ConfigOverlay, ConfigSnapshot, cfg_overlay
+from .config_store import ConfigStore
+from .file_index import get_file_index, scan_labber_indices
+from .h5reader import LazyDataset, open_h5
+from .h5stream import compression_kwargs
 
 
 # =============================================================================
@@ -35,6 +37,12 @@ def get_next_filename(base_path: str, exp_name: str, suffix: str = ".h5") -> str
     experiment_path = os.path.join(base_path, year, month, date_path)
     os.makedirs(experiment_path, exist_ok=True)
 
+    try:
+        i = get_file_index(base_path).reserve_in_dir(experiment_path, exp_name, suffix)
+        return os.path.join(experiment_path, f"{exp_name}_{i}{suffix}")
+    except (sqlite3.Error, OSError) as e:
+        print(f"File index unavailable ({e}), probing {experiment_path}")
+
     i = 1
     while True:
         fname = f"{exp_name}_{i}{suffix}"
@@ -71,19 +79,13 @@ def get_next_filename_labber(
             )
 
     else:
-        # 3. Normal (index) mode
-        max_index = 0
-        pattern = re.compile(rf"^{re.escape(exp_name)}_(\d+)\.hdf5$")
-
-        for root, dirs, files in os.walk(dest_path):
-            for f in files:
-                match = pattern.match(f)
-                if match:
-                    current_index = int(match.group(1))
-                    if current_index > max_index:
-                        max_index = current_index
-
-        next_index = max_index + 1
+        # 3. Normal (index) mode: reserve the next index from the persistent index
+        try:
+            next_index = get_file_index(dest_path).reserve_labber(exp_name, save_path)
+        except (sqlite3.Error, OSError) as e:
+            print(f"File index unavailable ({e}), scanning {dest_path}")
+            next_index = scan_labber_indices(dest_path).get(exp_name, 0) + 1
+
         final_filename = f"{exp_name}_{next_index:03d}"
         return os.path.join(save_path, final_filename)
 
@@ -99,6 +101,9 @@ def hdf5_generator(
     """
     Create a Labber-compatible LogFile for data.
     """
+    # Imported here: Labber is slow to import and only needed for saving
+    import Labber
+
     np.float = float
     np.bool = bool
     zdata = z_info["values"]
@@ -125,10 +130,13 @@ def saveh5(
     data_dict: Dict[str, Any],
     config: Optional[Dict[str, Any]] = None,
     result: Optional[Dict[str, Any]] = None,
+    compression: Optional[str] = None,
 ) -> None:
     """
     Save experiment data to an HDF5 file with structured groups for x/y/z axes.
+    ``compression`` ("gzip", "lzf", "lz4", "blosc") is applied to the z data.
     """
+    filters = compression_kwargs(compression)
     with h5py.File(file_path, "w") as f:
         param_grp = f.create_group("parameter")
         data_grp = f.create_group("data")
@@ -142,7 +150,9 @@ def saveh5(
             y_grp.create_dataset("y_axis_value", data=data_dict["y_value"])
 
         if "z_name" in data_dict and "z_value" in data_dict:
-            data_grp.create_dataset(data_dict["z_name"], data=data_dict["z_value"])
+            data_grp.create_dataset(
+                data_dict["z_name"], data=data_dict["z_value"], **filters
+            )
         if "experiment_name" in data_dict:
             f.attrs["experiment_name"] = data_dict["experiment_name"]
         if config:
@@ -156,15 +166,21 @@ def saveshot(
     data_dict: Dict[str, Any],
     config: Optional[Dict[str, Any]] = None,
     result: Optional[Dict[str, Any]] = None,
+    compression: Optional[str] = None,
 ) -> None:
     """
     Save experiment data to an HDF5 file, dumping all keys in data_dict to the 'data' group.
+    ``compression`` ("gzip", "lzf", "lz4", "blosc") is applied to array entries.
     """
+    filters = compression_kwargs(compression)
     with h5py.File(file_path, "w") as f:
         data_grp = f.create_group("data")
 
         for key, value in data_dict.items():
-            data_grp.create_dataset(key, data=value)
+            # Filters need chunked storage, which scalars and strings do not have
+            is_array = np.ndim(value) > 0 and np.asarray(value).dtype.kind in "biufc"
+            extra = filters if is_array else {}
+            data_grp.create_dataset(key, data=value, **extra)
 
         if "experiment_name" in data_dict:
             f.attrs["experiment_name"] = data_dict["experiment_name"]
@@ -177,6 +193,7 @@ def saveshot(
 def read_h5_file(file_path: str) -> Dict[str, Any]:
     """
     Read experiment data from an HDF5 file.
+    Everything is loaded into memory; use ``open_h5`` for lazy, sliced access.
     """
     data = {}
 
@@ -353,14 +370,27 @@ class ExperimentConfig:
     - Single qubit extraction (flat dict) with dot notation support.
     - Unified update method for both single values and dictionary merging.
     - Export to Python files (Full config or Single Qubit).
+    - Optional ConfigStore: every update is journaled with its source, and
+      `save_snapshot` writes the full list atomically.
+
+    Leaf values are indexed once by (qubit, path). Updates that only change
+    existing scalar leaves patch the unified view in place and drop the cached
+    snapshot of the affected qubit; anything that changes the shape of the
+    nested config rebuilds the index.
+
+    `snapshot` returns a cached, read-only ConfigSnapshot stamped with
+    `version`, which increments on every update. `get_qubit` returns a
+    mutable ConfigOverlay on that snapshot for per-run changes.
     """
 
     def __init__(
         self,
         data: Union[List, Dict],
-        keys_to_unify: Optional[List[str]] = None
+        keys_to_unify: Optional[List[str]] = None,
+        store: Optional[ConfigStore] = None,
     ):
         self._raw_list = data
+        self.store = store
         self.keys_to_unify = keys_to_unify or [
             "reps", "res_length", "ro_length", "trig_time", "relax_delay"
         ]
@@ -373,36 +403,112 @@ class ExperimentConfig:
                 if name:
                     self._name_map[name] = idx
 
+        self.version = 0
         self._refresh()
 
+        if self.store is not None and not self.store.has_snapshot():
+            self.save_snapshot()
+
     def _refresh(self) -> None:
-        """Recalculate the unified configuration after updates."""
+        """Recalculate the unified configuration and the leaf index."""
         self._raw_collected = self._collect_all_key_values(self._raw_list)
         # Unified config is now an AddictDict for dot notation
         self.unified_config = self._refine_cfg(self._raw_collected)
+        self._build_index()
+        self._qubit_cache: Dict[int, ConfigSnapshot] = {}
 
-    def get_qubit(self, q_id: Union[int, str]) -> AddictDict:
+    def _build_index(self) -> None:
         """
-        Retrieve a flattened configuration for a specific Qubit as an AddictDict.
-        Allows access via `config.name` or `config['name']`.
+        Map every leaf path to its position in the collected value lists.
+
+        Paths start at the root of the raw data, so for a config list they
+        begin with the qubit index, e.g. (1, "res", "res_freq_ge"). Leaves
+        are visited in the same order as `_collect_all_key_values`, so the
+        position of a path is also its position in `unified_config[key]`.
+        """
+        self._leaf_pos: Dict[Tuple, int] = {}
+        self._key_paths: Dict[str, List[Tuple]] = defaultdict(list)
+        self._branch_keys = set()
+
+        def walk(node, path):
+            if isinstance(node, dict):
+                items = node.items()
+            else:
+                items = enumerate(node)
+            for key, value in items:
+                if isinstance(value, (dict, list)):
+                    if isinstance(node, dict):
+                        self._branch_keys.add(key)
+                    walk(value, path + (key,))
+                elif isinstance(node, dict):
+                    leaf = path + (key,)
+                    self._leaf_pos[leaf] = len(self._key_paths[key])
+                    self._key_paths[key].append(leaf)
+
+        if isinstance(self._raw_list, (dict, list)):
+            walk(self._raw_list, ())
+
+    def _set_leaf(self, path: Tuple, value: Any) -> None:
+        """Update one indexed leaf in the unified view."""
+        key = path[-1]
+        pos = self._leaf_pos[path]
+        collected = self._raw_collected[key]
+        collected[pos] = value
+
+        old = self.unified_config[key]
+        if key in self.keys_to_unify:
+            new = self._refine_cfg({key: list(collected)})[key]
+            self.unified_config[key] = new
+            if not (isinstance(old, list) and isinstance(new, list)):
+                # Scalar <-> list changes what every qubit sees for this key
+                self._qubit_cache.clear()
+                return
+        else:
+            old[pos] = value
+        # Snapshots are cached by qubit index and read unified_config[key][idx],
+        # so drop both the owning qubit and the one that reads position pos
+        self._qubit_cache.pop(path[0], None)
+        self._qubit_cache.pop(pos, None)
+
+    def snapshot(self, q_id: Union[int, str]) -> ConfigSnapshot:
+        """
+        Read-only flattened configuration of a specific Qubit.
+
+        The snapshot is cached until an update touches this qubit, so repeated
+        calls return the same object. Use `.overlay(...)` for per-run changes.
         """
         indices = self._resolve_indices(q_id)
         idx = indices[0]
 
-        selected = AddictDict()
-        for key, value in self.unified_config.items():
-            if isinstance(value, list):
-                if idx < len(value):
-                    selected[key] = value[idx]
-            else:
-                selected[key] = value
-        return selected
+        snap = self._qubit_cache.get(idx)
+        if snap is None:
+            selected = {}
+            for key, value in self.unified_config.items():
+                if isinstance(value, list):
+                    if idx < len(value):
+                        selected[key] = value[idx]
+                else:
+                    selected[key] = value
+            snap = ConfigSnapshot(selected, version=self.version, q_index=idx)
+            self._qubit_cache[idx] = snap
+        return snap
+
+    def get_qubit(self, q_id: Union[int, str]) -> ConfigOverlay:
+        """
+        Retrieve a flattened configuration for a specific Qubit as an AddictDict.
+        Allows access via `config.name` or `config['name']`.
+
+        The result is a ConfigOverlay on the cached snapshot, so writing to it
+        never changes the stored configuration.
+        """
+        return self.snapshot(q_id).overlay()
 
     def update(
         self,
         param: Union[str, Dict[str, Any]],
         value: Any = None,
         q_index: Union[int, str, List] = None,
+        source: Optional[str] = None,
     ) -> None:
         """
         Unified update method.
@@ -423,8 +529,15 @@ class ExperimentConfig:
             The value to set if param is a string. Ignored if param is a dict.
         q_index : Union[int, str, List], optional
             The target qubits. If None, targets all (broadcast/distribute).
+        source : str, optional
+            Who made the change (experiment page, "sidebar", ...); written to
+            the store's change journal.
         """
         target_indices = self._resolve_indices(q_index)
+        changed: List[Tuple[Tuple, Any, Any]] = []
+        journal: List[Tuple[Tuple, Any, Any]] = []
+        structural = False
+        needs_snapshot = False
 
         # --- Mode 1: Dictionary Merge ---
         if isinstance(param, dict):
@@ -433,7 +546,18 @@ class ExperimentConfig:
             for idx in target_indices:
                 raw_nested_cfg = self._raw_list[idx]
                 for k, v in flat_config.items():
-                    if self._recursive_update(raw_nested_cfg, k, v):
+                    if k in self._branch_keys or isinstance(v, (dict, list)):
+                        # May replace a whole sub-dict; take the slow path
+                        if self._recursive_update(raw_nested_cfg, k, v):
+                            updated_count += 1
+                            structural = True
+                            # Touched paths are unknown, journal a full snapshot
+                            needs_snapshot = True
+                            # Later keys of the merge must see the new shape
+                            self._build_index()
+                        continue
+                    paths = self._merge_paths(idx, k)
+                    if self._merge_leaves(raw_nested_cfg, paths, v, changed):
                         updated_count += 1
             if q_index is not None:
                 print(
@@ -464,6 +588,19 @@ class ExperimentConfig:
                 if isinstance(val_to_set, np.generic):
                     val_to_set = val_to_set.item()
 
+                path = (cfg_idx, *keys)
+                if isinstance(target, dict):
+                    old_val = target.get(keys[-1])
+                else:
+                    old_val = getattr(target, keys[-1], None)
+                journal.append((path, old_val, val_to_set))
+                if path not in self._leaf_pos or isinstance(
+                    val_to_set, (dict, list)
+                ):
+                    structural = True
+                else:
+                    changed.append((path, old_val, val_to_set))
+
                 # Set value
                 if isinstance(target, dict):
                     target[keys[-1]] = val_to_set
@@ -475,7 +612,74 @@ class ExperimentConfig:
                 "First argument must be a string (key path) or a dict (config)."
             )
 
-        self._refresh()
+        self.version += 1
+        if structural:
+            self._refresh()
+        else:
+            for path, _, val in changed:
+                self._set_leaf(path, val)
+
+        if self.store is not None:
+            if isinstance(param, dict):
+                journal = changed
+            self._journal(journal, source)
+            if needs_snapshot:
+                self.save_snapshot()
+
+    def _journal(self, entries: List[Tuple[Tuple, Any, Any]], source: Optional[str]) -> None:
+        """Append (path, old, new) changes to the store's journal."""
+        names = {idx: name for name, idx in self._name_map.items()}
+        self.store.record(
+            {
+                "version": self.version,
+                "q_index": path[0],
+                "qubit": names.get(path[0]),
+                "key": ".".join(path[1:]),
+                "old": self._clean_data(old),
+                "new": self._clean_data(new),
+                "source": source,
+            }
+            for path, old, new in entries
+        )
+
+    def save_snapshot(self) -> Optional[str]:
+        """Atomically write the full config to the attached store."""
+        if self.store is None:
+            return None
+        return self.store.save_snapshot(self._clean_data(self._raw_list), self.version)
+
+    def _merge_paths(self, idx: int, target_key: str) -> List[Tuple]:
+        """
+        Indexed equivalent of the paths `_recursive_update` would touch.
+
+        Only dict-nested leaves are merged, and a dict that holds the key
+        directly hides any deeper occurrence below it.
+        """
+        paths = [
+            path for path in self._key_paths.get(target_key, ())
+            if path[0] == idx and all(isinstance(k, str) for k in path[1:])
+        ]
+        parents = {path[:-1] for path in paths}
+        return [
+            path for path in paths
+            if not any(path[:n] in parents for n in range(1, len(path) - 1))
+        ]
+
+    def _merge_leaves(self, nested_data, paths, new_value, changed) -> bool:
+        """Set indexed leaves that differ from new_value; record them in changed."""
+        if isinstance(new_value, np.generic):
+            new_value = new_value.item()
+        found = False
+        for path in paths:
+            parent = nested_data
+            for k in path[1:-1]:
+                parent = parent[k]
+            old_value = parent[path[-1]]
+            if old_value != new_value:
+                parent[path[-1]] = new_value
+                changed.append((path, old_value, new_value))
+                found = True
+        return found
 
     def _recursive_update(self, nested_data, target_key, new_value) -> bool:
         """Helper to recursively find a key in nested structure and update it."""
@@ -498,6 +702,18 @@ class ExperimentConfig:
                         found = True
         return found
         
+    def get_value(self, key_path: str, q_id: Union[int, str]) -> Any:
+        """Return the nested value at a dot-notation key path, e.g. 'res.res_freq_ge'."""
+        target = self._raw_list[self._resolve_indices(q_id)[0]]
+        for k in key_path.split("."):
+            # `in` check first: AddictDict would create missing keys
+            if not isinstance(target, dict) or k not in target:
+                raise KeyError(key_path)
+            target = target[k]
+        if isinstance(target, np.generic):
+            target = target.item()
+        return target
+
     def read_config(self, q_id: Union[int, str]) -> Dict:
         indices = self._resolve_indices(q_id)
         target_idx = indices[0]
@@ -4,10 +4,15 @@ from ruamel.yaml import YAML
 import ruamel.yaml
 import numpy
 import sys
+import threading
+from collections import OrderedDict
 from collections.abc import MutableMapping
 from io import StringIO
 import numpy as np
 
+from .config_store import dumps as json_dumps
+from .fingerprint import config_fingerprint
+
 yml = YAML(pure=True)
 yml.indent(mapping=4, sequence=4, offset=2)
 yml.compact(seq_seq=False, seq_map=False)
@@ -62,13 +67,55 @@ def convert_to_builtin(obj):
         return obj
 
 
-def yml_comment(config: dict):
+def _render_yaml(config: dict) -> str:
     config_clean = convert_to_builtin(config)
     stream = StringIO()
     yml.dump(config_clean, stream)
     return stream.getvalue()
 
 
+def _render_json(config: dict) -> str:
+    return json_dumps(convert_to_builtin(config)).decode()
+
+
+_COMMENT_RENDERERS = {"yaml": _render_yaml, "json": _render_json}
+_COMMENT_CACHE_SIZE = 128
+_comment_cache = OrderedDict()
+_comment_lock = threading.Lock()
+
+
+def config_comment(config: dict, fmt: str = "yaml") -> str:
+    """
+    Render a cfg as a YAML ("yaml") or compact JSON ("json") file comment.
+
+    Renders are memoized by an exact content hash of the cfg, so saving many
+    files with an unchanged cfg (calibration loops, per-Yoko-point saves)
+    skips the pure-Python ruamel dump after the first file.
+    """
+    try:
+        render = _COMMENT_RENDERERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown comment format '{fmt}'") from None
+
+    key = (fmt, config_fingerprint(config, exact=True))
+    with _comment_lock:
+        text = _comment_cache.get(key)
+        if text is not None:
+            _comment_cache.move_to_end(key)
+            return text
+
+    text = render(config)
+    with _comment_lock:
+        _comment_cache[key] = text
+        while len(_comment_cache) > _COMMENT_CACHE_SIZE:
+            _comment_cache.popitem(last=False)
+    return text
+
+
+def yml_comment(config: dict, fmt: str = "yaml"):
+    return config_comment(config, fmt)
+
+
 def find_key_in_dict(config: dict, target_key):
     result = []
 
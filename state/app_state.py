@@ -1,8 +1,13 @@
 # state/app_state.py
+import os
 from dataclasses import dataclass, field
 from typing import Optional, Any, List, Callable
+from qick_workspace.tools import ncfg
 from qick_workspace.tools.ncfg import config_list
+from qick_workspace.tools.config_store import ConfigStore
 from qick_workspace.tools.system_tool import ExperimentConfig as QickExperimentConfig
+from qick_workspace.tools.config_edit import ConfigEditSession
+from qick_workspace.tools.fit_cache import fit_cache
 from state.onetone_state import OneToneState
 from state.twotone_state import TwoToneState
 from state.prabi_state import PowerRabiState
@@ -26,8 +31,14 @@ class AppState:
     soccfg: Optional[Any] = None
 
     # ---- Config system ----
+    # Snapshot + change journal of the config (see tools/config_store.py)
+    config_store_dir: str = "config_store"
+    # Opt-in on-disk copy of the fit cache (see tools/fit_cache.py); entries are
+    # pickles, so only point it at a trusted directory. None keeps it in memory
+    fit_cache_dir: Optional[str] = None
     qubit_names: List[str] = field(default_factory=list)
     qick_cfg: Optional[QickExperimentConfig] = None
+    config_session: Optional[ConfigEditSession] = None
     selected_qubit: Optional[str] = None
     current_cfg: Optional[dict] = None
     
@@ -47,9 +58,23 @@ class AppState:
     def __post_init__(self):
         """init qubit config system (dataclass constructor)"""
 
-        self.qubit_names = [c["name"] for c in config_list]
+        fit_cache.set_directory(self.fit_cache_dir)
 
-        self.qick_cfg = QickExperimentConfig(config_list)
+        store = ConfigStore(self.config_store_dir)
+        loaded = None
+        if store.has_snapshot() and os.path.getmtime(
+            store.snapshot_path
+        ) >= os.path.getmtime(ncfg.__file__):
+            loaded = store.load()
+
+        cfg_list = loaded or config_list
+        self.qubit_names = [c["name"] for c in cfg_list]
+
+        self.qick_cfg = QickExperimentConfig(cfg_list, store=store)
+        if loaded is None:
+            # ncfg.py is newer than the stored snapshot: restart from it
+            self.qick_cfg.save_snapshot()
+        self.config_session = ConfigEditSession(self.qick_cfg)
 
         self.selected_qubit = self.qubit_names[0]
 
@@ -25,3 +25,5 @@ class OneToneState:
     fit_results: Optional[dict] = None
     
     last_plot_time: str = ""
+    # Qubit the stored result was measured on (see update_result)
+    result_qubit: Optional[str] = None
@@ -20,3 +20,5 @@ class RamseyState:
     fit_results: Optional[dict] = None
     
     last_plot_time: str = ""
+    # Qubit the stored result was measured on (see update_result)
+    result_qubit: Optional[str] = None
@@ -36,3 +36,5 @@ class SingleshotOptState:
     raw_data: Optional[dict] = None
     
     last_plot_time: str = ""
+    # Qubit the stored result was measured on (see update_result)
+    result_qubit: Optional[str] = None
@@ -26,3 +26,5 @@ class TwoToneState:
     fit_results: Optional[dict] = None # Added for storing fit results
 
     last_plot_time: str = ""
+    # Qubit the stored result was measured on (see update_result)
+    result_qubit: Optional[str] = None